@@ -0,0 +1,28 @@
+"""make_job_profile_optional
+
+Revision ID: 20251119_0000
+Revises: 20251118_0001
+Create Date: 2025-11-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251119_0000'
+down_revision: Union[str, None] = '20251118_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Ad-hoc analysis jobs (POST /jobs/analyze) are not tied to a profile
+    op.alter_column('jobs', 'profile_id', nullable=True)
+
+
+def downgrade() -> None:
+    # Profile-less jobs can't satisfy the NOT NULL constraint
+    op.execute("DELETE FROM jobs WHERE profile_id IS NULL")
+    op.alter_column('jobs', 'profile_id', nullable=False)
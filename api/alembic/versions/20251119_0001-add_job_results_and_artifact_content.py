@@ -0,0 +1,33 @@
+"""add_job_results_and_artifact_content
+
+Revision ID: 20251119_0001
+Revises: 20251119_0000
+Create Date: 2025-11-19 00:01:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251119_0001'
+down_revision: Union[str, None] = '20251119_0000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Job results outlive the short RQ result TTL
+    op.add_column('jobs', sa.Column('result', sa.JSON(), nullable=True))
+    op.add_column('jobs', sa.Column('started_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Large results are stored compressed in the database
+    op.add_column('artifacts', sa.Column('content', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('artifacts', 'content')
+    op.drop_column('jobs', 'started_at')
+    op.drop_column('jobs', 'result')
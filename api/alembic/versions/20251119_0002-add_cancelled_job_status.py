@@ -0,0 +1,30 @@
+"""add_cancelled_job_status
+
+Revision ID: 20251119_0002
+Revises: 20251119_0001
+Create Date: 2025-11-19 00:02:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251119_0002'
+down_revision: Union[str, None] = '20251119_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TYPE job_status ADD VALUE IF NOT EXISTS 'cancelled'")
+
+
+def downgrade() -> None:
+    # Postgres can't drop an enum value, so rebuild the type without it
+    op.execute("UPDATE jobs SET status = 'failed' WHERE status = 'cancelled'")
+    op.execute("ALTER TYPE job_status RENAME TO job_status_old")
+    op.execute("CREATE TYPE job_status AS ENUM ('queued', 'running', 'completed', 'failed')")
+    op.execute("ALTER TABLE jobs ALTER COLUMN status TYPE job_status USING status::text::job_status")
+    op.execute("DROP TYPE job_status_old")
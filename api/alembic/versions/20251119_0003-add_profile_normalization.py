@@ -0,0 +1,27 @@
+"""add_profile_normalization
+
+Revision ID: 20251119_0003
+Revises: 20251119_0002
+Create Date: 2025-11-19 00:03:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251119_0003'
+down_revision: Union[str, None] = '20251119_0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Per-profile transcript normalization options (NULL = defaults)
+    op.add_column('profiles', sa.Column('normalization', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('profiles', 'normalization')
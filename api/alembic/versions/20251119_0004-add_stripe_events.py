@@ -0,0 +1,40 @@
+"""add_stripe_events
+
+Revision ID: 20251119_0004
+Revises: 20251119_0003
+Create Date: 2025-11-19 00:04:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251119_0004'
+down_revision: Union[str, None] = '20251119_0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Verified Stripe webhook events, processed by the worker (keyed by event ID)
+    op.create_table(
+        'stripe_events',
+        sa.Column('id', sa.String(length=255), nullable=False),
+        sa.Column('type', sa.String(length=100), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_stripe_events_processed_at', 'stripe_events', ['processed_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stripe_events_processed_at', table_name='stripe_events')
+    op.drop_table('stripe_events')
@@ -1,5 +1,6 @@
 """Database configuration and session management."""
 
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -51,6 +52,26 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def standalone_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session on a throwaway, unpooled engine.
+
+    For code running outside the API's event loop, such as RQ tasks where
+    every asyncio.run() creates a new loop and pooled connections can't be
+    reused.
+
+    Yields:
+        AsyncSession: Database session
+    """
+    standalone_engine = create_async_engine(db_url, poolclass=NullPool)
+    try:
+        async with AsyncSession(standalone_engine, expire_on_commit=False) as session:
+            yield session
+    finally:
+        await standalone_engine.dispose()
+
+
 async def init_db() -> None:
     """Initialize database (create tables in development)."""
     if settings.is_development:
@@ -0,0 +1,83 @@
+"""Redis configuration and connection pools.
+
+Both pools block when every connection is in use: a command waits up to
+REDIS_POOL_TIMEOUT_SECONDS for one to be returned instead of failing with
+"Too many connections" under a burst of requests.
+"""
+
+from typing import Optional
+
+import redis.asyncio as aioredis
+from redis import BlockingConnectionPool, Redis
+
+from app.config.settings import get_settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+# Process-wide pools, created in the lifespan hook (or on first use)
+_async_pool: Optional[aioredis.BlockingConnectionPool] = None
+_sync_pool: Optional[BlockingConnectionPool] = None
+
+
+def _pool_options() -> dict:
+    """Connection pool options shared by the async and sync pools."""
+    return {
+        "max_connections": settings.REDIS_MAX_CONNECTIONS,
+        "timeout": settings.REDIS_POOL_TIMEOUT_SECONDS,  # Wait for a free connection
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        "socket_connect_timeout": settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+    }
+
+
+def get_redis() -> aioredis.Redis:
+    """
+    Get an async Redis client backed by the shared connection pool.
+
+    Clients are cheap; connections are borrowed from the pool per command.
+
+    Returns:
+        aioredis.Redis: Async Redis client
+    """
+    global _async_pool
+    if _async_pool is None:
+        _async_pool = aioredis.BlockingConnectionPool.from_url(settings.REDIS_URL, **_pool_options())
+    return aioredis.Redis(connection_pool=_async_pool)
+
+
+def get_sync_redis() -> Redis:
+    """
+    Get a sync Redis client backed by the shared connection pool.
+
+    For RQ, which only supports sync connections (enqueueing jobs).
+
+    Returns:
+        Redis: Redis client
+    """
+    global _sync_pool
+    if _sync_pool is None:
+        _sync_pool = BlockingConnectionPool.from_url(settings.REDIS_URL, **_pool_options())
+    return Redis(connection_pool=_sync_pool)
+
+
+async def init_redis() -> None:
+    """Create the connection pools and check Redis is reachable."""
+    get_sync_redis()
+    try:
+        await get_redis().ping()
+    except Exception as e:
+        # Not fatal: job endpoints fail individually and /health reports it
+        logger.warning(f"Redis is not reachable at startup: {e}")
+
+
+async def close_redis() -> None:
+    """Close Redis connections."""
+    global _async_pool, _sync_pool
+    if _async_pool is not None:
+        await _async_pool.disconnect()
+        _async_pool = None
+    if _sync_pool is not None:
+        _sync_pool.disconnect()
+        _sync_pool = None
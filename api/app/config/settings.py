@@ -1,7 +1,7 @@
 """Application settings."""
 
 from functools import lru_cache
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -27,6 +27,11 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str = Field(..., description="Redis connection string")
+    REDIS_MAX_CONNECTIONS: int = Field(default=50)  # Per pool; the API keeps one async and one sync pool
+    REDIS_POOL_TIMEOUT_SECONDS: float = Field(default=5.0)  # Wait for a free pooled connection before failing
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = Field(default=5.0)
+    REDIS_CONNECT_TIMEOUT_SECONDS: float = Field(default=5.0)
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = Field(default=30)  # Ping idle connections before reuse
 
     # JWT
     JWT_SECRET: str = Field(..., description="Secret key for JWT tokens")
@@ -34,6 +39,15 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=60)
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=7)
 
+    # Password Hashing (bcrypt, run in a thread pool off the event loop)
+    BCRYPT_ROUNDS: int = Field(default=12)  # Cost factor (4-31); weaker hashes are upgraded at login
+    PASSWORD_HASH_THREADS: int = Field(default=4)  # Concurrent hashes per API process
+
+    # Auth Cache (per-process; user changes invalidate entries on every replica)
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = Field(default=300)  # Verified JWTs, capped at token expiry
+    AUTH_USER_CACHE_TTL_SECONDS: int = Field(default=30)  # 0 = always query the user
+    AUTH_CACHE_MAX_ENTRIES: int = Field(default=10000)  # Per cache (LRU)
+
     # LLM Providers
     GEMINI_API_KEY: Optional[str] = Field(default=None)
     OPENAI_API_KEY: Optional[str] = Field(default=None)
@@ -51,7 +65,16 @@ class Settings(BaseSettings):
     PURELYMAIL_SMTP_PORT: int = Field(default=587)
     PURELYMAIL_SMTP_USER: Optional[str] = Field(default=None)
     PURELYMAIL_SMTP_PASS: Optional[str] = Field(default=None)
+    PURELYMAIL_SMTP_STARTTLS: bool = Field(default=True)  # false for a local stand-in (e.g. MailHog; no login needed)
     FROM_EMAIL: str = Field(default="noreply@scriptripper.com")
+
+    # Email Delivery (queued in-process, sent over one persistent SMTP session)
+    EMAIL_QUEUE_MAX_SIZE: int = Field(default=1000)  # Emails beyond this are dropped (and logged)
+    EMAIL_BATCH_SIZE: int = Field(default=20)  # Queued emails sent per turn on the session
+    EMAIL_MAX_RETRIES: int = Field(default=3)  # For temporary SMTP failures (4xx, disconnects)
+    EMAIL_RETRY_BACKOFF_SECONDS: float = Field(default=2.0)  # Doubles after each retry
+    EMAIL_SMTP_TIMEOUT_SECONDS: float = Field(default=10.0)
+    EMAIL_IDLE_TIMEOUT_SECONDS: float = Field(default=60.0)  # Close the session after this long without mail
     MAGIC_LINK_EXPIRE_MINUTES: int = Field(default=15)
 
     # Email (Legacy - SendGrid)
@@ -80,16 +103,114 @@ class Settings(BaseSettings):
     S3_BUCKET_NAME: str = Field(default="scriptripper-artifacts")
     S3_REGION: str = Field(default="us-east-1")
 
+    # Response Compression (gzip/Brotli, negotiated via Accept-Encoding)
+    COMPRESSION_MINIMUM_SIZE_BYTES: int = Field(default=1024)  # Smaller responses are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = Field(default=6)  # 1 (fastest) to 9 (smallest)
+    COMPRESSION_BROTLI_QUALITY: int = Field(default=4)  # 0 (fastest) to 11 (smallest)
+
     # Rate Limiting
-    RATE_LIMIT_PER_MINUTE: int = Field(default=60)
+    RATE_LIMIT_PER_MINUTE: int = Field(default=60)  # Requests per client (user ID, else IP); 0 = unlimited
+    RATE_LIMIT_BURST: int = Field(default=20)  # Requests allowed back to back
+    RATE_LIMIT_ROUTES: str = Field(
+        default=(
+            "POST /api/v1/analyze=20,POST /api/v1/analyze/custom=10,POST /api/v1/auth=10,"
+            "GET /api/v1/jobs=300,/api/v1/billing/webhook=0,/health=0,/ready=0"
+        )
+    )  # "[METHOD ]PATH_PREFIX=LIMIT" overrides; longest prefix wins
+    # Key anonymous clients by X-Forwarded-For (only behind a trusted proxy)
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = Field(default=False)
+    FREE_DAILY_RIP_LIMIT: int = Field(default=1)  # Rips per UTC day on the free tier (counted in Redis)
+
+    # Fair Scheduling (per-user sub-queues, weighted by subscription tier)
+    FAIR_SCHEDULING_ENABLED: bool = Field(default=True)
+    FAIR_WEIGHT_FREE: float = Field(default=1.0)
+    FAIR_WEIGHT_PRO: float = Field(default=4.0)
+    FAIR_WEIGHT_PREMIUM: float = Field(default=8.0)
+    MAX_INFLIGHT_JOBS_FREE: int = Field(default=1)  # 0 = unlimited
+    MAX_INFLIGHT_JOBS_PRO: int = Field(default=3)
+    MAX_INFLIGHT_JOBS_PREMIUM: int = Field(default=5)
+    FAIR_SCHEDULER_POLL_SECONDS: int = Field(default=5)
+
+    # Job Idempotency
+    IDEMPOTENCY_TTL_SECONDS: int = Field(default=86400)  # Replay window for duplicate submissions
+
+    # Job Results (persisted to Postgres, so Redis only keeps them briefly)
+    JOB_RESULT_TTL_SECONDS: int = Field(default=600)
+    JOB_RESULT_INLINE_MAX_BYTES: int = Field(default=65536)  # Larger results become compressed artifacts
+
+    # Job Serialization (compact JSON in Redis, zlib-compressed above threshold)
+    JOB_COMPRESSION_THRESHOLD_BYTES: int = Field(default=1024)
+    JOB_COMPRESSION_LEVEL: int = Field(default=6)  # zlib level, 1 (fastest) to 9 (smallest)
+
+    # Job Retries (completed tasks are checkpointed, so retries resume)
+    JOB_MAX_RETRIES: int = Field(default=3)
+    JOB_RETRY_INTERVALS: str = Field(default="30,120,600")  # Seconds before each retry
+    JOB_CHECKPOINT_TTL_SECONDS: int = Field(default=86400)
+    JOB_CANCEL_POLL_SECONDS: float = Field(default=1.0)  # How often running jobs check for cancellation
+    JOB_QUOTA_RETRY_INTERVALS: str = Field(default="900,3600,14400")  # Backoff after provider quota errors
+    DLQ_TTL_SECONDS: int = Field(default=1209600)  # Dead-letter queue retention (14 days)
+
+    # Bulk Job Submission
+    BULK_MAX_ITEMS: int = Field(default=1000)
+    BULK_BATCH_TTL_SECONDS: int = Field(default=604800)  # 7 days
+
+    # Deferred Jobs (not_before / off-peak; times are UTC)
+    JOB_MAX_DEFER_HOURS: int = Field(default=168)  # Latest allowed not_before
+    OFF_PEAK_START_HOUR: int = Field(default=22)
+    OFF_PEAK_END_HOUR: int = Field(default=6)
+    OFF_PEAK_RELEASE_INTERVAL_SECONDS: float = Field(default=2.0)  # Spacing between off-peak releases
+    OFF_PEAK_EARLY_RELEASE_DEPTH: int = Field(default=5)  # Release early while fewer jobs are queued; 0 = never
+    OFF_PEAK_EARLY_RELEASE_BATCH: int = Field(default=2)  # Max jobs per early release pass
+    OFF_PEAK_EARLY_RELEASE_INTERVAL_SECONDS: int = Field(default=10)  # Min seconds between passes
+
+    # Queue Metrics and Autoscaling (GET /api/v1/admin/queues/metrics)
+    QUEUE_METRICS_SAMPLE_SIZE: int = Field(default=200)  # Recent jobs read per queue and registry
+    AUTOSCALE_TARGET_UTILIZATION: float = Field(default=0.75)
+    AUTOSCALE_TARGET_WAIT_SECONDS: int = Field(default=60)  # Time to drain the current backlog
+    AUTOSCALE_DEFAULT_JOB_SECONDS: float = Field(default=60.0)  # Assumed run time with no history
+    AUTOSCALE_MIN_WORKERS: int = Field(default=1)
+    AUTOSCALE_MAX_WORKERS: int = Field(default=20)
+
+    def get_rate_limit_routes_list(self) -> List[Tuple[str, int]]:
+        """Parse per-route rate limits from comma-separated "ROUTE=LIMIT" pairs."""
+        routes = []
+        for item in self.RATE_LIMIT_ROUTES.split(","):
+            route, _, limit = item.strip().rpartition("=")
+            if route.strip():
+                routes.append((route.strip(), int(limit)))
+        return routes
+
+    def get_job_retry_intervals_list(self) -> List[int]:
+        """Parse retry backoff intervals from comma-separated string."""
+        return [int(interval.strip()) for interval in self.JOB_RETRY_INTERVALS.split(",") if interval.strip()]
+
+    def get_job_quota_retry_intervals_list(self) -> List[int]:
+        """Parse quota-error backoff intervals from comma-separated string."""
+        return [int(interval.strip()) for interval in self.JOB_QUOTA_RETRY_INTERVALS.split(",") if interval.strip()]
 
     # File Upload
     MAX_UPLOAD_SIZE_MB: int = Field(default=50)
     ALLOWED_EXTENSIONS: str = Field(default="json,txt,srt,vtt,md,pdf,doc,docx")
+    TRANSCRIPT_UPLOAD_TTL_SECONDS: int = Field(default=86400)  # How long POST /transcripts uploads can be analyzed
 
     # Transcript Limits
     MAX_TRANSCRIPT_LENGTH: int = Field(default=500000)  # 500K characters (~125K tokens)
 
+    # Transcript Normalization (timestamps, fillers, whitespace, repeated speakers)
+    # and speaker aliasing; per profile via Profile.normalization
+    TRANSCRIPT_NORMALIZATION_ENABLED: bool = Field(default=True)  # For profiles that don't set "enabled"
+    SPEAKER_ALIASING_ENABLED: bool = Field(default=True)  # S1, S2, ... in prompts, real names restored in outputs
+
+    # Profile Cache (published profiles, invalidated across replicas via Redis pub/sub)
+    PROFILE_CACHE_TTL_SECONDS: int = Field(default=300)  # 0 = disabled
+
+    # Prompt Catalog (GET /api/v1/prompts, served from memory with an ETag)
+    PROMPT_CATALOG_TTL_SECONDS: int = Field(default=300)  # 0 = rebuild on every request
+    PROMPT_CATALOG_MAX_AGE_SECONDS: int = Field(default=60)  # Cache-Control max-age for clients
+
+    # Adaptive Analysis (POST /api/v1/analyze runs as a job above this much work)
+    ANALYZE_ASYNC_THRESHOLD_CHARS: int = Field(default=200000)  # Transcript characters x tasks; 0 = always inline
+
     def get_allowed_extensions_list(self) -> List[str]:
         """Parse allowed extensions from comma-separated string."""
         if isinstance(self.ALLOWED_EXTENSIONS, str):
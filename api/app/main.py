@@ -3,14 +3,19 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import sentry_sdk
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.starlette import StarletteIntegration
 
 from app.config.settings import get_settings
 from app.config.database import init_db, close_db
-from app.routes import health, auth, analyze, admin, billing, jobs, debug_admin
+from app.config.redis import init_redis, close_redis
+from app.utils.cache_invalidation import invalidation_listener
+from app.utils.compression import CompressionMiddleware
+from app.utils.mailer import mailer
+from app.utils.request_limiter import RateLimitMiddleware
+from app.routes import health, auth, analyze, admin, billing, jobs, transcripts, debug_admin
 
 settings = get_settings()
 
@@ -40,10 +45,16 @@ async def lifespan(app: FastAPI):
     # Startup
     if settings.is_development:
         await init_db()
+    await init_redis()
+    invalidation_listener.start()
+    mailer.start()
 
     yield
 
     # Shutdown
+    await mailer.stop()
+    await invalidation_listener.stop()
+    await close_redis()
     await close_db()
 
 
@@ -55,8 +66,12 @@ app = FastAPI(
     docs_url="/docs" if not settings.is_production else None,
     redoc_url="/redoc" if not settings.is_production else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Per-minute rate limiting (added first so CORS headers still reach refused requests)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -66,6 +81,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/Brotli response compression and compressed request bodies
+app.add_middleware(CompressionMiddleware)
+
 
 # User context middleware for Sentry
 @app.middleware("http")
@@ -90,6 +108,7 @@ app.include_router(health.router, tags=["Health"])
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(analyze.router, prefix="/api/v1", tags=["Analysis"])
 app.include_router(jobs.router, prefix="/api/v1", tags=["Jobs"])
+app.include_router(transcripts.router, prefix="/api/v1", tags=["Transcripts"])
 app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
 app.include_router(billing.router, prefix="/api/v1/billing", tags=["Billing"])
 app.include_router(debug_admin.router, prefix="/api/v1", tags=["Debug Admin"])
@@ -108,7 +127,7 @@ async def global_exception_handler(request, exc):
             })
             sentry_sdk.capture_exception(exc)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": {
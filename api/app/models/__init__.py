@@ -6,5 +6,6 @@ from app.models.profile import Profile
 from app.models.job import Job
 from app.models.artifact import Artifact
 from app.models.custom_prompt import CustomPrompt
+from app.models.stripe_event import StripeEvent
 
-__all__ = ["Base", "User", "Profile", "Job", "Artifact", "CustomPrompt"]
+__all__ = ["Base", "User", "Profile", "Job", "Artifact", "CustomPrompt", "StripeEvent"]
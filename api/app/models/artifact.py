@@ -2,7 +2,7 @@
 
 import uuid
 from typing import Optional
-from sqlalchemy import String, Text, Integer, ForeignKey, Enum as SQLEnum
+from sqlalchemy import String, Text, Integer, LargeBinary, ForeignKey, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 import enum
@@ -47,6 +47,9 @@ class Artifact(Base, TimestampMixin):
     checksum: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
+    # zlib-compressed body for artifacts stored in the database (uri db://...)
+    content: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+
     # Relationships
     job = relationship("Job", back_populates="artifacts")
 
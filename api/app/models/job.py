@@ -19,6 +19,7 @@ class JobStatus(str, enum.Enum):
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 class Job(Base, TimestampMixin):
@@ -39,10 +40,10 @@ class Job(Base, TimestampMixin):
         nullable=False,
         index=True,
     )
-    profile_id: Mapped[uuid.UUID] = mapped_column(
+    profile_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("profiles.id", ondelete="RESTRICT"),
-        nullable=False,
+        nullable=True,
         index=True,
     )
 
@@ -55,6 +56,9 @@ class Job(Base, TimestampMixin):
     )
     input_uri: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
+    # Task outputs (small results inline; large ones in a compressed artifact)
+    result: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+
     # Metrics
     metrics: Mapped[Optional[Dict[str, Any]]] = mapped_column(
         JSON,
@@ -73,7 +77,11 @@ class Job(Base, TimestampMixin):
     # Error handling
     error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
-    # Completion tracking
+    # Lifecycle tracking
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
     completed_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True),
         nullable=True,
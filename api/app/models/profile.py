@@ -69,6 +69,10 @@ class Profile(Base, TimestampMixin):
     )
     model: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
 
+    # Transcript normalization before prompts are built, e.g. {"enabled": true, "remove_fillers": false}
+    # (None follows TRANSCRIPT_NORMALIZATION_ENABLED with every step on)
+    normalization: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+
     # Relationships
     jobs = relationship("Job", back_populates="profile")
 
@@ -0,0 +1,30 @@
+"""Stripe webhook event model."""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import String, Text, Integer, DateTime, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin
+
+
+class StripeEvent(Base, TimestampMixin):
+    """Verified Stripe webhook event, processed in the background.
+
+    Keyed by Stripe's event ID, so redelivered events are stored once and
+    processed at most once.
+    """
+
+    __tablename__ = "stripe_events"
+
+    id: Mapped[str] = mapped_column(String(255), primary_key=True)  # evt_...
+    type: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+
+    # Processing state (processed_at is NULL until handled)
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<StripeEvent(id={self.id}, type={self.type}, processed_at={self.processed_at})>"
@@ -1,5 +1,6 @@
 """Repository pattern for database access."""
 
+from .job_repository import JobRepository
 from .user_repository import UserRepository
 
-__all__ = ["UserRepository"]
+__all__ = ["JobRepository", "UserRepository"]
@@ -0,0 +1,415 @@
+"""Job repository for database operations."""
+
+import hashlib
+import json
+import uuid
+import zlib
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.artifact import Artifact, ArtifactKind
+from app.models.custom_prompt import CustomPrompt
+from app.models.job import Job, JobStatus
+
+
+class JobRepository:
+    """Repository for Job database operations."""
+
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize repository with database session.
+
+        Args:
+            db: SQLAlchemy async session
+        """
+        self.db = db
+
+    async def get_by_id(self, job_id: UUID) -> Optional[Job]:
+        """
+        Get job by ID.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job if found, None otherwise
+        """
+        result = await self.db.execute(select(Job).where(Job.id == job_id))
+        return result.scalar_one_or_none()
+
+    async def get_by_id_for_user(self, job_id: UUID, user_id: UUID) -> Optional[Job]:
+        """
+        Get a job by ID, only if it belongs to the given user.
+
+        Args:
+            job_id: Job ID
+            user_id: Owning user's ID
+
+        Returns:
+            Job if found and owned by the user, None otherwise
+        """
+        result = await self.db.execute(
+            select(Job).where(Job.id == job_id, Job.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_by_idempotency_key(self, idempotency_key: str) -> Optional[Job]:
+        """
+        Get job by idempotency key.
+
+        Args:
+            idempotency_key: Idempotency key the job was submitted with
+
+        Returns:
+            Job if found, None otherwise
+        """
+        result = await self.db.execute(
+            select(Job).where(Job.idempotency_key == idempotency_key)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_many_for_user(self, job_ids: List[UUID], user_id: UUID) -> Dict[UUID, Job]:
+        """
+        Get the given user's jobs among a list of IDs.
+
+        Args:
+            job_ids: Job IDs
+            user_id: Owning user's ID
+
+        Returns:
+            Jobs keyed by ID (IDs not found or not owned are omitted)
+        """
+        if not job_ids:
+            return {}
+
+        result = await self.db.execute(
+            select(Job).where(Job.id.in_(job_ids), Job.user_id == user_id)
+        )
+        return {job.id: job for job in result.scalars().all()}
+
+    async def get_by_idempotency_keys(self, idempotency_keys: List[str]) -> Dict[str, Job]:
+        """
+        Get jobs by idempotency key.
+
+        Args:
+            idempotency_keys: Idempotency keys
+
+        Returns:
+            Jobs keyed by idempotency key
+        """
+        if not idempotency_keys:
+            return {}
+
+        result = await self.db.execute(
+            select(Job).where(Job.idempotency_key.in_(idempotency_keys))
+        )
+        return {job.idempotency_key: job for job in result.scalars().all()}
+
+    async def create(
+        self,
+        job_id: UUID,
+        user_id: UUID,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Job:
+        """
+        Create a new queued job.
+
+        Args:
+            job_id: Job ID (shared with the RQ job)
+            user_id: Submitting user's ID
+            provider: LLM provider name
+            model: Model identifier
+            idempotency_key: Idempotency key (optional)
+
+        Returns:
+            Created job
+        """
+        job = Job(
+            id=job_id,
+            user_id=user_id,
+            status=JobStatus.QUEUED,
+            provider=provider,
+            model=model,
+            idempotency_key=idempotency_key,
+        )
+        self.db.add(job)
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def create_many(self, jobs: List[Dict[str, Any]]) -> List[Job]:
+        """
+        Create many queued jobs in one transaction.
+
+        Args:
+            jobs: Keyword arguments for each job (job_id, user_id, provider,
+                model, idempotency_key)
+
+        Returns:
+            Created jobs
+        """
+        created = [
+            Job(
+                id=job["job_id"],
+                user_id=job["user_id"],
+                status=JobStatus.QUEUED,
+                provider=job.get("provider"),
+                model=job.get("model"),
+                idempotency_key=job.get("idempotency_key"),
+            )
+            for job in jobs
+        ]
+        self.db.add_all(created)
+        await self.db.commit()
+        return created
+
+    async def release_idempotency_keys(self, jobs: Iterable[Job]) -> None:
+        """
+        Detach jobs from their idempotency keys so the keys can be reused.
+
+        Args:
+            jobs: Jobs to update
+        """
+        for job in jobs:
+            job.idempotency_key = None
+        await self.db.commit()
+
+    async def mark_many_failed(self, jobs: Iterable[Job], error: str) -> None:
+        """
+        Mark jobs as failed and release their idempotency keys.
+
+        Args:
+            jobs: Jobs to update
+            error: Error message
+        """
+        now = datetime.now(timezone.utc)
+        for job in jobs:
+            job.status = JobStatus.FAILED
+            job.error = error
+            job.idempotency_key = None
+            job.completed_at = now
+        await self.db.commit()
+
+    async def mark_many_requeued(self, job_ids: List[UUID]) -> None:
+        """
+        Mark jobs as queued again after they were requeued from the DLQ.
+
+        Args:
+            job_ids: Job IDs
+        """
+        if not job_ids:
+            return
+
+        await self.db.execute(
+            update(Job)
+            .where(Job.id.in_(job_ids))
+            .values(status=JobStatus.QUEUED, error=None, started_at=None, completed_at=None)
+        )
+        await self.db.commit()
+
+    async def release_idempotency_key(self, job: Job) -> Job:
+        """
+        Detach a job from its idempotency key so the key can be reused.
+
+        Args:
+            job: Job to update
+
+        Returns:
+            Updated job
+        """
+        job.idempotency_key = None
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def mark_running(self, job: Job) -> Job:
+        """
+        Mark a job as picked up by a worker.
+
+        Args:
+            job: Job to update
+
+        Returns:
+            Updated job
+        """
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def mark_completed(
+        self,
+        job: Job,
+        result: Dict[str, Any],
+        prompts: Iterable[str] = (),
+        inline_max_bytes: int = 65536,
+    ) -> Job:
+        """
+        Store a job's result, metrics and cost and mark it completed.
+
+        Results larger than ``inline_max_bytes`` (as JSON) are stored as a
+        zlib-compressed JSON artifact instead of inline on the job.
+
+        Args:
+            job: Job to update
+            result: Task result ({"results": ..., "metadata": ...})
+            prompts: Ad-hoc task prompts the job ran
+            inline_max_bytes: Largest result stored inline
+
+        Returns:
+            Updated job
+        """
+        artifact = self._store_result(job, result, inline_max_bytes)
+
+        for prompt in prompts:
+            self.db.add(CustomPrompt(
+                job_id=job.id,
+                prompt=prompt,
+                result_artifact_id=artifact.id if artifact else None,
+            ))
+
+        job.status = JobStatus.COMPLETED
+        job.completed_at = datetime.now(timezone.utc)
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def mark_cancelled(
+        self,
+        job: Job,
+        result: Optional[Dict[str, Any]] = None,
+        inline_max_bytes: int = 65536,
+    ) -> Job:
+        """
+        Mark a job as cancelled, keeping any partial result.
+
+        The partial result is stored like a completed job's.
+
+        Args:
+            job: Job to update
+            result: Results of the tasks that finished before cancellation
+            inline_max_bytes: Largest result stored inline
+
+        Returns:
+            Updated job
+        """
+        if result is not None:
+            self._store_result(job, result, inline_max_bytes)
+
+        job.status = JobStatus.CANCELLED
+        job.idempotency_key = None
+        job.completed_at = datetime.now(timezone.utc)
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    def _store_result(self, job: Job, result: Dict[str, Any], inline_max_bytes: int) -> Optional[Artifact]:
+        """
+        Attach a result and its metrics and cost to a job.
+
+        Results larger than ``inline_max_bytes`` (as JSON) are stored as a
+        zlib-compressed JSON artifact instead of inline on the job.
+
+        Args:
+            job: Job to update
+            result: Task result ({"results": ..., "metadata": ...})
+            inline_max_bytes: Largest result stored inline
+
+        Returns:
+            The artifact, or None if the result was stored inline
+        """
+        metadata = result.get("metadata") or {}
+        body = json.dumps(result, separators=(",", ":")).encode("utf-8")
+
+        artifact = None
+        if len(body) > inline_max_bytes:
+            artifact_id = uuid.uuid4()
+            artifact = Artifact(
+                id=artifact_id,
+                job_id=job.id,
+                kind=ArtifactKind.JSON,
+                uri=f"db://artifacts/{artifact_id}",
+                checksum=hashlib.sha256(body).hexdigest(),
+                size=len(body),
+                content=zlib.compress(body),
+            )
+            self.db.add(artifact)
+            job.result = None
+        else:
+            job.result = result
+
+        job.metrics = metadata
+        job.cost = Decimal(str(metadata.get("total_cost", 0)))
+        return artifact
+
+    async def get_result(self, job: Job) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's result, decompressing it from its artifact if needed.
+
+        Args:
+            job: Job to read
+
+        Returns:
+            Result dict, or None if the job has no stored result
+        """
+        if job.result is not None:
+            return job.result
+
+        result = await self.db.execute(
+            select(Artifact)
+            .where(Artifact.job_id == job.id, Artifact.kind == ArtifactKind.JSON)
+            .order_by(Artifact.created_at.desc())
+            .limit(1)
+        )
+        artifact = result.scalar_one_or_none()
+        if artifact is None or artifact.content is None:
+            return None
+
+        return json.loads(zlib.decompress(artifact.content))
+
+    async def mark_retrying(self, job: Job, error: str) -> Job:
+        """
+        Record a failed attempt that will be retried.
+
+        The job goes back to queued and keeps its idempotency key, so
+        duplicate submissions still resolve to it.
+
+        Args:
+            job: Job to update
+            error: Error from the failed attempt
+
+        Returns:
+            Updated job
+        """
+        job.status = JobStatus.QUEUED
+        job.error = error
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def mark_failed(self, job: Job, error: str) -> Job:
+        """
+        Mark a job as failed and release its idempotency key.
+
+        Args:
+            job: Job to update
+            error: Error message
+
+        Returns:
+            Updated job
+        """
+        job.status = JobStatus.FAILED
+        job.error = error
+        job.idempotency_key = None
+        job.completed_at = datetime.now(timezone.utc)
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
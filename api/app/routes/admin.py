@@ -1,17 +1,24 @@
 """Admin endpoints for user and system management."""
 
+import asyncio
 from datetime import datetime, timedelta
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends, status
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc
 from pydantic import BaseModel
 
 from app.config.database import get_db
+from app.config.redis import get_sync_redis
 from app.models.user import User, UserRole, SubscriptionTier, SubscriptionSource
 from app.models.usage import Usage
 from app.models.prompt import Prompt
+from app.repositories.job_repository import JobRepository
 from app.utils.dependencies import get_current_user
+from app.utils.failures import DeadLetterQueue, FailureClass
+from app.utils.prompt_catalog import invalidate_prompt_catalog
+from app.utils.queue_metrics import QueueMetrics
 
 
 router = APIRouter()
@@ -392,6 +399,7 @@ async def create_prompt(
     db.add(prompt)
     await db.commit()
     await db.refresh(prompt)
+    await invalidate_prompt_catalog()
 
     return PromptResponse(
         id=str(prompt.id),
@@ -458,6 +466,7 @@ async def update_prompt(
     prompt.updated_at = datetime.utcnow()
     await db.commit()
     await db.refresh(prompt)
+    await invalidate_prompt_catalog()
 
     return PromptResponse(
         id=str(prompt.id),
@@ -502,6 +511,7 @@ async def delete_prompt(
 
     await db.delete(prompt)
     await db.commit()
+    await invalidate_prompt_catalog()
 
     return {"message": "Prompt deleted successfully"}
 
@@ -625,3 +635,230 @@ async def get_user_subscription(
         stripe_customer_id=user.stripe_customer_id if hasattr(user, 'stripe_customer_id') else None,
         has_stripe_subscription=has_stripe,
     )
+
+
+class LatencyHistogram(BaseModel):
+    """Latency distribution in seconds."""
+
+    count: int
+    sum: float
+    p50: float | None
+    p95: float | None
+    max: float | None
+    buckets: Dict[str, int]  # Cumulative counts by upper bound ("+Inf" = all)
+
+
+class QueueBandMetrics(BaseModel):
+    """Metrics for one priority band, including its per-user sub-queues."""
+
+    depth: int
+    oldest_job_age_seconds: float | None
+    in_flight: int
+    finished: int
+    failed: int
+    failure_rate: float
+    throughput_per_minute: float
+    wait_seconds: LatencyHistogram  # Enqueue to start
+    run_seconds: LatencyHistogram  # Start to end
+    worker_load: float  # Busy workers needed for this band (Little's law)
+
+
+class WorkerMetrics(BaseModel):
+    """Worker pool utilization."""
+
+    total: int
+    busy: int
+    busy_ratio: float
+
+
+class SerializationMetrics(BaseModel):
+    """Job payload serialization totals across the API and workers."""
+
+    payloads: int
+    compressed_payloads: int
+    raw_bytes: int
+    stored_bytes: int
+    compression_ratio: float  # raw_bytes / stored_bytes
+
+
+class QueueMetricsResponse(BaseModel):
+    """Queue metrics for worker autoscaling."""
+
+    window_seconds: int
+    queues: Dict[str, QueueBandMetrics]
+    workers: WorkerMetrics
+    recommended_workers: int
+    serialization: SerializationMetrics
+    generated_at: datetime
+
+
+@router.get("/queues/metrics", response_model=QueueMetricsResponse)
+async def get_queue_metrics(
+    window_seconds: int | None = Query(default=None, ge=1),
+    admin: User = Depends(get_admin_user),
+) -> QueueMetricsResponse:
+    """Get queue depth, latency and worker metrics (admin-only).
+
+    Intended for polling by the worker autoscaler: ``recommended_workers``
+    is the worker count needed to keep up with arrivals and drain the
+    backlog within AUTOSCALE_TARGET_WAIT_SECONDS.
+
+    Args:
+        window_seconds: Look-back window for latencies, throughput and
+            failure rate (defaults to, and is capped at,
+            JOB_RESULT_TTL_SECONDS)
+        admin: Admin user
+
+    Returns:
+        Per-band queue metrics, worker utilization, recommended workers and
+        job payload compression totals
+    """
+    metrics = QueueMetrics(get_sync_redis())
+
+    # RQ only has a sync client; keep its reads off the event loop
+    return QueueMetricsResponse(**await asyncio.to_thread(metrics.collect, window_seconds))
+
+
+class DeadLetterEntry(BaseModel):
+    """A permanently failed job in the dead-letter queue."""
+
+    job_id: str
+    failure_class: str
+    error: str | None
+    origin: str | None  # RQ queue the job ran on
+    attempts: int
+    failed_at: datetime | None
+
+
+class DeadLetterList(BaseModel):
+    """A page of dead-letter queue entries."""
+
+    total: int
+    items: List[DeadLetterEntry]
+
+
+class DeadLetterDetail(DeadLetterEntry):
+    """A dead-letter queue entry with the job's arguments and traceback."""
+
+    func_name: str | None = None
+    kwargs: Dict[str, Any] | None = None
+    meta: Dict[str, Any] | None = None
+    enqueued_at: datetime | None = None
+    started_at: datetime | None = None
+    ended_at: datetime | None = None
+    traceback: str | None = None
+
+
+class RequeueRequest(BaseModel):
+    """Jobs to requeue from the dead-letter queue.
+
+    Give job_ids, or failure_class to requeue every entry of that class.
+    """
+
+    job_ids: Optional[List[str]] = None
+    failure_class: Optional[FailureClass] = None
+
+
+class RequeueResponse(BaseModel):
+    """Result of a dead-letter queue requeue."""
+
+    requeued: List[str]
+    not_found: List[str]
+
+
+@router.get("/dlq", response_model=DeadLetterList)
+async def list_dead_letters(
+    failure_class: Optional[FailureClass] = None,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=500),
+    admin: User = Depends(get_admin_user),
+) -> DeadLetterList:
+    """List permanently failed jobs, newest first (admin-only).
+
+    Args:
+        failure_class: Only list jobs that failed with this class
+        offset: Entries to skip
+        limit: Maximum entries to return
+        admin: Admin user
+
+    Returns:
+        Total matching entries and one page of them
+    """
+    dlq = DeadLetterQueue(get_sync_redis())
+    total, items = await asyncio.to_thread(
+        dlq.list,
+        failure_class.value if failure_class else None,
+        offset,
+        limit,
+    )
+    return DeadLetterList(total=total, items=items)
+
+
+@router.get("/dlq/{job_id}", response_model=DeadLetterDetail)
+async def get_dead_letter(
+    job_id: str,
+    admin: User = Depends(get_admin_user),
+) -> DeadLetterDetail:
+    """Get a dead-letter queue entry with its arguments and traceback (admin-only).
+
+    Args:
+        job_id: Job ID
+        admin: Admin user
+
+    Returns:
+        Entry details
+
+    Raises:
+        404: Job is not in the dead-letter queue
+    """
+    entry = await asyncio.to_thread(DeadLetterQueue(get_sync_redis()).get, job_id)
+    if entry is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found in dead-letter queue",
+        )
+    return DeadLetterDetail(**entry)
+
+
+@router.post("/dlq/requeue", response_model=RequeueResponse)
+async def requeue_dead_letters(
+    request: RequeueRequest,
+    admin: User = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+) -> RequeueResponse:
+    """Requeue dead-lettered jobs with a fresh retry budget (admin-only).
+
+    Args:
+        request: Job IDs or failure class to requeue
+        admin: Admin user
+        db: Database session
+
+    Returns:
+        Requeued job IDs and IDs not found in the dead-letter queue
+
+    Raises:
+        400: Neither job_ids nor failure_class given
+    """
+    if not request.job_ids and request.failure_class is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide job_ids or failure_class",
+        )
+
+    dlq = DeadLetterQueue(get_sync_redis())
+    job_ids = request.job_ids
+    if not job_ids:
+        job_ids = await asyncio.to_thread(dlq.job_ids, request.failure_class.value)
+
+    requeued, not_found = await asyncio.to_thread(dlq.requeue, job_ids)
+
+    # Tracked jobs go back to queued in Postgres too
+    tracked = []
+    for job_id in requeued:
+        try:
+            tracked.append(UUID(job_id))
+        except ValueError:
+            continue
+    await JobRepository(db).mark_many_requeued(tracked)
+
+    return RequeueResponse(requeued=requeued, not_found=not_found)
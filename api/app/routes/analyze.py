@@ -1,23 +1,31 @@
 """Analysis endpoints."""
 
-from fastapi import APIRouter, HTTPException, Depends, status
+import asyncio
+import uuid
+from typing import Dict, Optional, Union
+
+from fastapi import APIRouter, HTTPException, Depends, Header, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.config.database import get_db
 from app.config.settings import get_settings
-from app.models.profile import Profile
 from app.models.user import User
-from app.models.prompt import Prompt
+from app.repositories.job_repository import JobRepository
+from app.routes.jobs import JobCreateResponse
 from app.schemas.analyze import AnalyzeRequest, AnalyzeResponse
 from app.schemas.custom_analyze import CustomAnalyzeRequest, CustomAnalyzeResponse
 from app.schemas.batch_analyze import BatchAnalyzeRequest, BatchAnalyzeResponse, TaskResult
-from app.services.analysis import AnalysisService
+from app.services.analysis import AnalysisService, alias_speakers, normalization_options
 from app.services.llm import LLMProviderFactory
-from app.utils.dependencies import get_current_user
-from app.utils.rate_limit import can_user_rip, record_rip
+from app.utils.dependencies import get_current_user, get_user_or_anonymous
+from app.utils.queue import QueueService
+from app.utils.rate_limit import record_rip, refund_rip, reserve_rip
 from app.utils.logger import setup_logger
 from app.utils.metadata import generate_header
+from app.utils.profile_cache import CachedProfile, profile_cache
+from app.utils.prompt_catalog import prompt_catalog
+from app.utils.transcript_store import resolve_transcript
 
 logger = setup_logger(__name__)
 settings = get_settings()
@@ -49,37 +57,164 @@ def validate_transcript_size(transcript: str) -> None:
         )
 
 
-@router.post("/analyze", response_model=AnalyzeResponse)
+def estimate_work(transcript: str, tasks: Dict[str, str]) -> int:
+    """Estimate the work of an analysis in transcript characters sent.
+
+    Every task is a separate LLM call that includes the whole transcript.
+
+    Args:
+        transcript: Transcript text
+        tasks: Dictionary of {task_name: task_prompt}
+
+    Returns:
+        Transcript length times task count
+    """
+    return len(transcript) * max(len(tasks), 1)
+
+
+def parse_prefer(prefer: Optional[str]) -> Optional[str]:
+    """Read the execution mode a client asked for in its Prefer header.
+
+    ``Prefer: respond-async`` (RFC 7240) forces a background job and
+    ``Prefer: respond-sync`` forces an inline answer.
+
+    Args:
+        prefer: Prefer header value
+
+    Returns:
+        "async", "sync", or None to decide from the work estimate
+    """
+    if not prefer:
+        return None
+
+    preferences = {
+        token.split("=", 1)[0].strip().lower()
+        for part in prefer.split(",")
+        for token in part.split(";")
+    }
+    if "respond-async" in preferences:
+        return "async"
+    if "respond-sync" in preferences:
+        return "sync"
+    return None
+
+
+async def _enqueue_profile_job(
+    transcript: str,
+    profile: CachedProfile,
+    user: User,
+    db: AsyncSession,
+) -> ORJSONResponse:
+    """Run a profile analysis as a background job.
+
+    Returns:
+        202 response with the job ID and a Location header for polling
+
+    Raises:
+        HTTPException: 500 if the job couldn't be queued
+    """
+    job_repo = JobRepository(db)
+    job_id = uuid.uuid4()
+    db_job = None
+    options = normalization_options(profile)
+
+    try:
+        db_job = await job_repo.create(
+            job_id=job_id,
+            user_id=user.id,
+            provider=profile.provider.value,
+            model=profile.model,
+        )
+
+        job = await asyncio.to_thread(
+            QueueService().enqueue_analysis,
+            transcript=transcript,
+            provider=profile.provider.value,
+            model=profile.model,
+            system_prompt=profile.prompts.get("system", ""),
+            tasks=profile.prompts.get("tasks", {}),
+            user_id=str(user.id),
+            tier=user.subscription_tier.value,
+            job_id=str(job_id),
+            normalization=options.to_config(),
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to queue analysis: {e}", exc_info=True)
+
+        if db_job is not None:
+            await job_repo.mark_failed(db_job, str(e))
+
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": {
+                    "code": "job_creation_failed",
+                    "message": "Failed to queue transcript analysis",
+                    "retryable": True,
+                }
+            },
+        )
+
+    body = JobCreateResponse(
+        job_id=job.id,
+        status="queued",
+        message="Large analysis queued for processing; poll the job for results",
+    )
+    return ORJSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=body.model_dump(),
+        headers={"Location": f"/api/v1/jobs/{job.id}"},
+    )
+
+
+@router.post(
+    "/analyze",
+    response_model=AnalyzeResponse,
+    responses={status.HTTP_202_ACCEPTED: {"model": JobCreateResponse, "description": "Analysis queued as a job"}},
+)
 async def analyze_transcript(
     request: AnalyzeRequest,
+    prefer: Optional[str] = Header(default=None),
+    current_user: Optional[User] = Depends(get_user_or_anonymous),
     db: AsyncSession = Depends(get_db),
-) -> AnalyzeResponse:
+) -> Union[AnalyzeResponse, ORJSONResponse]:
     """Analyze a transcript using the specified profile.
 
-    This is a synchronous endpoint that processes the transcript immediately
-    and returns the results. For long transcripts, consider using the async
-    job-based API (coming soon).
+    Small analyses are processed immediately and the results returned.
+    For authenticated users, analyses whose estimated work (transcript
+    length times task count) exceeds ANALYZE_ASYNC_THRESHOLD_CHARS are
+    queued as a background job instead: the response is a 202 with the job
+    ID and a Location header, and results come from GET /jobs/{job_id}.
+
+    Clients can choose the path with a Prefer header: ``respond-async``
+    always queues a job (authentication required), ``respond-sync`` always
+    answers inline.
 
     Args:
-        request: Analysis request with transcript and profile key
+        request: Analysis request with transcript (or uploaded transcript ID) and profile key
+        prefer: Optional Prefer header
+        current_user: Authenticated user, if any (an invalid or expired
+            token is served as anonymous)
         db: Database session
 
     Returns:
-        Analysis results with metadata
+        Analysis results with metadata, or a 202 with the queued job
 
     Raises:
-        404: Profile not found
+        404: Profile or uploaded transcript not found
         400: Invalid transcript or profile
+        401: respond-async requested without a valid token
         500: Analysis failed
     """
+    # Uploaded transcripts (POST /transcripts) are referenced by ID
+    request.transcript = await resolve_transcript(request.transcript, request.transcript_id, current_user)
+
     # Validate transcript size
     validate_transcript_size(request.transcript)
 
-    # Find profile by key
-    result = await db.execute(
-        select(Profile).where(Profile.key == request.profile_key)
-    )
-    profile = result.scalar_one_or_none()
+    # Find profile by key (published profiles are cached in-process)
+    profile = await profile_cache.get(request.profile_key, db)
 
     if not profile:
         raise HTTPException(
@@ -106,6 +241,30 @@ async def analyze_transcript(
             },
         )
 
+    preferred = parse_prefer(prefer)
+    if preferred == "async" and current_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={
+                "error": {
+                    "code": "authentication_required",
+                    "message": "Sign in to run an analysis as a background job",
+                    "retryable": False,
+                }
+            },
+        )
+
+    run_async = preferred == "async"
+    if preferred is None and current_user is not None and settings.ANALYZE_ASYNC_THRESHOLD_CHARS > 0:
+        work = estimate_work(request.transcript, profile.prompts.get("tasks", {}))
+        run_async = work > settings.ANALYZE_ASYNC_THRESHOLD_CHARS
+
+    if run_async:
+        response = await _enqueue_profile_job(request.transcript, profile, current_user, db)
+        if preferred == "async":
+            response.headers["Preference-Applied"] = "respond-async"
+        return response
+
     # Analyze transcript
     try:
         service = AnalysisService()
@@ -220,9 +379,9 @@ async def analyze_batch(
     # Validate transcript size
     validate_transcript_size(request.transcript)
 
-    # Check rate limit
-    can_proceed, message = await can_user_rip(str(current_user.id), db)
-    if not can_proceed:
+    # Reserve a rip from the daily quota (refunded if the analysis fails)
+    reservation, message = await reserve_rip(current_user, db)
+    if reservation is None:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail={
@@ -244,6 +403,10 @@ async def analyze_batch(
         # Generate header from metadata (if provided)
         header = generate_header(request.metadata)
 
+        # Send speakers as S1, S2, ... (real names go back into each result)
+        participants = request.metadata.participants if request.metadata else None
+        transcript, aliases = alias_speakers(request.transcript, participants)
+
         results = []
         total_input = 0
         total_output = 0
@@ -252,7 +415,7 @@ async def analyze_batch(
         # Process each task
         for task in request.tasks:
             # Build full prompt
-            full_prompt = f"TRANSCRIPT:\n{request.transcript}\n\nTASK:\n{task.prompt}"
+            full_prompt = f"TRANSCRIPT:\n{transcript}\n\nTASK:\n{task.prompt}"
 
             # Execute task
             response = await provider.generate(
@@ -267,7 +430,8 @@ async def analyze_batch(
             total_cost += response.cost or 0.0
 
             # Prepend header to result (if metadata exists)
-            result_with_header = f"{header}\n{response.content}" if header else response.content
+            content = aliases.restore(response.content)
+            result_with_header = f"{header}\n{content}" if header else content
 
             results.append(
                 TaskResult(
@@ -305,10 +469,12 @@ async def analyze_batch(
 
     except HTTPException:
         # Re-raise HTTP exceptions (like quota exceeded)
+        await refund_rip(reservation)
         raise
 
     except Exception as e:
         logger.error(f"Batch analysis failed: {e}", exc_info=True)
+        await refund_rip(reservation)
 
         raise HTTPException(
             status_code=500,
@@ -324,12 +490,17 @@ async def analyze_batch(
 @router.get("/prompts")
 async def get_prompts(
     category: str | None = None,
+    if_none_match: Optional[str] = Header(default=None),
     db: AsyncSession = Depends(get_db),
-) -> dict:
+) -> Response:
     """Get active prompts for the configure page.
 
+    Served from an in-memory snapshot with an ETag; send it back in
+    If-None-Match to get a 304 while the catalog is unchanged.
+
     Args:
         category: Optional filter by category ('meetings' or 'presentations')
+        if_none_match: Optional If-None-Match header
         db: Database session
 
     Returns:
@@ -340,36 +511,13 @@ async def get_prompts(
         Admin-created prompts appear as regular selectable prompts.
         Only user-submitted ad-hoc prompts are considered "custom prompts".
     """
-    query = select(Prompt).where(Prompt.is_active == True).order_by(Prompt.task_name)
-
-    if category:
-        query = query.where(Prompt.category == category)
-
-    result = await db.execute(query)
-    prompts = result.scalars().all()
-
-    # Group by category
-    # Return description for display, prompt_json for processing
-    meetings_prompts = [
-        {
-            "task_name": p.task_name,
-            "description": p.description,  # User-facing description
-            "prompt": p.prompt_json,  # Actual JSON prompt for processing (kept as 'prompt' for backward compatibility)
-        }
-        for p in prompts
-        if p.category == "meetings"
-    ]
-    presentations_prompts = [
-        {
-            "task_name": p.task_name,
-            "description": p.description,  # User-facing description
-            "prompt": p.prompt_json,  # Actual JSON prompt for processing (kept as 'prompt' for backward compatibility)
-        }
-        for p in prompts
-        if p.category == "presentations"
-    ]
-
-    return {
-        "meetings": meetings_prompts,
-        "presentations": presentations_prompts,
+    snapshot = await prompt_catalog.get(db, category)
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": f"public, max-age={settings.PROMPT_CATALOG_MAX_AGE_SECONDS}",
     }
+
+    if snapshot.matches(if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
@@ -16,7 +16,7 @@ from app.config.database import get_db
 from app.config.settings import get_settings
 from app.models.user import User, UserRole, SubscriptionTier
 from app.schemas.auth import AuthResponse, TokenResponse, UserResponse, MagicLinkResponse
-from app.utils.auth import create_access_token, create_refresh_token, verify_password, get_password_hash
+from app.utils.auth import create_access_token, create_refresh_token, check_password, hash_password
 from app.utils.email_purelymail import send_password_reset_email, send_welcome_email
 from app.utils.logger import setup_logger
 
@@ -80,7 +80,8 @@ async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
             detail="Invalid email or password",
         )
 
-    if not verify_password(request.password, user.hashed_password):
+    valid, new_hash = await check_password(request.password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -92,6 +93,11 @@ async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
             detail="User account is inactive",
         )
 
+    # Upgrade hashes made with fewer rounds than BCRYPT_ROUNDS
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+
     # Generate JWT tokens
     token_data = {"sub": str(user.id), "email": user.email}
     access_token = create_access_token(token_data)
@@ -151,7 +157,7 @@ async def register(request: RegisterRequest, db: AsyncSession = Depends(get_db))
         id=uuid.uuid4(),
         email=request.email,
         name=request.name,
-        hashed_password=get_password_hash(request.password),
+        hashed_password=await hash_password(request.password),
         role=UserRole.USER,
         subscription_tier=SubscriptionTier.FREE,
         is_active=True,
@@ -274,7 +280,7 @@ async def confirm_password_reset(
         )
 
     # Update password
-    user.hashed_password = get_password_hash(request.new_password)
+    user.hashed_password = await hash_password(request.new_password)
     await db.commit()
 
     return {"message": "Password has been reset successfully"}
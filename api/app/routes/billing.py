@@ -1,5 +1,7 @@
 """Billing and subscription endpoints."""
 
+import asyncio
+
 import stripe
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
@@ -7,8 +9,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.database import get_db
 from app.config.settings import get_settings
-from app.models.user import User, SubscriptionTier, SubscriptionSource
+from app.models.user import User, SubscriptionTier
+from app.services.billing_events import HANDLED_EVENT_TYPES, record_event
 from app.utils.dependencies import get_current_user
+from app.utils.logger import setup_logger
+from app.utils.queue import QueueService
+
+logger = setup_logger(__name__)
 
 router = APIRouter()
 settings = get_settings()
@@ -66,8 +73,9 @@ async def create_checkout_session(
         )
 
     try:
-        # Create Stripe checkout session
-        checkout_session = stripe.checkout.Session.create(
+        # Create Stripe checkout session (the SDK blocks, so off the event loop)
+        checkout_session = await asyncio.to_thread(
+            stripe.checkout.Session.create,
             customer_email=current_user.email,
             payment_method_types=["card"],
             line_items=[
@@ -130,12 +138,22 @@ async def stripe_webhook(request: Request, db: AsyncSession = Depends(get_db)):
     """
     Handle Stripe webhook events.
 
+    Verified events are stored and applied by the worker, so this returns
+    as soon as the event is saved. Stripe redelivers events until it gets a
+    2xx; a redelivered event (same event ID) is stored once and applied at
+    most once.
+
     Args:
         request: FastAPI request with Stripe event
         db: Database session
 
     Returns:
         Success message
+
+    Raises:
+        400: Missing or invalid signature, or invalid payload
+        503: Webhook secret not configured, or the event couldn't be queued
+            (Stripe retries it later)
     """
     if not settings.STRIPE_WEBHOOK_SECRET:
         raise HTTPException(
@@ -170,63 +188,20 @@ async def stripe_webhook(request: Request, db: AsyncSession = Depends(get_db)):
             detail="Invalid signature",
         )
 
-    # Handle the event
-    from sqlalchemy import select
-    import uuid
-
-    if event["type"] == "checkout.session.completed":
-        session = event["data"]["object"]
-        user_id = session.get("metadata", {}).get("user_id")
-
-        if user_id:
-            # Update user subscription
-            result = await db.execute(
-                select(User).where(User.id == uuid.UUID(user_id))
+    # Subscription changes are applied by the worker; other events need no work
+    if event["type"] not in HANDLED_EVENT_TYPES:
+        return {"status": "success"}
+
+    if await record_event(db, event):
+        try:
+            await asyncio.to_thread(QueueService().enqueue_stripe_event, event["id"])
+        except Exception as e:
+            # The event is stored; Stripe's redelivery queues it again
+            logger.error(f"Failed to queue Stripe event {event['id']}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Could not queue event, please retry",
             )
-            user = result.scalar_one_or_none()
-
-            if user:
-                user.subscription_tier = SubscriptionTier.PRO
-                user.subscription_source = SubscriptionSource.STRIPE  # Mark as Stripe payment
-                user.stripe_customer_id = session.get("customer")
-                user.stripe_subscription_id = session.get("subscription")
-                await db.commit()
-
-    elif event["type"] == "customer.subscription.deleted":
-        subscription = event["data"]["object"]
-        user_id = subscription.get("metadata", {}).get("user_id")
-
-        if user_id:
-            # Downgrade user to free tier
-            result = await db.execute(
-                select(User).where(User.id == uuid.UUID(user_id))
-            )
-            user = result.scalar_one_or_none()
-
-            if user:
-                user.subscription_tier = SubscriptionTier.FREE
-                user.subscription_source = SubscriptionSource.NONE
-                await db.commit()
-
-    elif event["type"] == "customer.subscription.updated":
-        subscription = event["data"]["object"]
-        user_id = subscription.get("metadata", {}).get("user_id")
-
-        if user_id:
-            # Check subscription status
-            result = await db.execute(
-                select(User).where(User.id == uuid.UUID(user_id))
-            )
-            user = result.scalar_one_or_none()
-
-            if user and subscription.get("status") == "active":
-                user.subscription_tier = SubscriptionTier.PRO
-                user.subscription_source = SubscriptionSource.STRIPE
-                await db.commit()
-            elif user and subscription.get("status") in ["canceled", "unpaid", "past_due"]:
-                user.subscription_tier = SubscriptionTier.FREE
-                user.subscription_source = SubscriptionSource.NONE
-                await db.commit()
 
     return {"status": "success"}
 
@@ -264,8 +239,9 @@ async def create_portal_session(
         )
 
     try:
-        # Create Stripe Customer Portal session
-        portal_session = stripe.billing_portal.Session.create(
+        # Create Stripe Customer Portal session (the SDK blocks, so off the event loop)
+        portal_session = await asyncio.to_thread(
+            stripe.billing_portal.Session.create,
             customer=current_user.stripe_customer_id,
             return_url=settings.STRIPE_SUCCESS_URL,  # Where to return after portal
         )
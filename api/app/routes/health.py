@@ -3,9 +3,9 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-import redis.asyncio as redis
 
 from app.config.database import get_db
+from app.config.redis import get_redis
 from app.config.settings import get_settings
 
 router = APIRouter()
@@ -37,10 +37,8 @@ async def health_check(db: AsyncSession = Depends(get_db)):
 
     # Check Redis
     try:
-        r = redis.from_url(settings.REDIS_URL, decode_responses=True)
-        await r.ping()
+        await get_redis().ping()
         checks["redis"] = "ok"
-        await r.close()
     except Exception as e:
         checks["redis"] = f"error: {str(e)}"
 
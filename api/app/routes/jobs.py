@@ -1,12 +1,29 @@
 """Async job endpoints for background processing."""
 
-from fastapi import APIRouter, HTTPException, Depends, status
+import asyncio
+import hashlib
+import json
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, HTTPException, Depends, Header, Response, status
 from pydantic import BaseModel
-from typing import Optional
-
+from rq.exceptions import NoSuchJobError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Tuple
+
+from app.config.database import get_db
+from app.config.settings import get_settings
+from app.models.job import Job, JobStatus
 from app.models.user import User
+from app.repositories.job_repository import JobRepository
+from app.schemas.transcript_source import TranscriptSource
 from app.utils.dependencies import get_current_user
+from app.utils.off_peak import OffPeakFullError
 from app.utils.queue import QueueService
+from app.utils.transcript_store import resolve_transcript
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -14,20 +31,21 @@ logger = setup_logger(__name__)
 router = APIRouter()
 
 
-class JobCreateRequest(BaseModel):
+class JobCreateRequest(TranscriptSource):
     """Request to create an async analysis job."""
-    transcript: str
     provider: str = "gemini"
     model: str = "gemini-2.5-flash"
     system_prompt: str = "You are an expert at analyzing transcripts."
     tasks: dict  # {task_name: task_prompt}
     priority: Optional[str] = "default"
+    not_before: Optional[datetime] = None  # Don't start before this time (UTC if naive)
+    off_peak: bool = False  # Run in the off-peak window, at low priority
 
 
 class JobStatusResponse(BaseModel):
     """Job status response."""
     job_id: str
-    status: str  # queued, started, finished, failed
+    status: str  # queued, started, finished, failed, canceled
     created_at: Optional[str] = None
     started_at: Optional[str] = None
     ended_at: Optional[str] = None
@@ -40,21 +58,243 @@ class JobCreateResponse(BaseModel):
     job_id: str
     status: str
     message: str
+    scheduled_for: Optional[str] = None  # Release time of deferred jobs
+
+
+class BulkJobItem(TranscriptSource):
+    """One transcript in a bulk submission."""
+    tasks: Optional[dict] = None  # Overrides the batch's shared tasks
+    system_prompt: Optional[str] = None
+
+
+class BulkJobCreateRequest(BaseModel):
+    """Request to create many async analysis jobs at once."""
+    items: List[BulkJobItem]
+    tasks: Optional[dict] = None  # Shared {task_name: task_prompt}
+    provider: str = "gemini"
+    model: str = "gemini-2.5-flash"
+    system_prompt: str = "You are an expert at analyzing transcripts."
+    priority: Optional[str] = "default"
+
+
+class BulkJobItemResponse(BaseModel):
+    """Job created (or replayed) for one bulk item."""
+    index: int
+    job_id: str
+    status: str
+    replayed: bool = False
+
+
+class BulkJobCreateResponse(BaseModel):
+    """Bulk job creation response."""
+    batch_id: str
+    jobs: List[BulkJobItemResponse]
+    message: str
+
+
+class JobStatusBulkRequest(BaseModel):
+    """Request for the status of many jobs."""
+    job_ids: List[str] = []
+    batch_id: Optional[str] = None  # Adds every job in the batch
+    include_results: bool = False
+
+
+class JobStatusBulkResponse(BaseModel):
+    """Status of many jobs."""
+    jobs: List[JobStatusResponse]
+    not_found: List[str]
+
+
+class BatchJobStatus(BaseModel):
+    """Status of one job in a batch."""
+    job_id: str
+    status: str
+
+
+class BatchStatusResponse(BaseModel):
+    """Aggregate status of a bulk submission."""
+    batch_id: str
+    created_at: Optional[str] = None
+    total: int
+    counts: Dict[str, int]  # {status: number of jobs}
+    jobs: List[BatchJobStatus]
+
+
+def _derive_idempotency_key(
+    user_id: uuid.UUID,
+    request: JobCreateRequest,
+    client_key: Optional[str],
+) -> str:
+    """Build the stored idempotency key for a submission.
+
+    Client-supplied keys are scoped to the user. Without one, the key is
+    derived from everything that determines the job's output, so an
+    identical resubmission maps to the same job.
+    """
+    if client_key:
+        material = f"{user_id}:{client_key}"
+    else:
+        material = json.dumps(
+            {
+                "user_id": str(user_id),
+                "transcript": request.transcript,
+                "tasks": request.tasks,
+                "provider": request.provider,
+                "model": request.model,
+                "system_prompt": request.system_prompt,
+            },
+            sort_keys=True,
+        )
+
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _is_replayable(job: Job, ttl: int) -> bool:
+    """Whether an existing job should be returned instead of a new one.
+
+    Failed and cancelled jobs can always be resubmitted; finished jobs only
+    within the idempotency window.
+    """
+    if job.status in (JobStatus.FAILED, JobStatus.CANCELLED):
+        return False
+    if job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+        return True
+
+    finished_at = job.completed_at or job.updated_at
+    return finished_at >= datetime.now(timezone.utc) - timedelta(seconds=ttl)
+
+
+def _resolve_bulk_items(request: BulkJobCreateRequest) -> List[JobCreateRequest]:
+    """Validate a bulk submission in one pass and expand it into jobs.
+
+    Raises:
+        HTTPException: 400 listing every invalid item
+    """
+    settings = get_settings()
+
+    if not request.items or len(request.items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": {
+                    "code": "invalid_bulk_size",
+                    "message": f"A bulk submission must contain between 1 and {settings.BULK_MAX_ITEMS:,} items",
+                    "retryable": False,
+                    "max_items": settings.BULK_MAX_ITEMS,
+                }
+            },
+        )
+
+    errors = []
+    for index, item in enumerate(request.items):
+        if not (item.tasks or request.tasks):
+            errors.append({"index": index, "message": "No tasks given for this item or the batch"})
+        if not item.transcript.strip():
+            errors.append({"index": index, "message": "Transcript is empty"})
+        elif len(item.transcript) > settings.MAX_TRANSCRIPT_LENGTH:
+            errors.append({
+                "index": index,
+                "message": (
+                    f"Transcript has {len(item.transcript):,} characters; "
+                    f"the maximum is {settings.MAX_TRANSCRIPT_LENGTH:,}"
+                ),
+            })
+
+    if errors:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": {
+                    "code": "invalid_bulk_request",
+                    "message": f"{len({e['index'] for e in errors})} of {len(request.items)} items are invalid",
+                    "retryable": False,
+                    "items": errors,
+                }
+            },
+        )
+
+    return [
+        JobCreateRequest(
+            transcript=item.transcript,
+            provider=request.provider,
+            model=request.model,
+            system_prompt=item.system_prompt or request.system_prompt,
+            tasks=item.tasks or request.tasks,
+            priority=request.priority,
+        )
+        for item in request.items
+    ]
+
+
+# Postgres job status -> RQ status vocabulary used by the API
+_STATUS_NAMES = {
+    JobStatus.QUEUED: "queued",
+    JobStatus.RUNNING: "started",
+    JobStatus.COMPLETED: "finished",
+    JobStatus.FAILED: "failed",
+    JobStatus.CANCELLED: "canceled",
+}
+
+
+async def _persisted_status(
+    job_repo: JobRepository,
+    db_job: Job,
+    include_result: bool = True,
+) -> JobStatusResponse:
+    """Build a status response from a jobs row."""
+    return JobStatusResponse(
+        job_id=str(db_job.id),
+        status=_STATUS_NAMES.get(db_job.status, db_job.status.value),
+        created_at=db_job.created_at.isoformat() if db_job.created_at else None,
+        started_at=db_job.started_at.isoformat() if db_job.started_at else None,
+        ended_at=db_job.completed_at.isoformat() if db_job.completed_at else None,
+        result=await job_repo.get_result(db_job) if include_result else None,
+        error=db_job.error if include_result else None,
+    )
+
+
+def _replay(response: Response, job_id: str, job: Optional[Job]) -> JobCreateResponse:
+    """Build the response for a duplicate submission."""
+    response.status_code = status.HTTP_200_OK
+    response.headers["Idempotent-Replayed"] = "true"
+
+    return JobCreateResponse(
+        job_id=job_id,
+        status=job.status.value if job else JobStatus.QUEUED.value,
+        message="Duplicate request; returning existing job",
+    )
 
 
 @router.post("/jobs/analyze", response_model=JobCreateResponse, status_code=status.HTTP_202_ACCEPTED)
 async def create_analysis_job(
     request: JobCreateRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
     current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> JobCreateResponse:
     """Create an async transcript analysis job.
 
     This endpoint queues the analysis for background processing and returns
     immediately with a job ID. Use GET /jobs/{job_id} to check status.
 
+    Submissions are idempotent: a request with the same Idempotency-Key
+    header (or, without one, the same transcript, tasks, model and user)
+    returns the existing queued, running or recently finished job with a
+    200 and an ``Idempotent-Replayed: true`` header instead of enqueuing
+    duplicate work.
+
+    Jobs can be deferred with ``not_before``. ``off_peak`` jobs run at low
+    priority in the nightly off-peak window (or earlier, while the queues
+    are idle); releases are spaced out so the window doesn't open with a
+    burst.
+
     Args:
         request: Job creation request
+        response: Outgoing response (status/headers set on replay)
+        idempotency_key: Optional client-supplied Idempotency-Key header
         current_user: Authenticated user
+        db: Database session
 
     Returns:
         Job ID and status
@@ -78,27 +318,145 @@ async def create_analysis_job(
             "message": "Job queued for processing"
         }
     """
+    settings = get_settings()
+    if request.not_before is not None:
+        not_before = request.not_before
+        if not_before.tzinfo is None:
+            not_before = not_before.replace(tzinfo=timezone.utc)
+        if not_before > datetime.now(timezone.utc) + timedelta(hours=settings.JOB_MAX_DEFER_HOURS):
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error": {
+                        "code": "invalid_not_before",
+                        "message": f"Jobs can be deferred by at most {settings.JOB_MAX_DEFER_HOURS} hours",
+                        "retryable": False,
+                        "max_defer_hours": settings.JOB_MAX_DEFER_HOURS,
+                    }
+                },
+            )
+
+    # Uploaded transcripts (POST /transcripts) are referenced by ID
+    request.transcript = await resolve_transcript(request.transcript, request.transcript_id, current_user)
+
+    ttl = settings.IDEMPOTENCY_TTL_SECONDS
+    key = _derive_idempotency_key(current_user.id, request, idempotency_key)
+    job_repo = JobRepository(db)
+    job_id = uuid.uuid4()
+    queue_service = None
+    db_job = None
+
     try:
         queue_service = QueueService()
 
-        job = queue_service.enqueue_analysis(
+        # Fast path: the Redis claim serializes concurrent duplicates
+        existing_id = await asyncio.to_thread(queue_service.claim_idempotency_key, key, str(job_id), ttl)
+        if existing_id:
+            existing = await job_repo.get_by_id(uuid.UUID(existing_id))
+            if existing is None or _is_replayable(existing, ttl):
+                logger.info(f"Replaying job {existing_id} for duplicate submission")
+                return _replay(response, existing_id, existing)
+
+            # Only one resubmission may take over the stale claim
+            winner_id = await asyncio.to_thread(
+                queue_service.swap_idempotency_key, key, existing_id, str(job_id), ttl
+            )
+            if winner_id:
+                logger.info(f"Replaying job {winner_id} for duplicate submission")
+                return _replay(response, winner_id, await job_repo.get_by_id(uuid.UUID(winner_id)))
+
+        # Postgres is the durable record if the Redis claim expired or was lost
+        existing = await job_repo.get_by_idempotency_key(key)
+        if existing:
+            if _is_replayable(existing, ttl):
+                await asyncio.to_thread(
+                    queue_service.swap_idempotency_key, key, str(job_id), str(existing.id), ttl
+                )
+                logger.info(f"Replaying job {existing.id} for duplicate submission")
+                return _replay(response, str(existing.id), existing)
+            await job_repo.release_idempotency_key(existing)
+
+        release_at = None
+        if request.not_before is not None or request.off_peak:
+            release_at = await asyncio.to_thread(
+                queue_service.off_peak.release_time, request.not_before, request.off_peak
+            )
+
+        try:
+            db_job = await job_repo.create(
+                job_id=job_id,
+                user_id=current_user.id,
+                provider=request.provider,
+                model=request.model,
+                idempotency_key=key,
+            )
+        except IntegrityError:
+            # A concurrent submission inserted the same key first
+            await db.rollback()
+            existing = await job_repo.get_by_idempotency_key(key)
+            if existing is None:
+                raise
+            await asyncio.to_thread(
+                queue_service.swap_idempotency_key, key, str(job_id), str(existing.id), ttl
+            )
+            logger.info(f"Replaying job {existing.id} for duplicate submission")
+            return _replay(response, str(existing.id), existing)
+
+        job = await asyncio.to_thread(
+            queue_service.enqueue_analysis,
             transcript=request.transcript,
             provider=request.provider,
             model=request.model,
             system_prompt=request.system_prompt,
             tasks=request.tasks,
-            priority=request.priority or "default",
+            priority="low" if request.off_peak else request.priority or "default",
+            user_id=str(current_user.id),
+            tier=current_user.subscription_tier.value,
+            job_id=str(job_id),
+            release_at=release_at,
+            off_peak=request.off_peak,
         )
 
+        if release_at is not None:
+            return JobCreateResponse(
+                job_id=job.id,
+                status="scheduled",
+                message=f"Job scheduled for {release_at.isoformat()}",
+                scheduled_for=release_at.isoformat(),
+            )
+
         return JobCreateResponse(
             job_id=job.id,
             status="queued",
             message="Job queued for processing",
         )
 
+    except OffPeakFullError as e:
+        await asyncio.to_thread(queue_service.release_idempotency_key, key, str(job_id))
+
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": {
+                    "code": "off_peak_full",
+                    "message": str(e),
+                    "retryable": True,
+                }
+            },
+        )
+
     except Exception as e:
         logger.error(f"Failed to create job: {e}", exc_info=True)
 
+        # Free the key so the client's retry isn't replayed onto a dead job
+        try:
+            if db_job is not None:
+                await job_repo.mark_failed(db_job, str(e))
+            if queue_service is not None:
+                await asyncio.to_thread(queue_service.release_idempotency_key, key, str(job_id))
+        except Exception as cleanup_error:
+            logger.error(f"Failed to release idempotency key: {cleanup_error}")
+
         raise HTTPException(
             status_code=500,
             detail={
@@ -111,16 +469,378 @@ async def create_analysis_job(
         )
 
 
+@router.post("/jobs/analyze/bulk", response_model=BulkJobCreateResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_bulk_analysis_jobs(
+    request: BulkJobCreateRequest,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> BulkJobCreateResponse:
+    """Create many async analysis jobs in one request.
+
+    Every item is validated up front, the jobs rows are written in one
+    transaction and all jobs are enqueued in one Redis transaction. Items
+    are deduplicated like POST /jobs/analyze; an Idempotency-Key header
+    applies per item (suffixed with the item index). Use
+    GET /jobs/batches/{batch_id} for aggregate status.
+
+    Args:
+        request: Bulk job creation request
+        idempotency_key: Optional client-supplied Idempotency-Key header
+        current_user: Authenticated user
+        db: Database session
+
+    Returns:
+        Batch ID and the job for each item
+
+    Example:
+        POST /api/v1/jobs/analyze/bulk
+        {
+            "tasks": {"summary": "Provide a brief summary..."},
+            "items": [
+                {"transcript": "..."},
+                {"transcript": "...", "tasks": {"action_items": "List..."}}
+            ]
+        }
+
+        Response:
+        {
+            "batch_id": "f1e2-...",
+            "jobs": [
+                {"index": 0, "job_id": "abc-123", "status": "queued", "replayed": false},
+                {"index": 1, "job_id": "def-456", "status": "queued", "replayed": false}
+            ],
+            "message": "2 jobs queued for processing"
+        }
+    """
+    for item in request.items:
+        item.transcript = await resolve_transcript(item.transcript, item.transcript_id, current_user)
+    job_requests = _resolve_bulk_items(request)
+
+    ttl = get_settings().IDEMPOTENCY_TTL_SECONDS
+    keys = [
+        _derive_idempotency_key(
+            current_user.id,
+            job_request,
+            f"{idempotency_key}:{index}" if idempotency_key else None,
+        )
+        for index, job_request in enumerate(job_requests)
+    ]
+    new_ids = [str(uuid.uuid4()) for _ in keys]
+    batch_id = str(uuid.uuid4())
+    job_repo = JobRepository(db)
+    queue_service = None
+    created_jobs = []
+    new_claims: Dict[str, str] = {}
+
+    try:
+        queue_service = QueueService()
+        claims = await asyncio.to_thread(queue_service.claim_idempotency_keys, keys, new_ids, ttl)
+
+        holders_by_id = await job_repo.get_many_for_user(
+            [uuid.UUID(claim) for claim in claims if claim],
+            current_user.id,
+        )
+        holders_by_key = await job_repo.get_by_idempotency_keys(keys)
+
+        results: List[Optional[BulkJobItemResponse]] = [None] * len(keys)
+        swaps: Dict[int, Tuple[str, str]] = {}
+        stale_jobs = []
+        to_create = []
+
+        for index, (key, claim) in enumerate(zip(keys, claims)):
+            holder = holders_by_id.get(uuid.UUID(claim)) if claim else holders_by_key.get(key)
+            holder_id = claim or (str(holder.id) if holder else None)
+
+            if holder_id and (holder is None or _is_replayable(holder, ttl)):
+                results[index] = BulkJobItemResponse(
+                    index=index,
+                    job_id=holder_id,
+                    status=holder.status.value if holder else JobStatus.QUEUED.value,
+                    replayed=True,
+                )
+                if not claim:
+                    swaps[index] = (new_ids[index], holder_id)
+                continue
+
+            if claim:
+                swaps[index] = (claim, new_ids[index])
+            if key in holders_by_key:
+                stale_jobs.append(holders_by_key[key])
+
+            new_claims[key] = new_ids[index]
+            to_create.append(index)
+
+        # Compare-and-set, so only one resubmission takes over a stale claim
+        winners = await asyncio.to_thread(
+            queue_service.swap_idempotency_keys,
+            [keys[index] for index in swaps],
+            [expected for expected, _ in swaps.values()],
+            [job_id for _, job_id in swaps.values()],
+            ttl,
+        )
+        for index, winner_id in zip(swaps, winners):
+            if winner_id and index in to_create:
+                results[index] = BulkJobItemResponse(
+                    index=index,
+                    job_id=winner_id,
+                    status=JobStatus.QUEUED.value,
+                    replayed=True,
+                )
+                del new_claims[keys[index]]
+                to_create.remove(index)
+
+        if stale_jobs:
+            await job_repo.release_idempotency_keys(stale_jobs)
+
+        created_jobs = await job_repo.create_many([
+            {
+                "job_id": uuid.UUID(new_ids[index]),
+                "user_id": current_user.id,
+                "provider": job_requests[index].provider,
+                "model": job_requests[index].model,
+                "idempotency_key": keys[index],
+            }
+            for index in to_create
+        ])
+
+        for index in to_create:
+            results[index] = BulkJobItemResponse(
+                index=index,
+                job_id=new_ids[index],
+                status=JobStatus.QUEUED.value,
+            )
+
+        await asyncio.to_thread(
+            queue_service.enqueue_analysis_many,
+            [
+                {
+                    "transcript": job_requests[index].transcript,
+                    "provider": job_requests[index].provider,
+                    "model": job_requests[index].model,
+                    "system_prompt": job_requests[index].system_prompt,
+                    "tasks": job_requests[index].tasks,
+                    "job_id": new_ids[index],
+                }
+                for index in to_create
+            ],
+            priority=request.priority or "default",
+            user_id=str(current_user.id),
+            tier=current_user.subscription_tier.value,
+            batch_id=batch_id,
+            batch_job_ids=[result.job_id for result in results],
+        )
+
+        logger.info(
+            f"Bulk submission {batch_id}: {len(to_create)} queued, "
+            f"{len(keys) - len(to_create)} replayed"
+        )
+
+        return BulkJobCreateResponse(
+            batch_id=batch_id,
+            jobs=results,
+            message=f"{len(to_create)} jobs queued for processing",
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to create bulk jobs: {e}", exc_info=True)
+
+        # Free the keys so the client's retry isn't replayed onto dead jobs
+        try:
+            if created_jobs:
+                await job_repo.mark_many_failed(created_jobs, str(e))
+            if queue_service is not None:
+                await asyncio.to_thread(queue_service.release_idempotency_keys, new_claims)
+        except Exception as cleanup_error:
+            logger.error(f"Failed to release idempotency keys: {cleanup_error}")
+
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": {
+                    "code": "job_creation_failed",
+                    "message": f"Failed to create analysis jobs: {str(e)}",
+                    "retryable": True,
+                }
+            },
+        )
+
+
+@router.get("/jobs/batches/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch_status(
+    batch_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> BatchStatusResponse:
+    """Get the aggregate status of a bulk submission.
+
+    Args:
+        batch_id: Batch ID returned by POST /jobs/analyze/bulk
+        current_user: Authenticated user
+        db: Database session
+
+    Returns:
+        Status counts and the status of each job
+    """
+    queue_service = QueueService()
+    batch = await queue_service.get_batch(batch_id)
+
+    if batch is None or batch["user_id"] != str(current_user.id):
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": {
+                    "code": "batch_not_found",
+                    "message": f"Batch '{batch_id}' not found",
+                    "retryable": False,
+                }
+            },
+        )
+
+    statuses = batch["statuses"]
+
+    # Jobs that have expired from Redis are read from Postgres
+    expired = [
+        uuid.UUID(job_id)
+        for job_id, job_status in zip(batch["job_ids"], statuses)
+        if job_status is None
+    ]
+    persisted = await JobRepository(db).get_many_for_user(expired, current_user.id)
+
+    jobs = []
+    for job_id, job_status in zip(batch["job_ids"], statuses):
+        if job_status is None:
+            db_job = persisted.get(uuid.UUID(job_id))
+            job_status = _STATUS_NAMES.get(db_job.status, db_job.status.value) if db_job else "unknown"
+        jobs.append(BatchJobStatus(job_id=job_id, status=job_status))
+
+    return BatchStatusResponse(
+        batch_id=batch_id,
+        created_at=batch.get("created_at"),
+        total=len(jobs),
+        counts=dict(Counter(job.status for job in jobs)),
+        jobs=jobs,
+    )
+
+
+@router.post("/jobs/status", response_model=JobStatusBulkResponse)
+async def get_job_statuses(
+    request: JobStatusBulkRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> JobStatusBulkResponse:
+    """Get the status of many jobs in one request.
+
+    Statuses are read from Redis in one pipelined round trip; jobs that have
+    expired from Redis are read from Postgres in one query. Results and
+    errors are left out unless ``include_results`` is set.
+
+    Args:
+        request: Job IDs and/or a batch ID
+        current_user: Authenticated user
+        db: Database session
+
+    Returns:
+        Status of each job, in request order, and the IDs that weren't found
+
+    Example:
+        POST /api/v1/jobs/status
+        {"job_ids": ["abc-123", "def-456"]}
+
+        Response:
+        {
+            "jobs": [
+                {"job_id": "abc-123", "status": "finished", ...},
+                {"job_id": "def-456", "status": "started", ...}
+            ],
+            "not_found": []
+        }
+    """
+    queue_service = QueueService()
+    job_ids = list(request.job_ids)
+
+    if request.batch_id:
+        batch = await queue_service.get_batch(request.batch_id, include_statuses=False)
+        if batch is None or batch["user_id"] != str(current_user.id):
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "error": {
+                        "code": "batch_not_found",
+                        "message": f"Batch '{request.batch_id}' not found",
+                        "retryable": False,
+                    }
+                },
+            )
+        job_ids.extend(batch["job_ids"])
+
+    job_ids = list(dict.fromkeys(job_ids))
+    max_ids = get_settings().BULK_MAX_ITEMS
+    if not job_ids or len(job_ids) > max_ids:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": {
+                    "code": "invalid_status_request",
+                    "message": f"Request the status of between 1 and {max_ids:,} jobs",
+                    "retryable": False,
+                    "max_items": max_ids,
+                }
+            },
+        )
+
+    statuses = await queue_service.get_job_statuses(
+        job_ids,
+        include_results=request.include_results,
+        user_id=str(current_user.id),
+    )
+
+    # Jobs that have expired from Redis are read from Postgres
+    expired = {}
+    for job_id in job_ids:
+        if job_id not in statuses:
+            try:
+                expired[uuid.UUID(job_id)] = job_id
+            except ValueError:
+                pass  # Not a jobs-table ID
+    job_repo = JobRepository(db)
+    persisted = await job_repo.get_many_for_user(list(expired), current_user.id)
+
+    jobs = []
+    not_found = []
+    for job_id in job_ids:
+        if job_id in statuses:
+            jobs.append(JobStatusResponse(**statuses[job_id]))
+            continue
+
+        try:
+            db_job = persisted.get(uuid.UUID(job_id))
+        except ValueError:
+            db_job = None
+
+        if db_job is None:
+            not_found.append(job_id)
+        else:
+            jobs.append(await _persisted_status(job_repo, db_job, request.include_results))
+
+    return JobStatusBulkResponse(jobs=jobs, not_found=not_found)
+
+
 @router.get("/jobs/{job_id}", response_model=JobStatusResponse)
 async def get_job_status(
     job_id: str,
     current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> JobStatusResponse:
     """Get the status of an async job.
 
+    Redis is checked first; once the RQ job has expired the status and
+    result are served from Postgres.
+
     Args:
         job_id: Job ID
         current_user: Authenticated user
+        db: Database session
 
     Returns:
         Job status and result (if complete)
@@ -150,44 +870,90 @@ async def get_job_status(
     """
     try:
         queue_service = QueueService()
-        status_data = queue_service.get_job_status(job_id)
+        status_data = await queue_service.get_job_status(job_id, user_id=str(current_user.id))
 
         return JobStatusResponse(**status_data)
 
+    except Exception as e:
+        logger.debug(f"Job {job_id} not in Redis, checking database: {e}")
+
+    job_repo = JobRepository(db)
+    db_job = None
+    try:
+        db_job = await job_repo.get_by_id_for_user(uuid.UUID(job_id), current_user.id)
+    except ValueError:
+        pass  # Not a jobs-table ID
     except Exception as e:
         logger.error(f"Failed to get job status: {e}")
 
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "error": {
-                    "code": "job_not_found",
-                    "message": f"Job '{job_id}' not found",
-                    "retryable": False,
-                }
-            },
-        )
+    if db_job is not None:
+        return await _persisted_status(job_repo, db_job)
+
+    raise HTTPException(
+        status_code=404,
+        detail={
+            "error": {
+                "code": "job_not_found",
+                "message": f"Job '{job_id}' not found",
+                "retryable": False,
+            }
+        },
+    )
 
 
 @router.delete("/jobs/{job_id}")
 async def cancel_job(
     job_id: str,
     current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Cancel a queued job.
+    """Cancel a job.
+
+    Queued jobs are removed immediately. Running jobs stop cooperatively:
+    the in-flight LLM call is aborted and the results of tasks that already
+    finished are kept (GET /jobs/{job_id} reports status "canceled").
 
     Args:
         job_id: Job ID
         current_user: Authenticated user
+        db: Database session
 
     Returns:
         Cancellation confirmation
     """
+    job_repo = JobRepository(db)
+    db_job = None
     try:
-        queue_service = QueueService()
-        cancelled = queue_service.cancel_job(job_id)
+        db_job = await job_repo.get_by_id(uuid.UUID(job_id))
+    except ValueError:
+        pass  # Not a jobs-table ID
+
+    not_found = HTTPException(
+        status_code=404,
+        detail={
+            "error": {
+                "code": "job_not_found",
+                "message": f"Job '{job_id}' not found",
+                "retryable": False,
+            }
+        },
+    )
+    if db_job is not None and db_job.user_id != current_user.id:
+        raise not_found
 
-        if cancelled:
+    try:
+        queue_service = QueueService()
+        try:
+            outcome = await queue_service.cancel_job(job_id, user_id=str(current_user.id))
+        except NoSuchJobError:
+            # Not submitted by this user (or by no user, e.g. billing jobs)
+            raise not_found
+
+        if outcome == "cancelling":
+            return {"message": "Cancellation requested; the job will stop after its current step"}
+        elif outcome:
+            if db_job is not None:
+                await job_repo.mark_cancelled(db_job)
             return {"message": "Job cancelled successfully"}
         else:
             raise HTTPException(
@@ -195,7 +961,7 @@ async def cancel_job(
                 detail={
                     "error": {
                         "code": "cannot_cancel",
-                        "message": "Job cannot be cancelled (may already be running or complete)",
+                        "message": "Job cannot be cancelled (may already be complete)",
                         "retryable": False,
                     }
                 },
@@ -0,0 +1,149 @@
+"""Transcript upload endpoints."""
+
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from pydantic import BaseModel
+
+from app.config.settings import get_settings
+from app.models.user import User
+from app.routes.analyze import validate_transcript_size
+from app.utils.dependencies import get_optional_user
+from app.utils.logger import setup_logger
+from app.utils.transcript_parser import (
+    TranscriptParseError,
+    TranscriptTooLongError,
+    UnsupportedFormatError,
+    detect_format,
+    parser_for,
+)
+from app.utils.transcript_store import save_transcript
+
+logger = setup_logger(__name__)
+
+router = APIRouter()
+
+
+class TranscriptUploadResponse(BaseModel):
+    """Uploaded transcript, ready to analyze."""
+    transcript_id: str
+    filename: Optional[str] = None
+    format: str
+    characters: int
+    expires_in_seconds: int
+
+
+def _upload_error(status_code: int, code: str, message: str, **extra) -> HTTPException:
+    """Build an upload error in the API's error format."""
+    return HTTPException(
+        status_code=status_code,
+        detail={
+            "error": {
+                "code": code,
+                "message": message,
+                "retryable": False,
+                **extra,
+            }
+        },
+    )
+
+
+@router.post("/transcripts", response_model=TranscriptUploadResponse, status_code=status.HTTP_201_CREATED)
+async def upload_transcript(
+    request: Request,
+    filename: Optional[str] = Query(default=None, max_length=255),
+    file_format: Optional[str] = Query(default=None, alias="format"),
+    current_user: Optional[User] = Depends(get_optional_user),
+) -> TranscriptUploadResponse:
+    """Upload a transcript file and get an ID to analyze it with.
+
+    The request body is the file itself (not multipart form data), e.g.
+    ``fetch(url, {method: "POST", body: file})``. It is parsed as it
+    streams in and the size limit is enforced while reading, so oversized
+    uploads are cut off early. Bodies may be gzip-compressed
+    (``Content-Encoding: gzip``).
+
+    The format comes from ``format``, else the ``filename`` extension, else
+    the Content-Type. Pass the returned ``transcript_id`` to /analyze or
+    /jobs/analyze instead of ``transcript``.
+
+    Args:
+        request: Incoming request (body is read as a stream)
+        filename: Original file name
+        file_format: File format (one of ALLOWED_EXTENSIONS)
+        current_user: Authenticated user, if any (only they can use the upload)
+
+    Returns:
+        Transcript ID and details of the parsed transcript
+
+    Raises:
+        400: File can't be parsed or contains no text
+        413: File or transcript too large
+        415: Unsupported file format
+    """
+    settings = get_settings()
+    max_bytes = settings.max_upload_size_bytes
+
+    detected = (file_format or detect_format(filename, request.headers.get("content-type")) or "").lower()
+    if detected not in settings.get_allowed_extensions_list():
+        raise _upload_error(
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            "unsupported_format",
+            f"Unsupported file format '{detected or 'unknown'}'; pass a filename or format",
+            allowed_formats=settings.get_allowed_extensions_list(),
+        )
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise _upload_error(
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            "file_too_large",
+            f"File exceeds the {settings.MAX_UPLOAD_SIZE_MB}MB upload limit",
+            max_bytes=max_bytes,
+        )
+
+    try:
+        parser = parser_for(detected, max_length=settings.MAX_TRANSCRIPT_LENGTH)
+
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise _upload_error(
+                    status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    "file_too_large",
+                    f"File exceeds the {settings.MAX_UPLOAD_SIZE_MB}MB upload limit",
+                    max_bytes=max_bytes,
+                )
+            parser.feed(chunk)
+
+        # Extracting text from PDF and DOCX files is CPU-bound
+        text = await asyncio.to_thread(parser.finish)
+
+    except UnsupportedFormatError as e:
+        raise _upload_error(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, "unsupported_format", str(e))
+    except TranscriptTooLongError as e:
+        raise _upload_error(
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            "transcript_too_large",
+            str(e),
+            max_length=e.max_length,
+        )
+    except TranscriptParseError as e:
+        raise _upload_error(status.HTTP_400_BAD_REQUEST, "invalid_file", str(e))
+
+    if len(text) < 10:
+        raise _upload_error(status.HTTP_400_BAD_REQUEST, "empty_transcript", "No transcript text found in the file")
+    validate_transcript_size(text)
+
+    stored = await save_transcript(text, detected, filename, current_user)
+    logger.info(f"Stored {detected} upload {stored.id} ({received:,} bytes -> {len(text):,} characters)")
+
+    return TranscriptUploadResponse(
+        transcript_id=stored.id,
+        filename=filename,
+        format=detected,
+        characters=len(text),
+        expires_in_seconds=settings.TRANSCRIPT_UPLOAD_TTL_SECONDS,
+    )
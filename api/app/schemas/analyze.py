@@ -1,17 +1,23 @@
 """Analysis endpoint schemas."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from pydantic import BaseModel, Field
 
+from app.schemas.transcript_source import TranscriptSource
 
-class AnalyzeRequest(BaseModel):
+
+class AnalyzeRequest(TranscriptSource):
     """Request to analyze a transcript."""
 
-    transcript: str = Field(
-        ...,
+    transcript: Optional[str] = Field(
+        default=None,
         description="The transcript text to analyze",
         min_length=10,
     )
+    transcript_id: Optional[str] = Field(
+        default=None,
+        description="ID of a transcript uploaded to /transcripts, instead of the text",
+    )
     profile_key: str = Field(
         ...,
         description="The profile key to use for analysis (e.g., 'meetings', 'presentations')",
@@ -35,6 +41,14 @@ class AnalysisMetadata(BaseModel):
     output_tokens: int = Field(..., description="Total output tokens")
     total_tokens: int = Field(..., description="Total tokens (input + output)")
     total_cost: float = Field(..., description="Total cost in USD")
+    normalization: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Transcript size before and after normalization (if the profile normalizes)",
+    )
+    speaker_aliases: Optional[Dict[str, str]] = Field(
+        default=None,
+        description="Aliases the speakers were sent to the LLM as (restored in the results)",
+    )
 
 
 class AnalyzeResponse(BaseModel):
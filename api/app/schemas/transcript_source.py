@@ -0,0 +1,18 @@
+"""Transcript source shared by analysis and job requests."""
+
+from typing import Optional
+from pydantic import BaseModel, model_validator
+
+
+class TranscriptSource(BaseModel):
+    """Base for requests taking transcript text or an uploaded transcript ID."""
+
+    transcript: Optional[str] = None
+    transcript_id: Optional[str] = None  # Uploaded transcript (POST /transcripts), instead of the text
+
+    @model_validator(mode="after")
+    def check_transcript_source(self) -> "TranscriptSource":
+        """Require exactly one of transcript and transcript_id."""
+        if (self.transcript is None) == (self.transcript_id is None):
+            raise ValueError("Provide either transcript or transcript_id")
+        return self
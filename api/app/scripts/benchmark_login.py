@@ -0,0 +1,70 @@
+"""Benchmark login password checks, inline vs. in the hashing thread pool.
+
+Runs a burst of concurrent password checks the way the login route does
+and reports throughput and how long the event loop was stalled (the delay
+every other in-flight request on the process would see).
+
+Usage:
+    BCRYPT_ROUNDS=12 python -m app.scripts.benchmark_login --logins 40
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.config.settings import get_settings
+from app.utils.auth import check_password, pwd_context
+
+PASSWORD = "benchmark-password"
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Return the longest delay between ticks of the event loop until stopped."""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def run(label: str, login, logins: int, hashed: str) -> None:
+    """Check the password ``logins`` times concurrently and print the results."""
+    stop = asyncio.Event()
+    lag = asyncio.create_task(measure_loop_lag(stop))
+    await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login(PASSWORD, hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    worst_lag = await lag
+    print(
+        f"  {label:<8} {logins / elapsed:7.1f} logins/s   "
+        f"{elapsed:6.2f}s total   worst event loop stall {worst_lag * 1000:7.1f}ms"
+    )
+
+
+async def main() -> None:
+    """Benchmark both ways of checking passwords."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40, help="Concurrent logins")
+    args = parser.parse_args()
+
+    hashed = pwd_context.hash(PASSWORD)
+    print(
+        f"{args.logins} logins, BCRYPT_ROUNDS={settings.BCRYPT_ROUNDS}, "
+        f"PASSWORD_HASH_THREADS={settings.PASSWORD_HASH_THREADS}"
+    )
+
+    async def inline(password: str, hashed: str) -> bool:
+        return pwd_context.verify(password, hashed)
+
+    await run("inline", inline, args.logins, hashed)
+    await run("pooled", check_password, args.logins, hashed)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,6 +10,7 @@ from app.config.database import AsyncSessionLocal
 from app.models.user import User, UserRole
 from app.models.profile import Profile, ProfileStatus, LLMProvider
 from app.utils.auth import get_password_hash
+from app.utils import profile_cache  # noqa: F401 - invalidates cached profiles on commit
 
 
 async def seed_users(session: AsyncSession) -> dict:
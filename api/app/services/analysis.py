@@ -1,16 +1,68 @@
 """Transcript analysis service."""
 
+import dataclasses
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional, Tuple, Union
 
 # Add shared path for shared analysis engine
 # Docker structure: /app/api/app/services/analysis.py -> /app/shared/
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared"))
 
+from app.config.settings import get_settings
 from app.models.profile import Profile
 from app.services.llm import LLMProviderFactory
+from app.utils.logger import setup_logger
+from app.utils.profile_cache import CachedProfile
 from analysis_engine import TranscriptAnalyzer
+from speaker_aliases import SpeakerAliases
+from transcript_normalizer import NormalizationOptions
+
+logger = setup_logger(__name__)
+
+
+def normalization_options(profile: Union[Profile, CachedProfile]) -> NormalizationOptions:
+    """Get a profile's transcript normalization and speaker aliasing options.
+
+    Turning normalization off doesn't turn aliasing off; each follows its
+    own setting.
+
+    Args:
+        profile: Analysis profile
+
+    Returns:
+        Options
+    """
+    settings = get_settings()
+    config = profile.normalization or {}
+    options = NormalizationOptions.from_config(config)
+    return dataclasses.replace(
+        options,
+        enabled=config.get("enabled", settings.TRANSCRIPT_NORMALIZATION_ENABLED),
+        alias_speakers=options.alias_speakers and settings.SPEAKER_ALIASING_ENABLED,
+    )
+
+
+def alias_speakers(
+    transcript: str,
+    participants: Optional[Iterable[str]] = None,
+) -> Tuple[str, SpeakerAliases]:
+    """Replace a transcript's speaker labels with short aliases.
+
+    Args:
+        transcript: Transcript text
+        participants: Known participant names (from TranscriptMetadata)
+
+    Returns:
+        Tuple of (transcript with a legend and aliased labels, aliases to
+        restore the outputs with); the transcript is unchanged if aliasing
+        is disabled or wouldn't save anything
+    """
+    if not get_settings().SPEAKER_ALIASING_ENABLED:
+        return transcript, SpeakerAliases()
+
+    aliases = SpeakerAliases.build(transcript, participants)
+    return aliases.apply(transcript), aliases
 
 
 class AnalysisService:
@@ -19,10 +71,14 @@ class AnalysisService:
     async def analyze_transcript(
         self,
         transcript: str,
-        profile: Profile,
+        profile: Union[Profile, CachedProfile],
     ) -> Dict[str, Any]:
         """Analyze a transcript using the specified profile.
 
+        The transcript is normalized first unless the profile turns
+        normalization off, and speaker labels are sent as short aliases
+        (S1, S2, ...) whose real names are restored in the results.
+
         Args:
             transcript: Raw transcript text
             profile: Analysis profile with prompts and configuration
@@ -44,10 +100,25 @@ class AnalysisService:
                     "model": "gemini-1.5-pro-latest",
                     "input_tokens": 1234,
                     "output_tokens": 567,
-                    "total_cost": 0.0123
+                    "total_cost": 0.0123,
+                    "normalization": {
+                        "original_chars": 48210,
+                        "normalized_chars": 39877,
+                        "char_reduction": 0.1728,
+                        ...
+                    },
+                    "speaker_aliases": {"S1": "Sarah Johnson", "S2": "Mike Chen"}
                 }
             }
         """
+        extra_metadata = {
+            "profile_key": profile.key,
+            "profile_version": profile.version,
+        }
+
+        prepared = TranscriptAnalyzer.prepare_transcript(transcript, normalization_options(profile))
+        extra_metadata.update(prepared.metadata())
+
         # Create LLM provider
         provider = LLMProviderFactory.create(
             provider=profile.provider.value,
@@ -61,17 +132,14 @@ class AnalysisService:
         # Use shared analysis engine
         result = await TranscriptAnalyzer.analyze(
             llm_provider=provider,
-            transcript=transcript,
+            transcript=prepared.transcript,
             system_prompt=system_prompt,
             tasks=tasks,
             temperature=0.7,
-            extra_metadata={
-                "profile_key": profile.key,
-                "profile_version": profile.version,
-            }
+            extra_metadata=extra_metadata,
         )
 
         return {
-            "results": result.results,
+            "results": {name: prepared.aliases.restore(content) for name, content in result.results.items()},
             "metadata": result.metadata,
         }
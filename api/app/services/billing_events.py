@@ -0,0 +1,133 @@
+"""Stripe webhook event storage and processing.
+
+The webhook stores each verified event and returns; the worker applies it
+later (see worker/tasks/billing.py). Events are keyed by Stripe's event ID,
+so a redelivered event is stored once, and a row lock plus processed_at
+make sure it's applied once even if two jobs for it run at the same time.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.stripe_event import StripeEvent
+from app.models.user import User, SubscriptionTier, SubscriptionSource
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Event types that change a user's subscription (others are acknowledged and ignored)
+HANDLED_EVENT_TYPES = (
+    "checkout.session.completed",
+    "customer.subscription.deleted",
+    "customer.subscription.updated",
+)
+
+
+async def record_event(db: AsyncSession, event: Dict[str, Any]) -> bool:
+    """Store a verified webhook event, unless it's already stored.
+
+    Args:
+        db: Database session
+        event: Verified Stripe event
+
+    Returns:
+        True if the event still needs processing (new, or stored earlier
+        but not processed yet)
+    """
+    await db.execute(
+        insert(StripeEvent)
+        .values(id=event["id"], type=event["type"], payload=dict(event["data"]["object"]))
+        .on_conflict_do_nothing(index_elements=[StripeEvent.id])
+    )
+    processed_at = await db.scalar(select(StripeEvent.processed_at).where(StripeEvent.id == event["id"]))
+    await db.commit()
+    return processed_at is None
+
+
+async def process_event(db: AsyncSession, event_id: str) -> Optional[str]:
+    """Apply a stored event to the user it's for, at most once.
+
+    Args:
+        db: Database session
+        event_id: Stripe event ID
+
+    Returns:
+        ID of the user the event was applied to, or None if it was already
+        processed (or is being processed by another job) or is for no
+        known user
+
+    Raises:
+        Exception: Applying the event failed (recorded on the event, which
+            stays unprocessed so a retry can apply it)
+    """
+    result = await db.execute(
+        select(StripeEvent)
+        .where(StripeEvent.id == event_id, StripeEvent.processed_at.is_(None))
+        .with_for_update(skip_locked=True)
+    )
+    event = result.scalar_one_or_none()
+    if event is None:
+        await db.rollback()
+        return None
+
+    event.attempts += 1
+    try:
+        user = await _apply(db, event.type, event.payload)
+    except Exception as e:
+        await db.rollback()
+        event = await db.get(StripeEvent, event_id)
+        if event is not None:
+            event.attempts += 1
+            event.last_error = str(e)[:1000]
+            await db.commit()
+        raise
+
+    event.processed_at = datetime.now(timezone.utc)
+    event.last_error = None
+    await db.commit()
+
+    logger.info(f"Processed Stripe event {event_id} ({event.type})")
+    return str(user.id) if user is not None else None
+
+
+async def _apply(db: AsyncSession, event_type: str, obj: Dict[str, Any]) -> Optional[User]:
+    """Update the subscription of the user an event's object belongs to."""
+    user = await _user_for(db, obj)
+    if user is None:
+        return None
+
+    if event_type == "checkout.session.completed":
+        user.subscription_tier = SubscriptionTier.PRO
+        user.subscription_source = SubscriptionSource.STRIPE  # Mark as Stripe payment
+        user.stripe_customer_id = obj.get("customer")
+        user.stripe_subscription_id = obj.get("subscription")
+
+    elif event_type == "customer.subscription.deleted":
+        # Downgrade user to free tier
+        user.subscription_tier = SubscriptionTier.FREE
+        user.subscription_source = SubscriptionSource.NONE
+
+    elif event_type == "customer.subscription.updated":
+        if obj.get("status") == "active":
+            user.subscription_tier = SubscriptionTier.PRO
+            user.subscription_source = SubscriptionSource.STRIPE
+        elif obj.get("status") in ["canceled", "unpaid", "past_due"]:
+            user.subscription_tier = SubscriptionTier.FREE
+            user.subscription_source = SubscriptionSource.NONE
+
+    return user
+
+
+async def _user_for(db: AsyncSession, obj: Dict[str, Any]) -> Optional[User]:
+    """Find the user from the user_id set in the checkout/subscription metadata."""
+    user_id = (obj.get("metadata") or {}).get("user_id")
+    if not user_id:
+        return None
+
+    result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
+    return result.scalar_one_or_none()
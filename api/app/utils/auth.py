@@ -1,7 +1,9 @@
 """Authentication utilities."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
@@ -9,14 +11,29 @@ from app.config.settings import get_settings
 
 settings = get_settings()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing (hashes with fewer rounds than BCRYPT_ROUNDS need an update)
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so hashes run in parallel here while the event
+# loop keeps serving other requests; the pool size caps the CPU they take
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_THREADS,
+    thread_name_prefix="password-hash",
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against a hash.
 
+    Blocks for the whole bcrypt computation; async code should use
+    check_password instead.
+
     Args:
         plain_password: Plain text password
         hashed_password: Hashed password
@@ -31,6 +48,9 @@ def get_password_hash(password: str) -> str:
     """
     Hash a password.
 
+    Blocks for the whole bcrypt computation; async code should use
+    hash_password instead.
+
     Args:
         password: Plain text password
 
@@ -40,6 +60,38 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def check_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password in the hashing thread pool.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password
+
+    Returns:
+        Tuple of (True if password matches, new hash to store if the old
+        one was made with fewer rounds than BCRYPT_ROUNDS, else None)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _hash_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
+async def hash_password(password: str) -> str:
+    """
+    Hash a password in the hashing thread pool.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Hashed password
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context.hash, password)
+
+
 def create_access_token(
     data: dict,
     expires_delta: Optional[timedelta] = None,
@@ -0,0 +1,161 @@
+"""Short-lived caches for request authentication.
+
+Every authenticated request verifies its JWT and loads the user. Both are
+cached in-process for a short time:
+
+- Verified token payloads, keyed by a SHA-256 hash of the token, until
+  ``AUTH_TOKEN_CACHE_TTL_SECONDS`` or the token's own expiry, whichever
+  comes first.
+- The user's column values, keyed by user ID, for
+  ``AUTH_USER_CACHE_TTL_SECONDS``. A cached user is attached to the
+  request's session with ``merge(load=False)``, so routes still get a
+  regular ``User`` without a database round trip.
+
+Committing any change to a user (admin endpoints, billing, Stripe
+webhooks, password resets) drops that user's entry on every API replica.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config.settings import get_settings
+from app.models.user import User
+from app.utils.auth import decode_token
+from app.utils.cache_invalidation import invalidate_on_commit, on_invalidation
+
+USER_INVALIDATION_CHANNEL = "scriptripper:users:invalidate"
+
+
+class TTLCache:
+    """Bounded LRU cache with a per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: Least recently used entries are evicted above this
+        """
+        self.max_entries = max_entries
+        self.generation = 0  # Bumped on every invalidation
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a live entry, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float, generation: Optional[int] = None) -> None:
+        """Store an entry.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Seconds to keep the entry
+            generation: Generation the value was read in; the value is
+                dropped if an invalidation happened since
+        """
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        if generation is not None and generation != self.generation:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or every entry if ``key`` is None."""
+        self.generation += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+_settings = get_settings()
+token_cache = TTLCache(_settings.AUTH_CACHE_MAX_ENTRIES)
+user_cache = TTLCache(_settings.AUTH_CACHE_MAX_ENTRIES)
+
+
+def decode_token_cached(token: str) -> Optional[dict]:
+    """Verify and decode a JWT, reusing recent verifications.
+
+    Args:
+        token: JWT token
+
+    Returns:
+        Decoded payload, or None if the token is invalid or expired
+    """
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = decode_token(token)
+    if payload is None:
+        return None
+
+    # Never serve a payload past the token's own expiry
+    ttl = get_settings().AUTH_TOKEN_CACHE_TTL_SECONDS
+    if payload.get("exp") is not None:
+        ttl = min(ttl, payload["exp"] - time.time())
+    token_cache.set(key, payload, ttl)
+    return payload
+
+
+async def load_user(db: AsyncSession, user_id: str) -> Optional[User]:
+    """Load a user for authentication, from the cache when possible.
+
+    Args:
+        db: Database session the user is attached to
+        user_id: User ID from the token
+
+    Returns:
+        User, or None if no user has this ID
+    """
+    values = user_cache.get(str(user_id))
+    if values is not None:
+        user = User(**values)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    generation = user_cache.generation
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+
+    if user is not None:
+        user_cache.set(
+            str(user_id),
+            _column_values(user),
+            get_settings().AUTH_USER_CACHE_TTL_SECONDS,
+            generation=generation,
+        )
+    return user
+
+
+def _column_values(user: User) -> Dict[str, Any]:
+    """Snapshot a user's column attributes."""
+    return {attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs}
+
+
+def _on_user_invalidation(payload: Optional[Dict[str, Any]]) -> None:
+    """Apply a user invalidation from any replica."""
+    user_cache.invalidate((payload or {}).get("user_id"))
+
+
+on_invalidation(USER_INVALIDATION_CHANNEL, _on_user_invalidation)
+invalidate_on_commit(User, USER_INVALIDATION_CHANNEL, lambda user: {"user_id": str(user.id)})
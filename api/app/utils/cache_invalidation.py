@@ -0,0 +1,232 @@
+"""Cross-replica invalidation of in-process caches over Redis pub/sub.
+
+Caches register a handler per channel. Publishing applies the handler in
+this process straight away and broadcasts the payload, so every other API
+replica applies it too. One listener task per process subscribes to all
+registered channels. Caches of ORM rows can also publish automatically
+whenever a change to their model is committed.
+
+Broadcasts only run as background tasks on the event loop the listener was
+started on (the API's). Anywhere else, such as an RQ task inside its own
+``asyncio.run()``, they publish synchronously: a task there would run on the
+wrong loop's connections and be cancelled when that loop exits.
+
+Pub/sub delivery is best effort: handlers are called with ``None`` whenever
+the listener (re)subscribes, since messages may have been missed, and the
+caches keep a TTL as a backstop.
+"""
+
+import asyncio
+import json
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config.redis import get_redis, get_sync_redis
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Seconds to wait before resubscribing after losing the Redis connection
+RESUBSCRIBE_DELAY_SECONDS = 5
+
+# Handlers take the published payload, or None to drop everything
+InvalidationHandler = Callable[[Optional[Dict[str, Any]]], None]
+
+_handlers: Dict[str, InvalidationHandler] = {}
+
+# Models whose committed changes publish an invalidation: {model: (channel, payload builder)}
+_watched_models: Dict[type, Tuple[str, Callable[[Any], Dict[str, Any]]]] = {}
+
+# Broadcasts in flight (keeps the tasks referenced until they finish)
+_broadcasts: Set[asyncio.Task] = set()
+
+# Loop the listener runs on; the only one broadcasts are scheduled on
+_listener_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def on_invalidation(channel: str, handler: InvalidationHandler) -> None:
+    """Register the handler for a channel.
+
+    Args:
+        channel: Redis channel
+        handler: Called with each payload published on the channel
+    """
+    _handlers[channel] = handler
+
+
+def invalidate_on_commit(
+    model: type,
+    channel: str,
+    payload_for: Callable[[Any], Dict[str, Any]],
+) -> None:
+    """Publish an invalidation whenever a change to a model is committed.
+
+    Args:
+        model: ORM model class
+        channel: Redis channel
+        payload_for: Builds the payload from a changed row
+    """
+    _watched_models[model] = (channel, payload_for)
+
+
+def publish_invalidation(channel: str, payload: Optional[Dict[str, Any]] = None) -> None:
+    """Apply an invalidation here and broadcast it to the other replicas.
+
+    On the API's event loop the broadcast runs as a background task, so
+    callers (including ORM commit hooks) never block on Redis. Elsewhere it
+    is published synchronously before returning.
+
+    Args:
+        channel: Redis channel
+        payload: JSON-serializable payload for the handlers
+    """
+    _apply(channel, payload or {})
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if loop is None or loop is not _listener_loop:
+        try:
+            get_sync_redis().publish(channel, json.dumps(payload or {}))
+        except Exception as e:
+            logger.warning(f"Failed to publish invalidation on {channel}: {e}")
+        return
+
+    task = loop.create_task(_broadcast(channel, payload or {}))
+    _broadcasts.add(task)
+    task.add_done_callback(_broadcasts.discard)
+
+
+async def apublish_invalidation(channel: str, payload: Optional[Dict[str, Any]] = None) -> None:
+    """Async version of publish_invalidation, for request handlers.
+
+    Args:
+        channel: Redis channel
+        payload: JSON-serializable payload for the handlers
+    """
+    _apply(channel, payload or {})
+    await _broadcast(channel, payload or {})
+
+
+async def _broadcast(channel: str, payload: Dict[str, Any]) -> None:
+    """Publish a payload to the other replicas."""
+    try:
+        await get_redis().publish(channel, json.dumps(payload))
+    except Exception as e:
+        # Other replicas catch up when their entries expire
+        logger.warning(f"Failed to publish invalidation on {channel}: {e}")
+
+
+def _apply(channel: str, payload: Optional[Dict[str, Any]]) -> None:
+    """Run a channel's handler, logging instead of raising."""
+    handler = _handlers.get(channel)
+    if handler is None:
+        return
+    try:
+        handler(payload)
+    except Exception as e:
+        logger.error(f"Invalidation handler for {channel} failed: {e}", exc_info=True)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    """Remember watched rows written in this transaction."""
+    if not _watched_models:
+        return
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        watched = _watched_models.get(type(obj))
+        if watched is None:
+            continue
+        channel, payload_for = watched
+        payload = payload_for(obj)
+        pending = session.info.setdefault("cache_invalidations", {})
+        pending[(channel, json.dumps(payload, sort_keys=True, default=str))] = payload
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session: Session) -> None:
+    """Invalidate committed changes on every replica."""
+    for (channel, _), payload in session.info.pop("cache_invalidations", {}).items():
+        publish_invalidation(channel, payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    """Forget changes that were rolled back."""
+    session.info.pop("cache_invalidations", None)
+
+
+class InvalidationListener:
+    """Background task applying invalidations published by other replicas."""
+
+    def __init__(self):
+        """Initialize a stopped listener."""
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start listening on every registered channel."""
+        global _listener_loop
+        _listener_loop = asyncio.get_running_loop()
+
+        if not _handlers:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        global _listener_loop
+        _listener_loop = None
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen(self) -> None:
+        """Apply messages until cancelled, resubscribing on errors."""
+        while True:
+            pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(*_handlers)
+                # Messages may have been missed while unsubscribed
+                for channel in _handlers:
+                    _apply(channel, None)
+
+                while True:
+                    # Bounded reads: the pool's socket timeout would break an idle listen()
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is None or message.get("type") != "message":
+                        continue
+
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    try:
+                        payload = json.loads(message["data"])
+                    except (TypeError, ValueError) as e:
+                        logger.warning(f"Ignoring malformed invalidation on {channel}: {e}")
+                        continue
+                    _apply(channel, payload if isinstance(payload, dict) else {})
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener disconnected: {e}")
+                await asyncio.sleep(RESUBSCRIBE_DELAY_SECONDS)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+invalidation_listener = InvalidationListener()
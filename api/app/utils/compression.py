@@ -0,0 +1,316 @@
+"""HTTP compression for request and response bodies.
+
+Responses larger than ``COMPRESSION_MINIMUM_SIZE_BYTES`` are compressed with
+Brotli or gzip, whichever the client's ``Accept-Encoding`` prefers (Brotli
+on a tie). Streamed responses are compressed chunk by chunk, and responses
+that are already encoded, or are event streams, are left alone.
+
+Request bodies sent with ``Content-Encoding: gzip`` are decompressed
+before they reach the routes, so large transcripts can be uploaded
+compressed. Each chunk is inflated only up to the remaining
+``MAX_UPLOAD_SIZE_MB`` allowance to guard against decompression bombs.
+Brotli request bodies are refused: the decoder can't bound its output per
+call, so a few bytes could inflate without limit before the check runs.
+"""
+
+import json
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import brotli
+
+from app.config.settings import get_settings
+
+# Encodings we can produce, in order of preference on equal quality values
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+# Encodings accepted on request bodies (gzip only, see module docstring)
+REQUEST_ENCODINGS = ("gzip", "x-gzip")
+
+# Content types that must reach the client unbuffered
+UNCOMPRESSED_CONTENT_TYPES = ("text/event-stream",)
+
+
+class RequestBodyError(Exception):
+    """Compressed request body can't be accepted."""
+
+    def __init__(self, status_code: int, code: str, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick a response encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+
+    Returns:
+        "br", "gzip", or None to send the response uncompressed
+    """
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+
+        quality = 1.0
+        param, _, value = params.strip().partition("=")
+        if param.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def _compressor(encoding: str):
+    """Create a streaming compressor with ``compress``/``flush``/``finish``."""
+    settings = get_settings()
+    if encoding == "br":
+        return _BrotliCompressor(settings.COMPRESSION_BROTLI_QUALITY)
+    return _GzipCompressor(settings.COMPRESSION_GZIP_LEVEL)
+
+
+class _GzipCompressor:
+    """gzip stream (zlib with a gzip header)."""
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    """Brotli stream."""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> str:
+    """Get a header value from raw ASGI headers ("" if missing)."""
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return ""
+
+
+def _without(headers: List[Tuple[bytes, bytes]], *names: bytes) -> List[Tuple[bytes, bytes]]:
+    """Drop headers by (lowercase) name."""
+    return [(key, value) for key, value in headers if key.lower() not in names]
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses and decompressing requests."""
+
+    def __init__(self, app):
+        """Wrap an ASGI app.
+
+        Args:
+            app: ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        """Decode the request body and encode the response as negotiated."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = list(scope.get("headers") or [])
+
+        encoding = negotiate_encoding(_header(headers, b"accept-encoding"))
+        if encoding is not None:
+            send = _CompressingSender(send, encoding).send
+
+        request_encoding = _header(headers, b"content-encoding").strip().lower()
+        if request_encoding in ("", "identity"):
+            await self.app(scope, receive, send)
+            return
+        if request_encoding not in REQUEST_ENCODINGS:
+            await _send_error(send, RequestBodyError(
+                415, "unsupported_encoding", f"Unsupported Content-Encoding: {request_encoding}"
+            ))
+            return
+
+        body = _DecompressingReceiver(receive, request_encoding)
+        scope = dict(scope, headers=_without(headers, b"content-encoding", b"content-length"))
+        started = False
+
+        async def send_unless_failed(message):
+            # Routes turn body read errors into their own 400; report ours instead
+            nonlocal started
+            if body.error is not None:
+                if not started:
+                    started = True
+                    await _send_error(send, body.error)
+                return
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, body.receive, send_unless_failed)
+        except RequestBodyError as e:
+            if not started:
+                await _send_error(send, e)
+
+
+class _DecompressingReceiver:
+    """Decompresses gzip request body chunks as the app reads them."""
+
+    def __init__(self, receive, encoding: str):
+        self._receive = receive
+        self._encoding = encoding
+        # wbits=47 accepts gzip and zlib framing
+        self._decompressor = zlib.decompressobj(47)
+        self._max_bytes = get_settings().max_upload_size_bytes
+        self._received = 0
+        self.error: Optional[RequestBodyError] = None
+
+    async def receive(self):
+        """ASGI receive that decompresses ``http.request`` messages."""
+        message = await self._receive()
+        if message["type"] != "http.request":
+            return message
+
+        try:
+            # Inflate at most one byte past the limit, so a bomb stops early
+            body = self._decompressor.decompress(
+                message.get("body", b""), self._max_bytes - self._received + 1
+            )
+        except zlib.error as e:
+            self.error = RequestBodyError(
+                400, "invalid_encoding", f"Request body is not valid {self._encoding}: {e}"
+            )
+            raise self.error
+
+        self._received += len(body)
+        if self._received > self._max_bytes:
+            self.error = RequestBodyError(
+                413,
+                "payload_too_large",
+                f"Decompressed request body exceeds {get_settings().MAX_UPLOAD_SIZE_MB}MB",
+            )
+            raise self.error
+
+        return {**message, "body": body}
+
+
+class _CompressingSender:
+    """Compresses the response body on its way to the client."""
+
+    def __init__(self, send, encoding: str):
+        self._send = send
+        self._encoding = encoding
+        self._start: Optional[dict] = None
+        self._compressor = None
+        self._passthrough = False
+
+    async def send(self, message):
+        """ASGI send that compresses ``http.response.body`` messages."""
+        if message["type"] == "http.response.start":
+            # Held until the first body chunk shows whether it's worth compressing
+            self._start = message
+            headers = message.get("headers", [])
+            content_type = _header(headers, b"content-type").lower()
+            self._passthrough = bool(_header(headers, b"content-encoding")) or any(
+                content_type.startswith(excluded) for excluded in UNCOMPRESSED_CONTENT_TYPES
+            )
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._start is not None:
+            start, self._start = self._start, None
+            minimum = get_settings().COMPRESSION_MINIMUM_SIZE_BYTES
+            if self._passthrough or (not more_body and len(body) < minimum):
+                self._passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self._compressor = _compressor(self._encoding)
+            headers = _without(start.get("headers", []), b"content-length", b"vary", b"etag")
+            vary = _header(start.get("headers", []), b"vary")
+            headers.append((b"vary", f"{vary}, Accept-Encoding".lstrip(", ").encode("latin-1")))
+            headers.append((b"content-encoding", self._encoding.encode()))
+
+            # The encoded bytes differ from the identity representation's
+            etag = _header(start.get("headers", []), b"etag")
+            if etag:
+                weak = etag if etag.startswith("W/") else f"W/{etag}"
+                headers.append((b"etag", weak.encode("latin-1")))
+
+            if not more_body:
+                body = self._compressor.compress(body) + self._compressor.finish()
+                headers.append((b"content-length", str(len(body)).encode()))
+                await self._send({**start, "headers": headers})
+                await self._send({**message, "body": body})
+                return
+
+            await self._send({**start, "headers": headers})
+
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        if more_body:
+            body = self._compressor.compress(body) + self._compressor.flush()
+        else:
+            body = self._compressor.compress(body) + self._compressor.finish()
+        await self._send({**message, "body": body})
+
+
+async def _send_error(send, error: RequestBodyError) -> None:
+    """Send a request body error in the API's error format."""
+    body = json.dumps({
+        "detail": {
+            "error": {
+                "code": error.code,
+                "message": error.message,
+                "retryable": False,
+            }
+        }
+    }).encode("utf-8")
+
+    await send({
+        "type": "http.response.start",
+        "status": error.status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
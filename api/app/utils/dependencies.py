@@ -1,15 +1,17 @@
 """FastAPI dependencies for auth and other common needs."""
 
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.config.database import get_db
 from app.models.user import User
-from app.utils.auth import decode_token
+from app.utils.auth_cache import decode_token_cached, load_user
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
@@ -31,8 +33,8 @@ async def get_current_user(
     """
     token = credentials.credentials
 
-    # Decode JWT
-    payload = decode_token(token)
+    # Decode JWT (recent verifications are cached by token hash)
+    payload = decode_token_cached(token)
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,9 +56,8 @@ async def get_current_user(
             detail="Invalid token payload",
         )
 
-    # Get user from database
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # Get user (cached briefly; changes to the user invalidate it)
+    user = await load_user(db, user_id)
 
     if not user:
         raise HTTPException(
@@ -71,3 +72,57 @@ async def get_current_user(
         )
 
     return user
+
+
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncSession = Depends(get_db),
+) -> Optional[User]:
+    """Get current user from JWT token, if one was sent.
+
+    Args:
+        credentials: HTTP Bearer token (optional)
+        db: Database session
+
+    Returns:
+        Current user, or None for anonymous requests
+
+    Raises:
+        401: Invalid or expired token
+        404: User not found
+    """
+    if credentials is None:
+        return None
+
+    return await get_current_user(credentials, db)
+
+
+async def get_user_or_anonymous(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncSession = Depends(get_db),
+) -> Optional[User]:
+    """Get current user from JWT token, treating a bad token as anonymous.
+
+    For routes anonymous clients can use too: clients that send a stored
+    token on every request shouldn't lose access when it expires.
+
+    Args:
+        credentials: HTTP Bearer token (optional)
+        db: Database session
+
+    Returns:
+        Current user, or None for anonymous requests and tokens that are
+        invalid, expired or belong to a deleted user
+
+    Raises:
+        403: User account is inactive
+    """
+    if credentials is None:
+        return None
+
+    try:
+        return await get_current_user(credentials, db)
+    except HTTPException as e:
+        if e.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_404_NOT_FOUND):
+            return None
+        raise
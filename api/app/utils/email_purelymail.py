@@ -1,12 +1,10 @@
 """Email utilities using Purelymail SMTP."""
 
 import logging
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from typing import Optional
 
 from app.config.settings import get_settings
+from app.utils.mailer import build_message, mailer
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -19,7 +17,10 @@ async def send_email(
     text_content: Optional[str] = None,
 ) -> bool:
     """
-    Send an email using Purelymail SMTP.
+    Queue an email for delivery over Purelymail SMTP.
+
+    Returns without waiting for SMTP; the mailer sends the email in the
+    background and retries temporary failures.
 
     Args:
         to_email: Recipient email address
@@ -28,48 +29,12 @@ async def send_email(
         text_content: Plain text content (optional)
 
     Returns:
-        True if email was sent successfully, False otherwise
+        True if email was queued, False otherwise
     """
-    if not settings.PURELYMAIL_SMTP_USER or not settings.PURELYMAIL_SMTP_PASS:
-        logger.warning("Purelymail SMTP not configured, email not sent")
-        logger.info(f"Would send email to {to_email}: {subject}")
+    queued = mailer.enqueue(build_message(to_email, subject, html_content, text_content))
+    if not queued and not mailer.configured:
         logger.info(f"Content: {text_content or html_content[:200]}...")
-        return False
-
-    try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = f"ScriptRipper <{settings.FROM_EMAIL}>"
-        msg['To'] = to_email
-
-        # Attach text and HTML parts
-        if text_content:
-            part1 = MIMEText(text_content, 'plain')
-            msg.attach(part1)
-
-        part2 = MIMEText(html_content, 'html')
-        msg.attach(part2)
-
-        # Connect to SMTP server and send
-        with smtplib.SMTP(settings.PURELYMAIL_SMTP_HOST, settings.PURELYMAIL_SMTP_PORT) as server:
-            server.starttls()
-            server.login(settings.PURELYMAIL_SMTP_USER, settings.PURELYMAIL_SMTP_PASS)
-            server.send_message(msg)
-
-        logger.info(f"Email sent successfully to {to_email}")
-        return True
-
-    except smtplib.SMTPAuthenticationError as e:
-        logger.error(f"SMTP Authentication failed: {str(e)}")
-        logger.error("Check PURELYMAIL_SMTP_USER and PURELYMAIL_SMTP_PASS in .env")
-        return False
-    except smtplib.SMTPException as e:
-        logger.error(f"SMTP error sending email to {to_email}: {str(e)}")
-        return False
-    except Exception as e:
-        logger.error(f"Error sending email to {to_email}: {str(e)}")
-        return False
+    return queued
 
 
 async def send_password_reset_email(email: str, reset_token: str) -> bool:
@@ -81,7 +46,7 @@ async def send_password_reset_email(email: str, reset_token: str) -> bool:
         reset_token: Password reset token
 
     Returns:
-        True if email was sent successfully
+        True if email was queued
     """
     # Construct reset URL
     base_url = settings.STRIPE_CANCEL_URL.rsplit('/', 2)[0]
@@ -216,7 +181,7 @@ async def send_welcome_email(email: str, name: Optional[str] = None) -> bool:
         name: User's name (optional)
 
     Returns:
-        True if email was sent successfully
+        True if email was queued
     """
     subject = "Welcome to ScriptRipper! 🎉"
 
@@ -0,0 +1,332 @@
+"""Failure classification and the dead-letter queue for background jobs.
+
+Every failed job attempt is classified:
+
+    provider   transient provider or network error   retried with backoff
+    quota      provider quota or billing exhausted   retried with long backoff
+    bad_input  invalid request, transcript or config  not retried
+    bug        unexpected error in our code           not retried
+
+Jobs that fail permanently (a non-retryable class, or retries exhausted) are
+moved from RQ's failed registry to the dead-letter queue (DLQ). There they
+are kept for ``DLQ_TTL_SECONDS`` and can be inspected and requeued from the
+admin API.
+"""
+
+import time
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from redis import Redis
+from rq import Queue
+from rq.exceptions import NoSuchJobError
+from rq.job import Job, JobStatus
+from rq.registry import FailedJobRegistry
+from rq.results import Result
+
+from app.config.settings import get_settings
+from app.utils.logger import setup_logger
+from app.utils.serializer import CompressedJSONSerializer
+
+logger = setup_logger(__name__)
+
+DLQ_KEY = "scriptripper:dlq"
+DLQ_ENTRY_KEY = "scriptripper:dlq:{job_id}"
+
+# Provider SDK and network exceptions that are worth retrying, by class name
+# so the SDKs stay optional imports
+_TRANSIENT_ERROR_NAMES = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "ConnectTimeout",
+    "DeadlineExceeded",
+    "InternalServerError",
+    "JobTimeoutException",
+    "RateLimitError",
+    "ReadTimeout",
+    "RemoteProtocolError",
+    "ResourceExhausted",
+    "ServiceUnavailable",
+    "TooManyRequests",
+}
+
+# Error message fragments that mean the provider account is out of quota
+_QUOTA_MARKERS = ("insufficient_quota", "quota", "billing", "credit balance")
+
+
+class FailureClass(str, Enum):
+    """Why a job attempt failed."""
+
+    PROVIDER = "provider"
+    QUOTA = "quota"
+    BAD_INPUT = "bad_input"
+    BUG = "bug"
+
+    @property
+    def retryable(self) -> bool:
+        """Whether another attempt could succeed."""
+        return self in (FailureClass.PROVIDER, FailureClass.QUOTA)
+
+
+def classify_failure(exc: BaseException) -> FailureClass:
+    """Classify an exception raised by a job.
+
+    Args:
+        exc: Exception raised by the job
+
+    Returns:
+        Failure class
+    """
+    names = {cls.__name__ for cls in type(exc).__mro__}
+    status = _status_code(exc)
+    message = str(exc).lower()
+
+    if status is not None or names & _TRANSIENT_ERROR_NAMES:
+        if status == 402 or any(marker in message for marker in _QUOTA_MARKERS):
+            return FailureClass.QUOTA
+
+    if status is not None:
+        if status in (408, 409, 429) or status >= 500:
+            return FailureClass.PROVIDER
+        if status in (401, 403):
+            # Bad or revoked credentials: an operator has to fix them
+            return FailureClass.BUG
+        return FailureClass.BAD_INPUT
+
+    if names & _TRANSIENT_ERROR_NAMES or isinstance(exc, (TimeoutError, ConnectionError)):
+        return FailureClass.PROVIDER
+
+    if isinstance(exc, ValueError):
+        return FailureClass.BAD_INPUT
+
+    return FailureClass.BUG
+
+
+def move_to_dead_letter_queue(job: Job, exc_type, exc_value, traceback) -> bool:
+    """RQ exception handler: move permanently failed jobs to the DLQ.
+
+    Runs after RQ has handled the failure, so jobs that were rescheduled for
+    a retry are left alone.
+
+    Returns:
+        True, so RQ's other exception handlers still run
+    """
+    try:
+        if job.get_status() != JobStatus.FAILED:
+            return True
+
+        failure_class = job.meta.get("failure_class") or classify_failure(exc_value).value
+        DeadLetterQueue(job.connection, serializer=job.serializer).add(
+            job,
+            failure_class=failure_class,
+            error=f"{exc_type.__name__}: {exc_value}",
+        )
+        logger.warning(f"Job {job.id} moved to the dead-letter queue ({failure_class})")
+    except Exception as e:
+        logger.error(f"Failed to dead-letter job {job.id}: {e}", exc_info=True)
+
+    return True
+
+
+class DeadLetterQueue:
+    """Permanently failed jobs, kept for inspection and requeueing."""
+
+    def __init__(self, redis_conn: Redis, serializer=CompressedJSONSerializer):
+        """Initialize the DLQ.
+
+        Args:
+            redis_conn: Redis connection shared with the RQ queues
+            serializer: RQ serializer the jobs were written with
+        """
+        self.redis_conn = redis_conn
+        self.serializer = serializer
+        self.ttl = get_settings().DLQ_TTL_SECONDS
+
+    def add(self, job: Job, failure_class: str, error: str) -> None:
+        """Move a failed job from RQ's failed registry to the DLQ.
+
+        The job hash and its result stream are kept as long as the DLQ
+        entry, so the job can still be requeued.
+
+        Args:
+            job: Failed job
+            failure_class: FailureClass value
+            error: One-line error description
+        """
+        entry_key = DLQ_ENTRY_KEY.format(job_id=job.id)
+
+        with self.redis_conn.pipeline() as pipe:
+            pipe.hset(entry_key, mapping={
+                "failure_class": failure_class,
+                "error": error[:1000],
+                "origin": job.origin,
+                "attempts": job.meta.get("attempts", 1),
+                "failed_at": datetime.now(timezone.utc).isoformat(),
+            })
+            pipe.expire(entry_key, self.ttl)
+            pipe.zadd(DLQ_KEY, {job.id: time.time()})
+            pipe.zrem(FailedJobRegistry.key_template.format(job.origin), job.id)
+            pipe.expire(job.key, self.ttl)
+            pipe.expire(Result.get_key(job.id), self.ttl)
+            pipe.execute()
+
+    def list(
+        self,
+        failure_class: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """List DLQ entries, newest first.
+
+        Args:
+            failure_class: Only list entries of this class
+            offset: Entries to skip
+            limit: Maximum entries to return
+
+        Returns:
+            (total matching entries, page of entries)
+        """
+        self.redis_conn.zremrangebyscore(DLQ_KEY, "-inf", time.time() - self.ttl)
+        job_ids = [_decode(job_id) for job_id in self.redis_conn.zrevrange(DLQ_KEY, 0, -1)]
+
+        with self.redis_conn.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hgetall(DLQ_ENTRY_KEY.format(job_id=job_id))
+            entries = pipe.execute()
+
+        matching = []
+        for job_id, entry in zip(job_ids, entries):
+            if not entry:
+                continue
+            item = _entry(job_id, entry)
+            if failure_class is None or item["failure_class"] == failure_class:
+                matching.append(item)
+
+        return len(matching), matching[offset:offset + limit]
+
+    def job_ids(self, failure_class: Optional[str] = None) -> List[str]:
+        """IDs of every DLQ entry, optionally of one class."""
+        _, items = self.list(failure_class=failure_class, limit=self.redis_conn.zcard(DLQ_KEY))
+        return [item["job_id"] for item in items]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a DLQ entry with the job's arguments and traceback.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Entry details, or None if the job isn't in the DLQ
+        """
+        entry = self.redis_conn.hgetall(DLQ_ENTRY_KEY.format(job_id=job_id))
+        if not entry:
+            return None
+
+        item = _entry(job_id, entry)
+        try:
+            job = Job.fetch(job_id, connection=self.redis_conn, serializer=self.serializer)
+        except NoSuchJobError:
+            return item
+
+        # Transcripts can be huge; report their size instead
+        kwargs = {
+            key: (f"<{len(value):,} characters>" if key == "transcript" and isinstance(value, str) else value)
+            for key, value in job.kwargs.items()
+        }
+        latest = job.latest_result()
+
+        item.update({
+            "func_name": job.func_name,
+            "kwargs": kwargs,
+            "meta": job.meta,
+            "enqueued_at": job.enqueued_at.isoformat() if job.enqueued_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "ended_at": job.ended_at.isoformat() if job.ended_at else None,
+            "traceback": latest.exc_string if latest else job.exc_info,
+        })
+        return item
+
+    def requeue(self, job_ids: List[str]) -> Tuple[List[str], List[str]]:
+        """Put DLQ jobs back on their queues with a fresh retry budget.
+
+        Removing the job from the DLQ acts as the claim, so concurrent
+        requeues never enqueue a job twice.
+
+        Args:
+            job_ids: Job IDs
+
+        Returns:
+            (requeued job IDs, job IDs not found in the DLQ)
+        """
+        settings = get_settings()
+        requeued, not_found = [], []
+
+        for job_id in job_ids:
+            if not self.redis_conn.zrem(DLQ_KEY, job_id):
+                not_found.append(job_id)
+                continue
+            self.redis_conn.delete(DLQ_ENTRY_KEY.format(job_id=job_id))
+
+            try:
+                job = Job.fetch(job_id, connection=self.redis_conn, serializer=self.serializer)
+            except NoSuchJobError:
+                not_found.append(job_id)
+                continue
+
+            job.started_at = None
+            job.ended_at = None
+            job._exc_info = ""
+            if settings.JOB_MAX_RETRIES > 0:
+                job.retries_left = settings.JOB_MAX_RETRIES
+                job.retry_intervals = settings.get_job_retry_intervals_list() or [0]
+            for key in ("failure_class", "retryable", "attempts"):
+                job.meta.pop(key, None)
+
+            queue = Queue(job.origin, connection=self.redis_conn, serializer=self.serializer)
+            with self.redis_conn.pipeline() as pipe:
+                pipe.persist(job.key)
+                queue._enqueue_job(job, pipeline=pipe)
+                pipe.execute()
+
+            requeued.append(job_id)
+
+        if requeued:
+            logger.info(f"Requeued {len(requeued)} job(s) from the dead-letter queue")
+
+        return requeued, not_found
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status of a provider SDK or HTTP client error, if any."""
+    for attr in ("status_code", "code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int) and 100 <= value < 600:
+            return value
+
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    if isinstance(value, int):
+        return value
+
+    return None
+
+
+def _entry(job_id: str, entry: Dict[bytes, bytes]) -> Dict[str, Any]:
+    """Decode a DLQ entry hash."""
+    fields = {_decode(key): _decode(value) for key, value in entry.items()}
+    return {
+        "job_id": job_id,
+        "failure_class": fields.get("failure_class"),
+        "error": fields.get("error"),
+        "origin": fields.get("origin"),
+        "attempts": int(fields.get("attempts") or 1),
+        "failed_at": fields.get("failed_at"),
+    }
+
+
+def _decode(value) -> Optional[str]:
+    """Decode a Redis reply to str."""
+    if isinstance(value, bytes):
+        return value.decode()
+    return value
@@ -0,0 +1,236 @@
+"""Background email delivery over a persistent SMTP session.
+
+Handlers queue emails and return immediately. A single background task
+sends them: it keeps one authenticated SMTP connection open while there is
+mail to send (closing it after EMAIL_IDLE_TIMEOUT_SECONDS), sends queued
+emails in batches over it, and retries temporary failures with exponential
+backoff. Permanent failures (5xx replies, refused recipients) are logged
+and dropped.
+
+The queue is in-process, so emails still queued when the process is killed
+are lost; ``stop`` sends what it can on a graceful shutdown.
+"""
+
+import asyncio
+from email.message import EmailMessage
+from typing import List, Optional
+
+import aiosmtplib
+
+from app.config.settings import get_settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# How long stop() waits for queued emails to go out
+SHUTDOWN_DRAIN_SECONDS = 10.0
+
+
+def build_message(
+    to_email: str,
+    subject: str,
+    html_content: str,
+    text_content: Optional[str] = None,
+) -> EmailMessage:
+    """Build an email with a plain text and an HTML part.
+
+    Args:
+        to_email: Recipient email address
+        subject: Email subject
+        html_content: HTML content of the email
+        text_content: Plain text content (optional)
+
+    Returns:
+        Message ready to queue
+    """
+    settings = get_settings()
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = f"ScriptRipper <{settings.FROM_EMAIL}>"
+    message["To"] = to_email
+
+    if text_content:
+        message.set_content(text_content)
+        message.add_alternative(html_content, subtype="html")
+    else:
+        message.set_content(html_content, subtype="html")
+    return message
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Whether retrying a failed send can't help (5xx replies, refused recipients)."""
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(r.code >= 500 for r in error.recipients)
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        return error.code >= 500
+    return False
+
+
+class Mailer:
+    """Queue of outgoing emails and the task that sends them."""
+
+    def __init__(self):
+        """Initialize a stopped mailer."""
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+
+    @property
+    def configured(self) -> bool:
+        """Whether there's an SMTP server to deliver to."""
+        settings = get_settings()
+        has_login = bool(settings.PURELYMAIL_SMTP_USER and settings.PURELYMAIL_SMTP_PASS)
+        return has_login or not settings.PURELYMAIL_SMTP_STARTTLS
+
+    def start(self) -> None:
+        """Start the sending task (also started by the first enqueue)."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=get_settings().EMAIL_QUEUE_MAX_SIZE)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = SHUTDOWN_DRAIN_SECONDS) -> None:
+        """Send queued emails (for up to ``timeout`` seconds), then stop."""
+        if self._task is None:
+            return
+
+        if self._queue is not None and not self._task.done():
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Stopping mailer with {self._queue.qsize()} emails unsent")
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self._disconnect()
+
+    def enqueue(self, message: EmailMessage) -> bool:
+        """Queue an email for delivery.
+
+        Args:
+            message: Email to send
+
+        Returns:
+            True if the email was queued, False if SMTP isn't configured or
+            the queue is full
+        """
+        if not self.configured:
+            logger.warning("Purelymail SMTP not configured, email not sent")
+            logger.info(f"Would send email to {message['To']}: {message['Subject']}")
+            return False
+
+        self.start()
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.error(f"Email queue full, dropping email to {message['To']}: {message['Subject']}")
+            return False
+        return True
+
+    async def join(self) -> None:
+        """Wait until every queued email has been sent or given up on."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _run(self) -> None:
+        """Send queued emails in batches until cancelled."""
+        settings = get_settings()
+        while True:
+            try:
+                message = await asyncio.wait_for(self._queue.get(), settings.EMAIL_IDLE_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                await self._disconnect()
+                continue
+
+            batch = [message]
+            while len(batch) < settings.EMAIL_BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                await self._send_batch(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Unexpected error sending {len(batch)} emails: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _send_batch(self, batch: List[EmailMessage]) -> None:
+        """Send emails over the current session, retrying temporary failures."""
+        settings = get_settings()
+        pending = list(batch)
+        attempt = 0
+
+        while pending:
+            message = pending[0]
+            try:
+                smtp = await self._connection()
+                await smtp.send_message(message)
+                pending.pop(0)
+                logger.info(f"Email sent successfully to {message['To']}")
+                continue
+
+            except aiosmtplib.SMTPAuthenticationError as e:
+                logger.error(f"SMTP Authentication failed, dropping {len(pending)} emails: {e}")
+                logger.error("Check PURELYMAIL_SMTP_USER and PURELYMAIL_SMTP_PASS in .env")
+                await self._disconnect()
+                return
+            except (aiosmtplib.SMTPException, OSError) as e:
+                error = e
+
+            if _is_permanent(error):
+                logger.error(f"SMTP error sending email to {message['To']}: {error}")
+                pending.pop(0)
+                continue
+
+            # The session may be broken, so retry the rest on a new one
+            await self._disconnect()
+            if attempt >= settings.EMAIL_MAX_RETRIES:
+                logger.error(f"Giving up on {len(pending)} emails after {attempt} retries: {error}")
+                return
+            delay = settings.EMAIL_RETRY_BACKOFF_SECONDS * 2 ** attempt
+            attempt += 1
+            logger.warning(f"SMTP error ({error}), retrying {len(pending)} emails in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _connection(self) -> aiosmtplib.SMTP:
+        """Get the open SMTP session, connecting and logging in if needed."""
+        if self._smtp is not None and self._smtp.is_connected:
+            return self._smtp
+
+        settings = get_settings()
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.PURELYMAIL_SMTP_HOST,
+            port=settings.PURELYMAIL_SMTP_PORT,
+            start_tls=settings.PURELYMAIL_SMTP_STARTTLS,
+            timeout=settings.EMAIL_SMTP_TIMEOUT_SECONDS,
+        )
+        await smtp.connect()
+        if settings.PURELYMAIL_SMTP_USER and settings.PURELYMAIL_SMTP_PASS:
+            try:
+                await smtp.login(settings.PURELYMAIL_SMTP_USER, settings.PURELYMAIL_SMTP_PASS)
+            except BaseException:
+                # Not stored yet, so _disconnect() couldn't close it
+                smtp.close()
+                raise
+
+        self._smtp = smtp
+        return smtp
+
+    async def _disconnect(self) -> None:
+        """Close the SMTP session, if open."""
+        smtp, self._smtp = self._smtp, None
+        if smtp is None or not smtp.is_connected:
+            return
+        try:
+            await smtp.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            smtp.close()
+
+
+mailer = Mailer()
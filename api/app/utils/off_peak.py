@@ -0,0 +1,206 @@
+"""Deferred and off-peak scheduling of background jobs.
+
+Deferred jobs are placed in RQ's ScheduledJobRegistry and released by the
+worker's scheduler at their release time. Off-peak jobs are given release
+times inside the nightly off-peak window, spaced
+``OFF_PEAK_RELEASE_INTERVAL_SECONDS`` apart, so the window opens with a
+steady trickle of work instead of a burst. When the queues are nearly
+empty, workers also release off-peak jobs ahead of schedule, a few at a
+time.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from redis import Redis
+from rq import Queue
+from rq.job import Job
+from rq.registry import ScheduledJobRegistry
+
+from app.config.settings import get_settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+OFF_PEAK_JOBS_KEY = "scriptripper:offpeak:jobs"
+LAST_SLOT_KEY = "scriptripper:offpeak:last_slot"
+RELEASE_LOCK_KEY = "scriptripper:offpeak:release_lock"
+
+# How many upcoming windows to search for a free release slot
+MAX_WINDOWS = 7
+
+# Reserve the next release slot in a window: the later of the window's
+# earliest usable time and the previous slot plus the spacing.
+# KEYS: last slot. ARGV: earliest, window end, spacing.
+# Returns the slot as a string, or -1 if the window is full.
+_RESERVE_SLOT_SCRIPT = """
+local last = tonumber(redis.call('GET', KEYS[1]) or '0')
+local slot = math.max(tonumber(ARGV[1]), last + tonumber(ARGV[3]))
+if slot >= tonumber(ARGV[2]) then
+    return -1
+end
+redis.call('SET', KEYS[1], tostring(slot))
+return tostring(slot)
+"""
+
+
+class OffPeakFullError(Exception):
+    """No release slot is free in the upcoming off-peak windows."""
+
+
+class OffPeakScheduler:
+    """Assigns release times to deferred jobs and releases them early."""
+
+    def __init__(self, redis_conn: Redis):
+        """Initialize the scheduler.
+
+        Args:
+            redis_conn: Redis connection shared with the RQ queues
+        """
+        settings = get_settings()
+
+        self.redis_conn = redis_conn
+        self.start_hour = settings.OFF_PEAK_START_HOUR % 24
+        self.end_hour = settings.OFF_PEAK_END_HOUR % 24
+        self.release_interval = settings.OFF_PEAK_RELEASE_INTERVAL_SECONDS
+        self.early_release_depth = settings.OFF_PEAK_EARLY_RELEASE_DEPTH
+        self.early_release_batch = settings.OFF_PEAK_EARLY_RELEASE_BATCH
+        self.early_release_interval = settings.OFF_PEAK_EARLY_RELEASE_INTERVAL_SECONDS
+
+        self._reserve_slot = redis_conn.register_script(_RESERVE_SLOT_SCRIPT)
+
+    def window_for(self, moment: datetime) -> tuple[datetime, datetime]:
+        """Get the off-peak window containing ``moment``, or the next one.
+
+        Args:
+            moment: Timezone-aware time
+
+        Returns:
+            (start, end) of the window
+        """
+        length = timedelta(hours=(self.end_hour - self.start_hour) % 24 or 24)
+        midnight = moment.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+        # Yesterday's window may still be open; tomorrow's always ends later
+        for days in (-1, 0):
+            start = midnight + timedelta(days=days, hours=self.start_hour)
+            if start + length > moment:
+                return start, start + length
+
+        start = midnight + timedelta(days=1, hours=self.start_hour)
+        return start, start + length
+
+    def release_time(self, not_before: Optional[datetime] = None, off_peak: bool = False) -> Optional[datetime]:
+        """Choose when a job should be released to its queue.
+
+        Args:
+            not_before: Earliest time the job may run
+            off_peak: Only run the job in the off-peak window
+
+        Returns:
+            Release time, or None if the job should be enqueued now
+
+        Raises:
+            OffPeakFullError: If every upcoming window is fully booked
+        """
+        now = datetime.now(timezone.utc)
+        earliest = now
+        if not_before is not None:
+            if not_before.tzinfo is None:
+                not_before = not_before.replace(tzinfo=timezone.utc)
+            earliest = max(not_before, now)
+
+        if not off_peak:
+            return earliest if earliest > now else None
+
+        for _ in range(MAX_WINDOWS):
+            start, end = self.window_for(earliest)
+            slot = self._reserve_slot(
+                keys=[LAST_SLOT_KEY],
+                args=[max(start, earliest).timestamp(), end.timestamp(), self.release_interval],
+            )
+            slot = float(slot)
+            if slot >= 0:
+                release_at = datetime.fromtimestamp(slot, timezone.utc)
+                # Inside an open window with no backlog: run now
+                return release_at if release_at - now >= timedelta(seconds=1) else None
+            earliest = end
+
+        raise OffPeakFullError(f"No off-peak release slot free in the next {MAX_WINDOWS} windows")
+
+    def track(self, job_id: str, release_at: datetime, pipeline=None) -> None:
+        """Make a scheduled off-peak job eligible for early release.
+
+        Args:
+            job_id: Job ID
+            release_at: Scheduled release time
+            pipeline: Redis pipeline to add the command to (optional)
+        """
+        (pipeline or self.redis_conn).zadd(OFF_PEAK_JOBS_KEY, {job_id: release_at.timestamp()})
+
+    def release_early(self, **queue_kwargs) -> int:
+        """Release off-peak jobs ahead of schedule while the queues are idle.
+
+        At most ``OFF_PEAK_EARLY_RELEASE_BATCH`` jobs are released per pass,
+        and a Redis lock limits passes to one every
+        ``OFF_PEAK_EARLY_RELEASE_INTERVAL_SECONDS`` across all workers.
+        Removing the job from its ScheduledJobRegistry acts as the claim, so
+        a job is never released twice.
+
+        Args:
+            **queue_kwargs: Extra arguments for the RQ Queues
+
+        Returns:
+            Number of jobs released
+        """
+        if self.early_release_depth <= 0:
+            return 0
+
+        # Jobs past their release time have been released by the schedulers
+        self.redis_conn.zremrangebyscore(OFF_PEAK_JOBS_KEY, "-inf", time.time())
+        if not self.redis_conn.zcard(OFF_PEAK_JOBS_KEY):
+            return 0
+
+        if not self.redis_conn.set(RELEASE_LOCK_KEY, 1, nx=True, ex=max(self.early_release_interval, 1)):
+            return 0
+
+        depth = self.queue_depth()
+        budget = min(self.early_release_depth - depth, self.early_release_batch)
+        if budget <= 0:
+            return 0
+
+        released = 0
+        for job_id in self.redis_conn.zrange(OFF_PEAK_JOBS_KEY, 0, budget - 1):
+            job_id = job_id.decode() if isinstance(job_id, bytes) else job_id
+            self.redis_conn.zrem(OFF_PEAK_JOBS_KEY, job_id)
+
+            origin = self.redis_conn.hget(Job.key_for(job_id), "origin")
+            if origin is None:
+                continue  # Expired or deleted
+
+            queue = Queue(origin.decode(), connection=self.redis_conn, **queue_kwargs)
+            registry = ScheduledJobRegistry(queue=queue)
+            if not self.redis_conn.zrem(registry.key, job_id):
+                continue  # Already released or cancelled
+
+            job = queue.fetch_job(job_id)
+            if job:
+                queue._enqueue_job(job, at_front=bool(job.enqueue_at_front))
+                released += 1
+
+        if released:
+            logger.info(f"Released {released} off-peak job(s) early (queue depth {depth})")
+
+        return released
+
+    def queue_depth(self) -> int:
+        """Total number of jobs waiting across all queues."""
+        keys = list(self.redis_conn.smembers(Queue.redis_queues_keys))
+        if not keys:
+            return 0
+
+        with self.redis_conn.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.llen(key)
+            return sum(pipe.execute())
@@ -0,0 +1,129 @@
+"""In-process cache of published analysis profiles.
+
+Profiles almost never change, so ``POST /analyze`` reads them from a
+per-process cache keyed by profile key instead of querying Postgres (and
+decoding the JSON ``prompts`` and ``schema`` columns) on every request.
+
+Entries expire after ``PROFILE_CACHE_TTL_SECONDS``. Committing a change to a
+profile through the ORM publishes its key and version on a Redis channel;
+every API replica listens and drops its copy, so replicas stay consistent.
+The TTL bounds staleness if an invalidation is missed.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import get_settings
+from app.models.profile import LLMProvider, Profile, ProfileStatus
+from app.utils.cache_invalidation import invalidate_on_commit, on_invalidation
+
+PROFILE_INVALIDATION_CHANNEL = "scriptripper:profiles:invalidate"
+
+
+@dataclass(frozen=True)
+class CachedProfile:
+    """Read-only snapshot of a profile, safe to share between requests."""
+
+    id: Any
+    key: str
+    version: int
+    name: str
+    status: ProfileStatus
+    provider: LLMProvider
+    model: Optional[str]
+    prompts: Dict[str, Any]
+    schema: Dict[str, Any]
+    normalization: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_model(cls, profile: Profile) -> "CachedProfile":
+        """Snapshot a Profile row."""
+        return cls(
+            id=profile.id,
+            key=profile.key,
+            version=profile.version,
+            name=profile.name,
+            status=profile.status,
+            provider=profile.provider,
+            model=profile.model,
+            prompts=profile.prompts,
+            schema=profile.schema,
+            normalization=profile.normalization,
+        )
+
+
+class ProfileCache:
+    """TTL cache of published profiles."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._entries: Dict[str, Tuple[float, CachedProfile]] = {}
+
+    async def get(self, key: str, db: AsyncSession) -> Optional[CachedProfile]:
+        """Get the latest version of a profile.
+
+        Only published profiles are cached; others are read from the
+        database every time, so publishing one takes effect immediately.
+
+        Args:
+            key: Profile key
+            db: Database session, used on a cache miss
+
+        Returns:
+            Profile snapshot, or None if no profile has this key
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        result = await db.execute(
+            select(Profile)
+            .where(Profile.key == key)
+            .order_by(Profile.version.desc())
+            .limit(1)
+        )
+        profile = result.scalar_one_or_none()
+        if profile is None:
+            return None
+
+        snapshot = CachedProfile.from_model(profile)
+        ttl = get_settings().PROFILE_CACHE_TTL_SECONDS
+        if ttl > 0 and snapshot.status == ProfileStatus.PUBLISHED:
+            self._entries[key] = (time.monotonic() + ttl, snapshot)
+        return snapshot
+
+    def invalidate(self, key: Optional[str] = None, version: Optional[int] = None) -> None:
+        """Drop cached profiles.
+
+        Args:
+            key: Profile key to drop (all profiles if None)
+            version: Version that changed; a cached newer version is kept
+        """
+        if key is None:
+            self._entries.clear()
+            return
+
+        entry = self._entries.get(key)
+        if entry is not None and (version is None or entry[1].version <= version):
+            del self._entries[key]
+
+
+profile_cache = ProfileCache()
+
+
+def _on_profile_invalidation(payload: Optional[Dict[str, Any]]) -> None:
+    """Apply a profile invalidation from any replica."""
+    payload = payload or {}
+    profile_cache.invalidate(payload.get("key"), payload.get("version"))
+
+
+on_invalidation(PROFILE_INVALIDATION_CHANNEL, _on_profile_invalidation)
+invalidate_on_commit(
+    Profile,
+    PROFILE_INVALIDATION_CHANNEL,
+    lambda profile: {"key": profile.key, "version": profile.version},
+)
@@ -0,0 +1,130 @@
+"""Prebuilt, pre-serialized snapshots of the prompt catalog.
+
+``GET /prompts`` is loaded on every visit to the configure page, so the
+response body is built once per category filter, serialized, and served
+from memory with a content-hash ETag until the catalog changes. The admin
+prompt endpoints invalidate the snapshots on every API replica through
+``app.utils.cache_invalidation``; ``PROMPT_CATALOG_TTL_SECONDS`` bounds
+staleness if an invalidation is missed.
+"""
+
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import get_settings
+from app.models.prompt import Prompt
+from app.utils.cache_invalidation import apublish_invalidation, on_invalidation
+
+PROMPT_CATALOG_CHANNEL = "scriptripper:prompts:invalidate"
+
+CATEGORIES = ("meetings", "presentations")
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Serialized catalog response and its ETag."""
+
+    body: bytes
+    etag: str
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Whether an If-None-Match header matches this snapshot.
+
+        Args:
+            if_none_match: If-None-Match header value
+
+        Returns:
+            True if the client's copy is current
+        """
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+
+        # Weak comparison (RFC 9110): W/ prefixes are ignored
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return self.etag in tags
+
+
+class PromptCatalog:
+    """In-memory snapshots of the active prompts, per category filter."""
+
+    def __init__(self):
+        """Initialize an empty catalog."""
+        self._snapshots: Dict[Optional[str], Tuple[float, CatalogSnapshot]] = {}
+        self._generation = 0
+
+    async def get(self, db: AsyncSession, category: Optional[str] = None) -> CatalogSnapshot:
+        """Get the catalog snapshot, building it on a miss.
+
+        Args:
+            db: Database session, used on a miss
+            category: Optional filter by category ('meetings' or 'presentations')
+
+        Returns:
+            Snapshot of the response body
+        """
+        # Only the known filters are kept, so arbitrary query strings can't grow the cache
+        cacheable = category is None or category in CATEGORIES
+
+        entry = self._snapshots.get(category) if cacheable else None
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        generation = self._generation
+        snapshot = await self._build(db, category)
+
+        # Don't keep a snapshot that was invalidated while it was built
+        ttl = get_settings().PROMPT_CATALOG_TTL_SECONDS
+        if cacheable and ttl > 0 and generation == self._generation:
+            self._snapshots[category] = (time.monotonic() + ttl, snapshot)
+        return snapshot
+
+    def invalidate(self, payload: Optional[Dict[str, Any]] = None) -> None:
+        """Drop every snapshot (invalidation handler)."""
+        self._generation += 1
+        self._snapshots.clear()
+
+    async def _build(self, db: AsyncSession, category: Optional[str]) -> CatalogSnapshot:
+        """Query the active prompts and serialize the response body."""
+        query = select(Prompt).where(Prompt.is_active.is_(True)).order_by(Prompt.task_name)
+        if category:
+            query = query.where(Prompt.category == category)
+
+        result = await db.execute(query)
+        prompts = result.scalars().all()
+
+        # Return description for display, prompt_json for processing
+        # ('prompt' is kept as the key for backward compatibility)
+        catalog = {
+            name: [
+                {
+                    "task_name": p.task_name,
+                    "description": p.description,
+                    "prompt": p.prompt_json,
+                }
+                for p in prompts
+                if p.category == name
+            ]
+            for name in CATEGORIES
+        }
+
+        body = orjson.dumps(catalog)
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        return CatalogSnapshot(body=body, etag=etag)
+
+
+prompt_catalog = PromptCatalog()
+
+on_invalidation(PROMPT_CATALOG_CHANNEL, prompt_catalog.invalidate)
+
+
+async def invalidate_prompt_catalog() -> None:
+    """Rebuild the catalog on every API replica after a prompt change."""
+    await apublish_invalidation(PROMPT_CATALOG_CHANNEL)
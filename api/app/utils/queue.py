@@ -1,24 +1,83 @@
 """Redis queue utilities for background job processing."""
 
-import os
-from typing import Any, Dict
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 from redis import Redis
-from rq import Queue
-from rq.job import Job
+from rq import Queue, Retry
+from rq.exceptions import NoSuchJobError
+from rq.job import Job, JobStatus
+from rq.results import Result
+from rq.utils import str_to_date
+
+from app.config.redis import get_redis, get_sync_redis
+from app.config.settings import get_settings
+from app.utils.off_peak import OffPeakScheduler
+from app.utils.scheduler import FairScheduler
+from app.utils.logger import setup_logger
+from app.utils.serializer import CompressedJSONSerializer, flush_compression_stats
+
+logger = setup_logger(__name__)
+
+IDEMPOTENCY_KEY = "scriptripper:idempotency:{key}"
+CANCEL_KEY = "scriptripper:cancel:{job_id}"
+BATCH_KEY = "scriptripper:batch:{batch_id}"
+
+# Delete an idempotency claim only if it still points at our job, so a failed
+# submission never drops a claim another request has since taken over.
+# KEYS: claim key. ARGV: job id.
+_RELEASE_CLAIM_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Move an idempotency claim off a job we've decided not to replay, unless
+# another request already moved it. Returns the current holder on conflict.
+# KEYS: claim key. ARGV: expected job id, new job id, ttl.
+_SWAP_CLAIM_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current and current ~= ARGV[1] then
+    return current
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return false
+"""
 
 
 class QueueService:
     """Service for managing background jobs with Redis Queue."""
 
-    def __init__(self):
-        """Initialize Redis connection and queues."""
-        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
-        self.redis_conn = Redis.from_url(redis_url)
+    def __init__(self, redis_conn: Optional[Redis] = None):
+        """Initialize Redis clients and queues.
+
+        Both clients borrow connections from the process-wide pools, so a
+        QueueService per request is cheap. Enqueueing and idempotency claims
+        go through the sync client, so async callers run them with
+        asyncio.to_thread; status and cancel reads use the async client.
+
+        Args:
+            redis_conn: Sync Redis connection (defaults to the shared pool)
+        """
+        self.redis_conn = redis_conn or get_sync_redis()
+        self.async_redis = get_redis()
 
         # Define queue priorities
-        self.high_queue = Queue("high", connection=self.redis_conn)
-        self.default_queue = Queue("default", connection=self.redis_conn)
-        self.low_queue = Queue("low", connection=self.redis_conn)
+        self.serializer = CompressedJSONSerializer
+        self.high_queue = Queue("high", connection=self.redis_conn, serializer=self.serializer)
+        self.default_queue = Queue("default", connection=self.redis_conn, serializer=self.serializer)
+        self.low_queue = Queue("low", connection=self.redis_conn, serializer=self.serializer)
+
+        # Per-user sub-queues for weighted-fair scheduling
+        self.scheduler = FairScheduler(self.redis_conn)
+
+        # Release times for deferred and off-peak jobs
+        self.off_peak = OffPeakScheduler(self.redis_conn)
+
+        self._release_claim = self.redis_conn.register_script(_RELEASE_CLAIM_SCRIPT)
+        self._swap_claim = self.redis_conn.register_script(_SWAP_CLAIM_SCRIPT)
 
     def enqueue_analysis(
         self,
@@ -29,6 +88,12 @@ class QueueService:
         tasks: Dict[str, str],
         priority: str = "default",
         timeout: int = 600,  # 10 minutes
+        user_id: Optional[str] = None,
+        tier: Optional[str] = None,
+        job_id: Optional[str] = None,
+        release_at: Optional[datetime] = None,
+        off_peak: bool = False,
+        normalization: Optional[Dict[str, Any]] = None,
     ) -> Job:
         """Enqueue a transcript analysis job.
 
@@ -40,6 +105,16 @@ class QueueService:
             tasks: Dictionary of {task_name: task_prompt}
             priority: Queue priority ('high', 'default', 'low')
             timeout: Job timeout in seconds
+            user_id: Submitting user (enables fair scheduling)
+            tier: Submitting user's subscription tier
+            job_id: Job ID to use (defaults to a random RQ ID)
+            release_at: Hold the job in the scheduler until this time
+                (from OffPeakScheduler.release_time)
+            off_peak: The job is off-peak work and may be released early
+                while the queues are idle
+            normalization: Transcript normalization options for the worker
+                (NormalizationOptions.to_config()), or None to send the
+                transcript as-is
 
         Returns:
             RQ Job instance
@@ -47,24 +122,105 @@ class QueueService:
         # Import here to avoid circular imports
         from worker.tasks.analysis import analyze_transcript_task
 
-        # Select queue based on priority
-        queue = self._get_queue(priority)
+        # Select queue based on priority and submitting user
+        queue = self._get_queue(priority, user_id=user_id, tier=tier)
 
-        # Enqueue job
-        job = queue.enqueue(
-            analyze_transcript_task,
+        job_kwargs = dict(
             transcript=transcript,
             provider=provider,
             model=model,
             system_prompt=system_prompt,
             tasks=tasks,
+            job_id=job_id,
             job_timeout=timeout,
-            result_ttl=3600,  # Keep results for 1 hour
+            retry=self._retry_policy(),
+            result_ttl=get_settings().JOB_RESULT_TTL_SECONDS,  # Persisted to Postgres by the worker
             failure_ttl=86400,  # Keep failures for 24 hours
+            meta=_owner_meta(user_id),
         )
+        if normalization is not None:
+            job_kwargs["normalization"] = normalization
 
+        if release_at is None:
+            job = queue.enqueue(analyze_transcript_task, **job_kwargs)
+        else:
+            # Deferred: held in the ScheduledJobRegistry until release_at
+            job = queue.enqueue_at(release_at, analyze_transcript_task, **job_kwargs)
+            if off_peak:
+                self.off_peak.track(job.id, release_at)
+
+        self._flush_serializer_stats()
         return job
 
+    def enqueue_analysis_many(
+        self,
+        items: List[Dict[str, Any]],
+        priority: str = "default",
+        timeout: int = 600,  # 10 minutes
+        user_id: Optional[str] = None,
+        tier: Optional[str] = None,
+        batch_id: Optional[str] = None,
+        batch_job_ids: Optional[List[str]] = None,
+    ) -> List[Job]:
+        """Enqueue many transcript analysis jobs in one Redis transaction.
+
+        Args:
+            items: Job arguments, one dict per job with transcript, provider,
+                model, system_prompt, tasks and job_id
+            priority: Queue priority ('high', 'default', 'low')
+            timeout: Job timeout in seconds
+            user_id: Submitting user (enables fair scheduling)
+            tier: Submitting user's subscription tier
+            batch_id: Batch the jobs belong to (optional)
+            batch_job_ids: Every job ID in the batch, including ones that
+                already existed; stored under the batch ID
+
+        Returns:
+            RQ Job instances, in the order of ``items``
+        """
+        from worker.tasks.analysis import analyze_transcript_task
+
+        queue = self._get_queue(priority, user_id=user_id, tier=tier)
+        retry = self._retry_policy()
+        result_ttl = get_settings().JOB_RESULT_TTL_SECONDS
+
+        job_datas = [
+            Queue.prepare_data(
+                analyze_transcript_task,
+                kwargs={
+                    "transcript": item["transcript"],
+                    "provider": item["provider"],
+                    "model": item["model"],
+                    "system_prompt": item["system_prompt"],
+                    "tasks": item["tasks"],
+                },
+                job_id=item["job_id"],
+                timeout=timeout,
+                result_ttl=result_ttl,
+                failure_ttl=86400,
+                retry=retry,
+                meta={**_owner_meta(user_id), **({"batch_id": batch_id} if batch_id else {})},
+            )
+            for item in items
+        ]
+
+        with self.redis_conn.pipeline() as pipe:
+            jobs = queue.enqueue_many(job_datas, pipeline=pipe)
+            if batch_id:
+                pipe.set(
+                    BATCH_KEY.format(batch_id=batch_id),
+                    json.dumps({
+                        "user_id": user_id,
+                        "job_ids": batch_job_ids or [job.id for job in jobs],
+                        "created_at": datetime.now(timezone.utc).isoformat(),
+                    }),
+                    ex=get_settings().BULK_BATCH_TTL_SECONDS,
+                )
+            pipe.execute()
+
+        self._flush_serializer_stats()
+        return jobs
+
     def enqueue_batch_analysis(
         self,
         transcript: str,
@@ -73,6 +229,8 @@ class QueueService:
         tasks: list,
         priority: str = "default",
         timeout: int = 900,  # 15 minutes for batch
+        user_id: Optional[str] = None,
+        tier: Optional[str] = None,
     ) -> Job:
         """Enqueue a batch transcript analysis job.
 
@@ -83,13 +241,15 @@ class QueueService:
             tasks: List of {task_name: str, prompt: str} dicts
             priority: Queue priority
             timeout: Job timeout in seconds
+            user_id: Submitting user (enables fair scheduling)
+            tier: Submitting user's subscription tier
 
         Returns:
             RQ Job instance
         """
         from worker.tasks.analysis import analyze_batch_task
 
-        queue = self._get_queue(priority)
+        queue = self._get_queue(priority, user_id=user_id, tier=tier)
 
         job = queue.enqueue(
             analyze_batch_task,
@@ -98,71 +258,408 @@ class QueueService:
             model=model,
             tasks=tasks,
             job_timeout=timeout,
+            retry=self._retry_policy(),
+            result_ttl=3600,
+            failure_ttl=86400,
+            meta=_owner_meta(user_id),
+        )
+
+        self._flush_serializer_stats()
+        return job
+
+    def enqueue_stripe_event(self, event_id: str) -> Job:
+        """Enqueue processing of a stored Stripe webhook event.
+
+        Billing events go to the high-priority queue so upgrades apply
+        quickly. Processing is idempotent, so enqueueing an event twice
+        (e.g. on a Stripe redelivery) is harmless.
+
+        Args:
+            event_id: Stripe event ID
+
+        Returns:
+            RQ Job instance
+        """
+        from worker.tasks.billing import process_stripe_event_task
+
+        job = self.high_queue.enqueue(
+            process_stripe_event_task,
+            event_id=event_id,
+            job_timeout=60,
+            retry=self._retry_policy(),
             result_ttl=3600,
             failure_ttl=86400,
         )
 
+        self._flush_serializer_stats()
         return job
 
-    def get_job_status(self, job_id: str) -> Dict[str, Any]:
+    def _flush_serializer_stats(self) -> None:
+        """Report payload serialization counts; never fails an enqueue."""
+        try:
+            flush_compression_stats(self.redis_conn)
+        except Exception as e:
+            logger.warning(f"Failed to flush serializer stats: {e}")
+
+    @staticmethod
+    def _retry_policy() -> Optional[Retry]:
+        """Automatic retry with backoff for failed jobs (None if disabled)."""
+        settings = get_settings()
+        if settings.JOB_MAX_RETRIES <= 0:
+            return None
+
+        return Retry(
+            max=settings.JOB_MAX_RETRIES,
+            interval=settings.get_job_retry_intervals_list() or 0,
+        )
+
+    async def get_job_status(self, job_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """Get the status of a job.
 
         Args:
             job_id: Job ID
+            user_id: If given, only jobs submitted by this user are found
 
         Returns:
             Dictionary with job status and result (if complete)
 
+        Raises:
+            NoSuchJobError: If the job isn't in Redis
+
         Example:
             {
                 "job_id": "abc123",
                 "status": "finished",  # queued, started, finished, failed
                 "result": {...},  # if finished
                 "error": "...",  # if failed
-                "progress": 0.5,  # if available
             }
         """
-        job = Job.fetch(job_id, connection=self.redis_conn)
+        statuses = await self.get_job_statuses([job_id], include_results=True, user_id=user_id)
+        if job_id not in statuses:
+            raise NoSuchJobError(f"No such job: {job_id}")
+
+        return statuses[job_id]
+
+    async def get_job_statuses(
+        self,
+        job_ids: List[str],
+        include_results: bool = False,
+        user_id: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get compact status for many jobs with pipelined reads.
+
+        Statuses take one round trip (HMGET per job). With
+        ``include_results``, a second round trip reads the latest result of
+        every finished or failed job.
+
+        Args:
+            job_ids: Job IDs
+            include_results: Also return results (finished) and errors (failed)
+            user_id: If given, jobs not submitted by this user (including
+                system jobs such as billing events) are left out
+
+        Returns:
+            Status dicts (as get_job_status) keyed by job ID; jobs not in
+            Redis are left out
+        """
+        fields = ("status", "created_at", "started_at", "ended_at", "meta")
+        async with self.async_redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hmget(Job.key_for(job_id), *fields)
+            replies = await pipe.execute()
+
+        statuses: Dict[str, Dict[str, Any]] = {}
+        for job_id, values in zip(job_ids, replies):
+            status, created_at, started_at, ended_at, meta = values
+            if status is None:
+                continue
+
+            # The submitter is recorded at enqueue, whichever queue the job is on
+            meta = self.serializer.loads(meta) if meta else {}
+            if user_id and meta.get("user_id") != user_id:
+                continue
 
-        status_data = {
-            "job_id": job.id,
-            "status": job.get_status(),
-            "created_at": job.created_at.isoformat() if job.created_at else None,
-            "started_at": job.started_at.isoformat() if job.started_at else None,
-            "ended_at": job.ended_at.isoformat() if job.ended_at else None,
-        }
+            status = status.decode()
+            if status == JobStatus.FINISHED.value and meta.get("cancelled"):
+                status = JobStatus.CANCELED.value
 
-        # Add result if finished
-        if job.is_finished:
-            status_data["result"] = job.result
+            statuses[job_id] = {
+                "job_id": job_id,
+                "status": status,
+                "created_at": _isoformat(created_at),
+                "started_at": _isoformat(started_at),
+                "ended_at": _isoformat(ended_at),
+            }
+
+        if include_results:
+            done = [
+                job_id
+                for job_id, data in statuses.items()
+                if data["status"] in (JobStatus.FINISHED.value, JobStatus.FAILED.value, JobStatus.CANCELED.value)
+            ]
+            async with self.async_redis.pipeline(transaction=False) as pipe:
+                for job_id in done:
+                    pipe.xrevrange(Result.get_key(job_id), "+", "-", count=1)
+                latest = await pipe.execute()
 
-        # Add error if failed
-        if job.is_failed:
-            status_data["error"] = str(job.exc_info)
+            for job_id, entries in zip(done, latest):
+                if not entries:
+                    continue
+                result_id, payload = entries[0]
+                result = Result.restore(
+                    job_id,
+                    result_id.decode(),
+                    payload,
+                    connection=self.redis_conn,
+                    serializer=self.serializer,
+                )
+                if result.type == Result.Type.SUCCESSFUL:
+                    statuses[job_id]["result"] = result.return_value
+                elif result.exc_string:
+                    statuses[job_id]["error"] = result.exc_string
 
-        return status_data
+        return statuses
 
-    def cancel_job(self, job_id: str) -> bool:
-        """Cancel a queued job.
+    async def get_batch(self, batch_id: str, include_statuses: bool = True) -> Optional[Dict[str, Any]]:
+        """Get a batch and the current RQ status of each of its jobs.
+
+        Job statuses are read with one pipelined round trip. Jobs that have
+        expired from Redis have a status of None.
+
+        Args:
+            batch_id: Batch ID
+            include_statuses: Also read each job's status
+
+        Returns:
+            {"user_id", "job_ids", "created_at", "statuses"} or None if the
+            batch doesn't exist
+        """
+        raw = await self.async_redis.get(BATCH_KEY.format(batch_id=batch_id))
+        if raw is None:
+            return None
+
+        batch = json.loads(raw)
+        if not include_statuses:
+            return batch
+
+        async with self.async_redis.pipeline(transaction=False) as pipe:
+            for job_id in batch["job_ids"]:
+                pipe.hget(Job.key_for(job_id), "status")
+            statuses = await pipe.execute()
+
+        batch["statuses"] = [
+            status.decode() if isinstance(status, bytes) else status
+            for status in statuses
+        ]
+        return batch
+
+    def claim_idempotency_keys(
+        self, keys: List[str], job_ids: List[str], ttl: int
+    ) -> List[Optional[str]]:
+        """Claim many idempotency keys in one round trip.
+
+        Args:
+            keys: Idempotency keys
+            job_ids: ID of the job about to be created for each key
+            ttl: Seconds to hold the claims
+
+        Returns:
+            For each key, None if the claim was taken, otherwise the ID of
+            the job that already holds it
+        """
+        with self.redis_conn.pipeline(transaction=False) as pipe:
+            for key, job_id in zip(keys, job_ids):
+                redis_key = IDEMPOTENCY_KEY.format(key=key)
+                pipe.set(redis_key, job_id, nx=True, ex=ttl)
+                pipe.get(redis_key)
+            replies = pipe.execute()
+
+        claims = []
+        for claimed, existing in zip(replies[::2], replies[1::2]):
+            if claimed:
+                claims.append(None)
+            else:
+                claims.append(existing.decode() if isinstance(existing, bytes) else existing)
+        return claims
+
+    async def cancel_job(self, job_id: str, user_id: Optional[str] = None) -> Optional[str]:
+        """Cancel a job.
+
+        Jobs that haven't started (queued, deferred or waiting for a retry)
+        are removed from their queue. Running jobs are flagged and stop
+        cooperatively: the worker aborts the in-flight LLM call, skips the
+        remaining tasks and keeps the results of the finished ones.
 
         Args:
             job_id: Job ID
+            user_id: If given, only jobs submitted by this user can be cancelled
 
         Returns:
-            True if cancelled, False otherwise
+            "cancelled" if the job was removed, "cancelling" if a running job
+            was asked to stop, None if the job can't be cancelled
+
+        Raises:
+            NoSuchJobError: The job wasn't submitted by user_id
         """
         try:
-            job = Job.fetch(job_id, connection=self.redis_conn)
-            job.cancel()
-            return True
+            status, timeout, meta = await self.async_redis.hmget(Job.key_for(job_id), "status", "timeout", "meta")
         except Exception:
-            return False
+            return None
+        if status is None:
+            return None
+
+        # Same ownership rule as get_job_statuses
+        if user_id and (self.serializer.loads(meta) if meta else {}).get("user_id") != user_id:
+            raise NoSuchJobError(f"No such job: {job_id}")
+
+        try:
+            status = status.decode()
+
+            if status in (JobStatus.QUEUED.value, JobStatus.DEFERRED.value, JobStatus.SCHEDULED.value):
+                # RQ's cancel spans the queue and several registries; it only
+                # has a sync implementation, so keep it off the event loop
+                await asyncio.to_thread(self._cancel_pending_job, job_id)
+                return "cancelled"
+
+            if status == JobStatus.STARTED.value:
+                await self.async_redis.set(
+                    CANCEL_KEY.format(job_id=job_id),
+                    1,
+                    ex=int(float(timeout or Queue.DEFAULT_TIMEOUT)) + 60,
+                )
+                return "cancelling"
+
+            return None
+        except Exception:
+            return None
+
+    def _cancel_pending_job(self, job_id: str) -> None:
+        """Remove a job that hasn't started from its queue and registries."""
+        job = Job.fetch(job_id, connection=self.redis_conn, serializer=self.serializer)
+        job.cancel()
+
+    def claim_idempotency_key(self, key: str, job_id: str, ttl: int) -> Optional[str]:
+        """Atomically claim an idempotency key for a new job.
+
+        Args:
+            key: Idempotency key
+            job_id: ID of the job about to be created
+            ttl: Seconds to hold the claim
+
+        Returns:
+            None if the claim was taken, otherwise the ID of the job that
+            already holds it
+        """
+        redis_key = IDEMPOTENCY_KEY.format(key=key)
+        if self.redis_conn.set(redis_key, job_id, nx=True, ex=ttl):
+            return None
+
+        existing = self.redis_conn.get(redis_key)
+        if existing is None:
+            # Claim expired between SET and GET; try once more
+            if self.redis_conn.set(redis_key, job_id, nx=True, ex=ttl):
+                return None
+            existing = self.redis_conn.get(redis_key)
+
+        return existing.decode() if isinstance(existing, bytes) else existing
+
+    def swap_idempotency_key(self, key: str, expected: str, job_id: str, ttl: int) -> Optional[str]:
+        """Point an idempotency key at a job if it still points at another.
+
+        Compare-and-set, so two requests that both found the same stale
+        claim can't both take it over.
+
+        Args:
+            key: Idempotency key
+            expected: Job ID the claim is expected to hold
+            job_id: Job ID to point the claim at
+            ttl: Seconds to hold the claim
+
+        Returns:
+            None if the claim was moved, otherwise the ID of the job that
+            holds it instead
+        """
+        current = self._swap_claim(keys=[IDEMPOTENCY_KEY.format(key=key)], args=[expected, job_id, ttl])
+        return current.decode() if isinstance(current, bytes) else current
+
+    def swap_idempotency_keys(
+        self, keys: List[str], expected: List[str], job_ids: List[str], ttl: int
+    ) -> List[Optional[str]]:
+        """Compare-and-set many idempotency keys in one round trip.
+
+        Args:
+            keys: Idempotency keys
+            expected: Job ID each claim is expected to hold
+            job_ids: Job ID to point each claim at
+            ttl: Seconds to hold the claims
+
+        Returns:
+            For each key, None if the claim was moved, otherwise the ID of
+            the job that holds it instead
+        """
+        if not keys:
+            return []
+
+        with self.redis_conn.pipeline(transaction=False) as pipe:
+            for key, old_id, job_id in zip(keys, expected, job_ids):
+                self._swap_claim(
+                    keys=[IDEMPOTENCY_KEY.format(key=key)], args=[old_id, job_id, ttl], client=pipe
+                )
+            replies = pipe.execute()
+
+        return [reply.decode() if isinstance(reply, bytes) else reply for reply in replies]
+
+    def release_idempotency_keys(self, claims: Dict[str, str]) -> None:
+        """Drop many idempotency claims, each only if still held by its job.
+
+        Args:
+            claims: Job ID that took each idempotency key
+        """
+        if not claims:
+            return
+
+        with self.redis_conn.pipeline(transaction=False) as pipe:
+            for key, job_id in claims.items():
+                self._release_claim(keys=[IDEMPOTENCY_KEY.format(key=key)], args=[job_id], client=pipe)
+            pipe.execute()
+
+    def release_idempotency_key(self, key: str, job_id: str) -> None:
+        """Drop an idempotency claim if it is still held by the given job.
+
+        Args:
+            key: Idempotency key
+            job_id: Job ID that took the claim
+        """
+        self._release_claim(keys=[IDEMPOTENCY_KEY.format(key=key)], args=[job_id])
+
+    def _get_queue(
+        self,
+        priority: str,
+        user_id: Optional[str] = None,
+        tier: Optional[str] = None,
+    ) -> Queue:
+        """Get queue by priority.
+
+        Jobs with a known user go to that user's fair-scheduled sub-queue;
+        anonymous jobs use the shared priority queue.
+        """
+        if user_id and self.scheduler.enabled:
+            return self.scheduler.queue_for(priority, user_id, tier, serializer=self.serializer)
 
-    def _get_queue(self, priority: str) -> Queue:
-        """Get queue by priority."""
         if priority == "high":
             return self.high_queue
         elif priority == "low":
             return self.low_queue
         else:
             return self.default_queue
+
+
+def _owner_meta(user_id: Optional[str]) -> Dict[str, Any]:
+    """Job meta recording the submitting user, checked on status reads."""
+    return {"user_id": user_id} if user_id else {}
+
+
+def _isoformat(value: Optional[bytes]) -> Optional[str]:
+    """Convert an RQ timestamp field to ISO 8601."""
+    date = str_to_date(value) if value else None
+    return date.isoformat() if date else None
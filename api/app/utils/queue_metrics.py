@@ -0,0 +1,219 @@
+"""Queue depth, latency and worker metrics for autoscaling.
+
+Metrics are reported per priority band (``high``, ``default``, ``low``), with
+each band's per-user sub-queues folded in. Latencies come from the RQ job
+timestamps of recently finished and failed jobs:
+
+    wait = started_at - enqueued_at   (enqueue to start)
+    run  = ended_at - started_at      (start to end)
+
+The recommended worker count applies Little's law. Keeping up with
+arrivals takes ``throughput * mean run time`` busy workers. Draining the
+current backlog within ``AUTOSCALE_TARGET_WAIT_SECONDS`` takes
+``depth * mean run time / target wait`` more. The total is divided by the
+target utilization and clamped to the configured bounds.
+
+Job payload serialization totals (see ``app.utils.serializer``) are read in
+the same round trip and reported alongside.
+"""
+
+import math
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from redis import Redis
+from rq import Queue, Worker
+from rq.job import Job
+from rq.registry import FailedJobRegistry, FinishedJobRegistry, StartedJobRegistry
+from rq.utils import str_to_date
+
+from app.config.settings import get_settings
+from app.utils.scheduler import PRIORITIES, FairScheduler
+from app.utils.serializer import STATS_KEY, stats_from_hash
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800)
+
+
+class QueueMetrics:
+    """Collects queue metrics from Redis with pipelined reads."""
+
+    def __init__(self, redis_conn: Redis):
+        """Initialize the collector.
+
+        Args:
+            redis_conn: Redis connection shared with the RQ queues
+        """
+        self.redis_conn = redis_conn
+
+    def collect(self, window_seconds: Optional[int] = None) -> Dict[str, Any]:
+        """Collect metrics for every priority band.
+
+        Args:
+            window_seconds: Look-back window for latencies, throughput and
+                failure rate. Capped at JOB_RESULT_TTL_SECONDS, since
+                finished jobs expire from Redis after that.
+
+        Returns:
+            {"window_seconds", "queues", "workers", "recommended_workers",
+            "serialization", "generated_at"}
+        """
+        settings = get_settings()
+        window = min(window_seconds or settings.JOB_RESULT_TTL_SECONDS, settings.JOB_RESULT_TTL_SECONDS)
+        window = max(window, 1)
+        now = time.time()
+        sample_size = settings.QUEUE_METRICS_SAMPLE_SIZE
+
+        prefix = Queue.redis_queue_namespace_prefix
+        names = set(PRIORITIES)
+        for key in self.redis_conn.smembers(Queue.redis_queues_keys):
+            key = key.decode() if isinstance(key, bytes) else key
+            if key.startswith(prefix):
+                names.add(key[len(prefix):])
+        bands = {
+            name: FairScheduler.parse_queue_name(name)[0]
+            for name in sorted(names)
+            if FairScheduler.parse_queue_name(name)[0] in PRIORITIES
+        }
+
+        # Round trip 1: backlog, oldest job, in-flight count and recent jobs,
+        # plus the serialization totals
+        with self.redis_conn.pipeline(transaction=False) as pipe:
+            pipe.hgetall(STATS_KEY)
+            for name in bands:
+                pipe.llen(prefix + name)
+                pipe.lindex(prefix + name, 0)
+                pipe.zcard(StartedJobRegistry.key_template.format(name))
+                pipe.zrevrange(FinishedJobRegistry.key_template.format(name), 0, sample_size - 1)
+                pipe.zrevrange(FailedJobRegistry.key_template.format(name), 0, sample_size - 1)
+            serialization, *replies = pipe.execute()
+
+        stats = {
+            band: {"depth": 0, "oldest": None, "in_flight": 0, "finished": 0, "failed": 0, "wait": [], "run": []}
+            for band in PRIORITIES
+        }
+        oldest_ids: List[tuple[str, str]] = []
+        sampled: List[tuple[str, str, bool]] = []
+        for index, (name, band) in enumerate(bands.items()):
+            depth, oldest_id, in_flight, finished_ids, failed_ids = replies[5 * index: 5 * index + 5]
+            stats[band]["depth"] += depth
+            stats[band]["in_flight"] += in_flight
+            if oldest_id:
+                oldest_ids.append((band, oldest_id.decode()))
+            sampled.extend((band, job_id.decode(), False) for job_id in finished_ids)
+            sampled.extend((band, job_id.decode(), True) for job_id in failed_ids)
+
+        # Round trip 2: timestamps of the oldest waiting jobs and the sample
+        with self.redis_conn.pipeline(transaction=False) as pipe:
+            for _, job_id in oldest_ids:
+                pipe.hmget(Job.key_for(job_id), "enqueued_at", "created_at")
+            for _, job_id, _ in sampled:
+                pipe.hmget(Job.key_for(job_id), "enqueued_at", "created_at", "started_at", "ended_at")
+            replies = pipe.execute()
+
+        for (band, _), (enqueued_at, created_at) in zip(oldest_ids, replies[: len(oldest_ids)]):
+            enqueued = _timestamp(enqueued_at) or _timestamp(created_at)
+            if enqueued is not None:
+                age = max(now - enqueued, 0.0)
+                stats[band]["oldest"] = max(stats[band]["oldest"] or 0.0, age)
+
+        for (band, _, failed), values in zip(sampled, replies[len(oldest_ids):]):
+            enqueued_at, created_at, started_at, ended_at = values
+            ended = _timestamp(ended_at)
+            if ended is None or now - ended > window:
+                continue
+
+            stats[band]["failed" if failed else "finished"] += 1
+            started = _timestamp(started_at)
+            enqueued = _timestamp(enqueued_at) or _timestamp(created_at)
+            if started is not None:
+                stats[band]["run"].append(max(ended - started, 0.0))
+                if enqueued is not None:
+                    stats[band]["wait"].append(max(started - enqueued, 0.0))
+
+        workers = Worker.all(connection=self.redis_conn)
+        busy = sum(1 for worker in workers if worker.state == "busy")
+
+        queues = {}
+        total_load = 0.0
+        total_in_flight = 0
+        for band in PRIORITIES:
+            band_stats = stats[band]
+            completed = band_stats["finished"] + band_stats["failed"]
+            throughput = completed / window  # jobs per second
+            mean_run = (
+                sum(band_stats["run"]) / len(band_stats["run"])
+                if band_stats["run"]
+                else settings.AUTOSCALE_DEFAULT_JOB_SECONDS
+            )
+
+            # Little's law: busy workers = arrival rate x time in service
+            load = throughput * mean_run
+            load += band_stats["depth"] * mean_run / max(settings.AUTOSCALE_TARGET_WAIT_SECONDS, 1)
+            total_load += load
+            total_in_flight += band_stats["in_flight"]
+
+            queues[band] = {
+                "depth": band_stats["depth"],
+                "oldest_job_age_seconds": (
+                    round(band_stats["oldest"], 3) if band_stats["oldest"] is not None else None
+                ),
+                "in_flight": band_stats["in_flight"],
+                "finished": band_stats["finished"],
+                "failed": band_stats["failed"],
+                "failure_rate": round(band_stats["failed"] / completed, 4) if completed else 0.0,
+                "throughput_per_minute": round(throughput * 60, 3),
+                "wait_seconds": _histogram(band_stats["wait"]),
+                "run_seconds": _histogram(band_stats["run"]),
+                "worker_load": round(load, 3),
+            }
+
+        recommended = math.ceil(total_load / max(settings.AUTOSCALE_TARGET_UTILIZATION, 0.01))
+        recommended = max(recommended, total_in_flight, settings.AUTOSCALE_MIN_WORKERS)
+        recommended = min(recommended, settings.AUTOSCALE_MAX_WORKERS)
+
+        return {
+            "window_seconds": window,
+            "queues": queues,
+            "workers": {
+                "total": len(workers),
+                "busy": busy,
+                "busy_ratio": round(busy / len(workers), 4) if workers else 0.0,
+            },
+            "recommended_workers": recommended,
+            "serialization": stats_from_hash(serialization),
+            "generated_at": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+        }
+
+
+def _histogram(samples: List[float]) -> Dict[str, Any]:
+    """Summarize latency samples as cumulative buckets plus percentiles."""
+    ordered = sorted(samples)
+    buckets = {str(bound): sum(1 for sample in ordered if sample <= bound) for bound in LATENCY_BUCKETS}
+    buckets["+Inf"] = len(ordered)
+
+    return {
+        "count": len(ordered),
+        "sum": round(sum(ordered), 3),
+        "p50": _percentile(ordered, 0.50),
+        "p95": _percentile(ordered, 0.95),
+        "max": round(ordered[-1], 3) if ordered else None,
+        "buckets": buckets,
+    }
+
+
+def _percentile(ordered: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted samples."""
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return round(ordered[index], 3)
+
+
+def _timestamp(value: Optional[bytes]) -> Optional[float]:
+    """Convert an RQ timestamp field to epoch seconds."""
+    date = str_to_date(value) if value else None
+    if date is None:
+        return None
+    return date.replace(tzinfo=timezone.utc).timestamp()
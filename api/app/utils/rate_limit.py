@@ -1,55 +1,145 @@
-"""Rate limiting utilities for rip quotas."""
+"""Rate limiting utilities for rip quotas.
+
+Free users' daily rips are counted in Redis, one counter per user per UTC
+day. A rip is reserved (INCR, refused above the limit) before the LLM work
+and either kept, once the rip is recorded in the ``usage`` table, or
+refunded if the work fails. Reserving is a single atomic script, so
+concurrent requests can't both take the last rip.
+
+The ``usage`` table stays the source of truth: a day's counter is seeded
+from it the first time it's needed (and after Redis loses it), and the DB
+count is used directly if Redis is unavailable.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 
-from datetime import datetime, timedelta
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.redis import get_redis
+from app.config.settings import get_settings
 from app.models.user import User, UserRole, SubscriptionTier
 from app.models.usage import Usage
-
-
-async def can_user_rip(user_id: str, db: AsyncSession) -> tuple[bool, str]:
-    """Check if a user can perform a rip based on their tier and usage.
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+QUOTA_KEY = "scriptripper:quota:{user_id}:{day}"
+
+# Reserve one rip. KEYS: counter. ARGV: limit, seed (or ""), ttl.
+# Returns the new count, -1 if the quota is used up, or -2 if the counter
+# doesn't exist and no seed was given.
+_RESERVE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    if ARGV[2] == '' then
+        return -2
+    end
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3], 'NX')
+end
+local count = redis.call('INCR', KEYS[1])
+if count > tonumber(ARGV[1]) then
+    redis.call('DECR', KEYS[1])
+    return -1
+end
+return count
+"""
+
+# Give a reserved rip back. KEYS: counter.
+_REFUND_SCRIPT = """
+local count = tonumber(redis.call('GET', KEYS[1]) or '0')
+if count > 0 then
+    return redis.call('DECR', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class RipReservation:
+    """A rip taken from a user's daily quota."""
+
+    key: Optional[str] = None  # Redis counter, None if nothing was reserved there
+
+
+async def reserve_rip(user: User, db: AsyncSession) -> tuple[Optional[RipReservation], str]:
+    """Reserve a rip from a user's daily quota before doing the work.
 
     Args:
-        user_id: User UUID
-        db: Database session
+        user: User performing the rip
+        db: Database session (only used to seed or replace the counter)
 
     Returns:
-        Tuple of (can_rip: bool, message: str)
+        Tuple of (reservation, or None if the quota is used up; message)
     """
-    # Get user
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-
-    if not user:
-        return False, "User not found"
-
     # Admins have unlimited access
     if user.role == UserRole.ADMIN:
-        return True, "Admin user - unlimited access"
+        return RipReservation(), "Admin user - unlimited access"
 
     # Pro and Premium tiers have unlimited access
     if user.subscription_tier in [SubscriptionTier.PRO, SubscriptionTier.PREMIUM]:
-        return True, f"{user.subscription_tier.value.capitalize()} tier - unlimited access"
+        return RipReservation(), f"{user.subscription_tier.value.capitalize()} tier - unlimited access"
+
+    # Free tier: reserve from the daily quota
+    limit = get_settings().FREE_DAILY_RIP_LIMIT
+    exceeded = (
+        f"Daily quota exceeded. Free users get {limit} rip{'s' if limit != 1 else ''} per day. "
+        "Upgrade to Pro for unlimited access."
+    )
+
+    day_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    key = QUOTA_KEY.format(user_id=user.id, day=day_start.date().isoformat())
+    # Outlive the day a little so late refunds still find the counter
+    ttl = int((day_start + timedelta(days=1, hours=1) - datetime.now(timezone.utc)).total_seconds())
 
-    # Free tier: check daily quota
-    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    today_end = today_start + timedelta(days=1)
+    try:
+        reserve = get_redis().register_script(_RESERVE_SCRIPT)
+        count = await reserve(keys=[key], args=[limit, "", ttl])
+        if count == -2:
+            seed = await _count_rips(user.id, day_start, db)
+            count = await reserve(keys=[key], args=[limit, seed, ttl])
+    except Exception as e:
+        # Degrade to the unreserved DB check rather than blocking every rip
+        logger.warning(f"Redis quota unavailable, checking usage table: {e}")
+        if await _count_rips(user.id, day_start, db) >= limit:
+            return None, exceeded
+        return RipReservation(), "Within daily quota"
 
-    # Count rips today
+    if count < 0:
+        return None, exceeded
+
+    return RipReservation(key=key), "Within daily quota"
+
+
+async def refund_rip(reservation: RipReservation) -> None:
+    """Give a reserved rip back after the work failed.
+
+    Args:
+        reservation: Reservation from reserve_rip
+    """
+    if reservation.key is None:
+        return
+
+    try:
+        await get_redis().register_script(_REFUND_SCRIPT)(keys=[reservation.key])
+    except Exception as e:
+        # The counter is reseeded from the usage table if it's ever lost
+        logger.warning(f"Failed to refund rip on {reservation.key}: {e}")
+    reservation.key = None
+
+
+async def _count_rips(user_id, day_start: datetime, db: AsyncSession) -> int:
+    """Count a user's recorded rips on a UTC day."""
+    # created_at is stored as naive UTC
+    start = day_start.replace(tzinfo=None)
     result = await db.execute(
         select(func.count(Usage.id))
         .where(Usage.user_id == user_id)
-        .where(Usage.created_at >= today_start)
-        .where(Usage.created_at < today_end)
+        .where(Usage.created_at >= start)
+        .where(Usage.created_at < start + timedelta(days=1))
     )
-    rips_today = result.scalar() or 0
-
-    if rips_today >= 1:
-        return False, "Daily quota exceeded. Free users get 1 rip per day. Upgrade to Pro for unlimited access."
-
-    return True, "Within daily quota"
+    return result.scalar() or 0
 
 
 async def record_rip(
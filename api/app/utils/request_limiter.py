@@ -0,0 +1,320 @@
+"""Per-minute request rate limiting.
+
+Every API request is rate limited per client: by user ID when it carries a
+valid access token, otherwise by client IP. Limits use GCRA (the generic
+cell rate algorithm), which only stores one timestamp per client: requests
+are spaced ``60 / limit`` seconds apart on average, with up to
+``RATE_LIMIT_BURST`` allowed back to back.
+
+The default limit is ``RATE_LIMIT_PER_MINUTE``; ``RATE_LIMIT_ROUTES``
+overrides it per route (the longest matching path prefix wins), and a limit
+of 0 means unlimited. State is kept in Redis, so limits hold across API
+replicas. If Redis is unavailable each process enforces the limits on its
+own until Redis is back.
+
+Responses carry ``RateLimit-Limit``, ``RateLimit-Remaining`` and
+``RateLimit-Reset`` headers; refused requests get a 429 with
+``Retry-After``.
+"""
+
+import json
+import math
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from redis.commands.core import AsyncScript
+
+from app.config.redis import get_redis
+from app.config.settings import get_settings
+from app.utils.auth_cache import TTLCache, decode_token_cached
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+RATE_LIMIT_KEY = "scriptripper:ratelimit:{rule}:{client}"
+
+# Seconds to enforce limits in-process after a Redis error before trying Redis again
+REDIS_RETRY_SECONDS = 5
+
+# Clients tracked by the in-process fallback (least recently seen are dropped)
+LOCAL_MAX_CLIENTS = 10000
+
+# GCRA. KEYS: theoretical arrival time (ms). ARGV: interval (ms), burst.
+# Returns {allowed (1/0), remaining, retry after (ms), reset (ms)}.
+_GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + interval
+local allow_at = new_tat - burst * interval
+if now < allow_at then
+    return {0, 0, allow_at - now, tat - now}
+end
+
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {1, math.floor((now - allow_at) / interval), 0, new_tat - now}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """Limit for requests matching a method and path prefix."""
+
+    name: str  # Identifies the rule's counters
+    method: Optional[str]  # None matches any method
+    path_prefix: str
+    per_minute: int  # 0 = unlimited
+    burst: int
+
+    def matches(self, method: str, path: str) -> bool:
+        """Whether a request falls under this rule."""
+        return (self.method is None or self.method == method) and path.startswith(self.path_prefix)
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """Outcome of checking one request."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # Seconds until a refused request would be allowed
+    reset: float  # Seconds until the client is back to a full burst
+
+    def headers(self) -> List[Tuple[bytes, bytes]]:
+        """Rate limit response headers."""
+        headers = [
+            (b"ratelimit-limit", str(self.limit).encode()),
+            (b"ratelimit-remaining", str(self.remaining).encode()),
+            (b"ratelimit-reset", str(math.ceil(self.reset)).encode()),
+        ]
+        if not self.allowed:
+            headers.append((b"retry-after", str(max(1, math.ceil(self.retry_after))).encode()))
+        return headers
+
+
+def parse_rules() -> List[RateLimitRule]:
+    """Build the rules from settings, most specific first.
+
+    Returns:
+        Route rules by descending prefix length, then the default rule
+    """
+    settings = get_settings()
+    rules = []
+    for spec, per_minute in settings.get_rate_limit_routes_list():
+        method, _, path_prefix = spec.rpartition(" ")
+        rules.append(
+            RateLimitRule(
+                name=spec.replace(" ", ":"),
+                method=method.upper() or None,
+                path_prefix=path_prefix,
+                per_minute=per_minute,
+                burst=min(settings.RATE_LIMIT_BURST, per_minute),
+            )
+        )
+
+    # Prefer longer prefixes, and a method-specific rule over a catch-all
+    rules.sort(key=lambda rule: (len(rule.path_prefix), rule.method is not None), reverse=True)
+    rules.append(
+        RateLimitRule(
+            name="default",
+            method=None,
+            path_prefix="/",
+            per_minute=settings.RATE_LIMIT_PER_MINUTE,
+            burst=min(settings.RATE_LIMIT_BURST, settings.RATE_LIMIT_PER_MINUTE),
+        )
+    )
+    return rules
+
+
+class RequestLimiter:
+    """GCRA limiter backed by Redis, with an in-process fallback."""
+
+    def __init__(self):
+        """Initialize the limiter from settings."""
+        self.rules = parse_rules()
+        self._local = TTLCache(LOCAL_MAX_CLIENTS)
+        self._redis_retry_at = 0.0
+        self._gcra: Optional[AsyncScript] = None  # Registered on first use
+
+    def rule_for(self, method: str, path: str) -> Optional[RateLimitRule]:
+        """Find the rule for a request.
+
+        Args:
+            method: HTTP method
+            path: Request path
+
+        Returns:
+            Matching rule, or None if the request is unlimited
+        """
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return rule if rule.per_minute > 0 and rule.burst > 0 else None
+        return None
+
+    async def check(self, rule: RateLimitRule, client: str) -> RateLimitDecision:
+        """Count a request against a client's limit.
+
+        Args:
+            rule: Rule the request falls under
+            client: Client identity ("user:<id>" or "ip:<address>")
+
+        Returns:
+            Whether the request is allowed, with header values
+        """
+        key = RATE_LIMIT_KEY.format(rule=rule.name, client=client)
+        interval_ms = 60000 / rule.per_minute
+
+        if time.monotonic() >= self._redis_retry_at:
+            try:
+                if self._gcra is None:
+                    self._gcra = get_redis().register_script(_GCRA_SCRIPT)
+                allowed, remaining, retry_after_ms, reset_ms = await self._gcra(
+                    keys=[key], args=[int(interval_ms), rule.burst]
+                )
+                return RateLimitDecision(
+                    allowed=bool(allowed),
+                    limit=rule.per_minute,
+                    remaining=int(remaining),
+                    retry_after=int(retry_after_ms) / 1000,
+                    reset=int(reset_ms) / 1000,
+                )
+            except Exception as e:
+                logger.warning(f"Rate limiting in-process, Redis unavailable: {e}")
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+
+        return self._check_local(rule, key, interval_ms / 1000)
+
+    def reset(self) -> None:
+        """Forget in-process state and re-read the rules."""
+        self.rules = parse_rules()
+        self._local.invalidate()
+        self._redis_retry_at = 0.0
+        self._gcra = None
+
+    def _check_local(self, rule: RateLimitRule, key: str, interval: float) -> RateLimitDecision:
+        """Same algorithm as _GCRA_SCRIPT, on this process's counters."""
+        now = time.monotonic()
+        tat = max(self._local.get(key) or now, now)
+
+        new_tat = tat + interval
+        allow_at = new_tat - rule.burst * interval
+        if now < allow_at:
+            return RateLimitDecision(
+                allowed=False,
+                limit=rule.per_minute,
+                remaining=0,
+                retry_after=allow_at - now,
+                reset=tat - now,
+            )
+
+        self._local.set(key, new_tat, new_tat - now)
+        return RateLimitDecision(
+            allowed=True,
+            limit=rule.per_minute,
+            remaining=math.floor((now - allow_at) / interval),
+            retry_after=0,
+            reset=new_tat - now,
+        )
+
+
+request_limiter = RequestLimiter()
+
+
+def client_identity(scope: dict) -> str:
+    """Identify the client making a request.
+
+    Args:
+        scope: ASGI connection scope
+
+    Returns:
+        "user:<id>" for a valid access token, otherwise "ip:<address>"
+    """
+    headers = dict(scope.get("headers") or [])
+
+    authorization = headers.get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        payload = decode_token_cached(token.strip())
+        if payload and payload.get("type") == "access" and payload.get("sub"):
+            return f"user:{payload['sub']}"
+
+    if get_settings().RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded_for = headers.get(b"x-forwarded-for", b"").decode("latin-1")
+        address = forwarded_for.split(",")[0].strip()
+        if address:
+            return f"ip:{address}"
+
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitMiddleware:
+    """ASGI middleware enforcing the per-minute request limits."""
+
+    def __init__(self, app, limiter: Optional[RequestLimiter] = None):
+        """Wrap an ASGI app.
+
+        Args:
+            app: ASGI application
+            limiter: Limiter to use (defaults to the process-wide one)
+        """
+        self.app = app
+        self.limiter = limiter or request_limiter
+
+    async def __call__(self, scope, receive, send):
+        """Check the limit, then pass the request on or refuse it."""
+        # CORS preflights are answered before they reach a route
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        rule = self.limiter.rule_for(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        decision = await self.limiter.check(rule, client_identity(scope))
+        if not decision.allowed:
+            await self._refuse(decision, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *decision.headers()]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    async def _refuse(self, decision: RateLimitDecision, send) -> None:
+        """Send a 429 in the API's error format."""
+        retry_after = max(1, math.ceil(decision.retry_after))
+        body = json.dumps({
+            "detail": {
+                "error": {
+                    "code": "rate_limited",
+                    "message": f"Too many requests, retry in {retry_after} seconds",
+                    "retryable": True,
+                    "retry_after": retry_after,
+                }
+            }
+        }).encode("utf-8")
+
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *decision.headers(),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
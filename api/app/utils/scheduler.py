@@ -0,0 +1,329 @@
+"""Weighted-fair scheduling of background jobs across users and tiers.
+
+Jobs submitted on behalf of a user are enqueued on a per-user sub-queue
+(``<priority>:user:<user_id>``) instead of the shared priority queue. Workers
+order the backlogged sub-queues with start-time fair queueing: each user has a
+virtual time that advances by ``1 / weight`` for every job dequeued, and the
+user with the lowest virtual time is served first. Weights come from the
+subscription tier, and a per-tier in-flight cap bounds how many workers a
+single user can occupy at once.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+from redis import Redis
+from rq import Queue
+from rq.registry import ScheduledJobRegistry
+
+from app.config.settings import get_settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+PRIORITIES = ("high", "default", "low")
+SHARED_TENANT = "shared"
+
+TIERS_KEY = "scriptripper:fair:tiers"
+VTIME_KEY = "scriptripper:fair:vtime:{priority}"
+CLOCK_KEY = "scriptripper:fair:clock:{priority}"
+INFLIGHT_KEY = "scriptripper:fair:inflight:{tenant}"
+
+# Record the user's tier and, if their sub-queue is idle, move their virtual
+# time up to the current clock so a returning user can't bank credit.
+# KEYS: queue, vtime hash, clock, tiers hash. ARGV: tenant, tier.
+_ACTIVATE_SCRIPT = """
+redis.call('HSET', KEYS[4], ARGV[1], ARGV[2])
+if redis.call('LLEN', KEYS[1]) == 0 then
+    local clock = tonumber(redis.call('GET', KEYS[3]) or '0')
+    local vtime = tonumber(redis.call('HGET', KEYS[2], ARGV[1]) or '0')
+    if vtime < clock then
+        redis.call('HSET', KEYS[2], ARGV[1], tostring(clock))
+    end
+end
+return 1
+"""
+
+# Advance the clock to the served tenant's start time, charge the tenant and
+# count the job as in flight.
+# KEYS: vtime hash, clock, inflight. ARGV: tenant, charge, inflight ttl.
+_DEQUEUE_SCRIPT = """
+local vtime = tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or '0')
+local clock = tonumber(redis.call('GET', KEYS[2]) or '0')
+if vtime > clock then
+    redis.call('SET', KEYS[2], tostring(vtime))
+end
+redis.call('HINCRBYFLOAT', KEYS[1], ARGV[1], ARGV[2])
+if tonumber(ARGV[3]) > 0 then
+    redis.call('INCR', KEYS[3])
+    redis.call('EXPIRE', KEYS[3], ARGV[3])
+end
+return 1
+"""
+
+# Forget an idle sub-queue so workers stop polling it. Queues with scheduled
+# jobs (retries, deferred work) are kept until those jobs are released.
+# KEYS: rq:queues set, queue, scheduled registry. ARGV: queue key.
+_PRUNE_SCRIPT = """
+if redis.call('LLEN', KEYS[2]) == 0 and redis.call('ZCARD', KEYS[3]) == 0 then
+    redis.call('SREM', KEYS[1], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+
+class FairScheduler:
+    """Routes jobs to per-user sub-queues and orders them for workers."""
+
+    def __init__(self, redis_conn: Redis):
+        """Initialize the scheduler.
+
+        Args:
+            redis_conn: Redis connection shared with the RQ queues
+        """
+        settings = get_settings()
+
+        self.redis_conn = redis_conn
+        self.enabled = settings.FAIR_SCHEDULING_ENABLED
+        self.poll_interval = settings.FAIR_SCHEDULER_POLL_SECONDS
+        self.weights = {
+            "free": settings.FAIR_WEIGHT_FREE,
+            "pro": settings.FAIR_WEIGHT_PRO,
+            "premium": settings.FAIR_WEIGHT_PREMIUM,
+        }
+        self.inflight_caps = {
+            "free": settings.MAX_INFLIGHT_JOBS_FREE,
+            "pro": settings.MAX_INFLIGHT_JOBS_PRO,
+            "premium": settings.MAX_INFLIGHT_JOBS_PREMIUM,
+        }
+
+        # Sub-queues with scheduled jobs, as of the last ordered_queues() call
+        self.scheduled_queue_names: List[str] = []
+
+        self._activate = redis_conn.register_script(_ACTIVATE_SCRIPT)
+        self._dequeue = redis_conn.register_script(_DEQUEUE_SCRIPT)
+        self._prune = redis_conn.register_script(_PRUNE_SCRIPT)
+
+    @staticmethod
+    def tenant_queue_name(priority: str, user_id: str) -> str:
+        """Name of a user's sub-queue within a priority band."""
+        return f"{priority}:user:{user_id}"
+
+    @staticmethod
+    def parse_queue_name(queue_name: str) -> tuple[str, str]:
+        """Split a queue name into (priority, tenant).
+
+        Shared priority queues ('high', 'default', 'low') map to the
+        ``shared`` tenant.
+        """
+        priority, _, user_id = queue_name.partition(":user:")
+        return priority, user_id or SHARED_TENANT
+
+    @staticmethod
+    def effective_priority(priority: str, tier: Optional[str]) -> str:
+        """Clamp the requested priority to what the tier is entitled to.
+
+        Only paid tiers may use the ``high`` band.
+        """
+        if priority not in PRIORITIES:
+            return "default"
+        if priority == "high" and tier not in ("pro", "premium"):
+            return "default"
+        return priority
+
+    def queue_for(
+        self,
+        priority: str,
+        user_id: str,
+        tier: Optional[str] = None,
+        **queue_kwargs,
+    ) -> Queue:
+        """Get (and activate) the sub-queue for a user's next job.
+
+        Args:
+            priority: Requested queue priority
+            user_id: Submitting user's ID
+            tier: Submitting user's subscription tier
+            **queue_kwargs: Extra arguments for the RQ Queue
+
+        Returns:
+            RQ Queue to enqueue the job on
+        """
+        tier = tier or "free"
+        priority = self.effective_priority(priority, tier)
+        queue = Queue(
+            self.tenant_queue_name(priority, user_id),
+            connection=self.redis_conn,
+            **queue_kwargs,
+        )
+
+        self._activate(
+            keys=[
+                queue.key,
+                VTIME_KEY.format(priority=priority),
+                CLOCK_KEY.format(priority=priority),
+                TIERS_KEY,
+            ],
+            args=[user_id, tier],
+        )
+
+        return queue
+
+    def ordered_queues(self, **queue_kwargs) -> List[Queue]:
+        """Build the dequeue order for workers.
+
+        Priority bands are still drained strictly (high, then default, then
+        low). Within a band, backlogged users are ordered by virtual time and
+        users at their in-flight cap are skipped. The shared queue of each
+        band is always included so legacy and anonymous jobs keep flowing.
+
+        Args:
+            **queue_kwargs: Extra arguments for the RQ Queues
+
+        Returns:
+            Queues in the order they should be polled
+        """
+        prefix = Queue.redis_queue_namespace_prefix
+        registered = [
+            key.decode() if isinstance(key, bytes) else key
+            for key in self.redis_conn.smembers(Queue.redis_queues_keys)
+        ]
+        tenant_names = sorted(
+            key[len(prefix):]
+            for key in registered
+            if key.startswith(prefix) and ":user:" in key
+        )
+
+        # One round trip for every tenant's backlog, schedule, tier, load and
+        # virtual time
+        with self.redis_conn.pipeline(transaction=False) as pipe:
+            for priority in PRIORITIES:
+                pipe.hget(VTIME_KEY.format(priority=priority), SHARED_TENANT)
+            for name in tenant_names:
+                priority, tenant = self.parse_queue_name(name)
+                pipe.llen(prefix + name)
+                pipe.zcard(_scheduled_key(name))
+                pipe.get(INFLIGHT_KEY.format(tenant=tenant))
+                pipe.hget(TIERS_KEY, tenant)
+                pipe.hget(VTIME_KEY.format(priority=priority), tenant)
+            replies = pipe.execute()
+
+        bands: Dict[str, List[tuple[float, str]]] = {
+            priority: [(float(vtime or 0), priority)]
+            for priority, vtime in zip(PRIORITIES, replies[: len(PRIORITIES)])
+        }
+        per_tenant = replies[len(PRIORITIES):]
+
+        self.scheduled_queue_names = []
+        for index, name in enumerate(tenant_names):
+            length, scheduled, inflight, tier, vtime = per_tenant[5 * index: 5 * index + 5]
+            priority, tenant = self.parse_queue_name(name)
+            if priority not in bands:
+                continue
+            if scheduled:
+                self.scheduled_queue_names.append(name)
+
+            if not length:
+                if not scheduled:
+                    self._prune(
+                        keys=[Queue.redis_queues_keys, prefix + name, _scheduled_key(name)],
+                        args=[prefix + name],
+                    )
+                continue
+
+            cap = self.inflight_caps.get(_decode(tier) or "free", 0)
+            if cap and int(inflight or 0) >= cap:
+                continue
+
+            bands[priority].append((float(vtime or 0), name))
+
+        ordered = []
+        for priority in PRIORITIES:
+            for _, name in sorted(bands[priority]):
+                ordered.append(Queue(name, connection=self.redis_conn, **queue_kwargs))
+
+        return ordered
+
+    def record_dequeue(self, queue_name: str, job_timeout: int) -> None:
+        """Charge a tenant for a dequeued job and mark it in flight.
+
+        Args:
+            queue_name: Queue the job was dequeued from
+            job_timeout: Job timeout, used to expire a leaked in-flight count
+        """
+        priority, tenant = self.parse_queue_name(queue_name)
+        if priority not in PRIORITIES:
+            return
+
+        tier = "free"
+        if tenant != SHARED_TENANT:
+            tier = _decode(self.redis_conn.hget(TIERS_KEY, tenant)) or "free"
+
+        self._dequeue(
+            keys=[
+                VTIME_KEY.format(priority=priority),
+                CLOCK_KEY.format(priority=priority),
+                INFLIGHT_KEY.format(tenant=tenant),
+            ],
+            args=[
+                tenant,
+                1.0 / max(self.weights.get(tier, 1.0), 0.001),
+                job_timeout + 60 if tenant != SHARED_TENANT else 0,
+            ],
+        )
+
+    def release(self, queue_name: str) -> None:
+        """Mark a tenant's job as no longer in flight."""
+        _, tenant = self.parse_queue_name(queue_name)
+        if tenant == SHARED_TENANT:
+            return
+
+        key = INFLIGHT_KEY.format(tenant=tenant)
+        if self.redis_conn.decr(key) <= 0:
+            self.redis_conn.delete(key)
+
+    def enqueue_due_jobs(self, **queue_kwargs) -> int:
+        """Release due scheduled jobs (retries, deferred work) on sub-queues.
+
+        RQ's built-in scheduler only locks the queues a worker was started
+        with, so jobs scheduled on per-user sub-queues are moved here instead.
+        ZREM acts as the claim, so concurrent workers never release a job
+        twice.
+
+        Args:
+            **queue_kwargs: Extra arguments for the RQ Queues
+
+        Returns:
+            Number of jobs released
+        """
+        released = 0
+        now = time.time()
+
+        for name in self.scheduled_queue_names:
+            queue = Queue(name, connection=self.redis_conn, **queue_kwargs)
+            registry = ScheduledJobRegistry(queue=queue)
+            for job_id in registry.get_jobs_to_schedule(int(now)):
+                if not self.redis_conn.zrem(registry.key, job_id):
+                    continue
+                job = queue.fetch_job(job_id)
+                if job:
+                    queue._enqueue_job(job, at_front=bool(job.enqueue_at_front))
+                    released += 1
+
+        if released:
+            logger.info(f"Released {released} scheduled job(s) onto user sub-queues")
+
+        return released
+
+
+def _scheduled_key(queue_name: str) -> str:
+    """Redis key of a queue's ScheduledJobRegistry."""
+    return ScheduledJobRegistry.key_template.format(queue_name)
+
+
+def _decode(value) -> Optional[str]:
+    """Decode a Redis reply to str."""
+    if isinstance(value, bytes):
+        return value.decode()
+    return value
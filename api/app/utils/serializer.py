@@ -0,0 +1,144 @@
+"""Compact, compressed serializer for RQ job payloads and results.
+
+RQ pickles job arguments and return values by default, so a 500K-character
+transcript is stored in Redis as-is. This serializer writes compact JSON and
+zlib-compresses payloads above a size threshold. Payloads are prefixed with a
+short marker so the format can be detected on read:
+
+    SRJ1J<json>   plain JSON
+    SRJ1Z<zlib>   zlib-compressed JSON
+
+Anything without the marker is treated as a pickle written before this
+serializer was deployed, and values that aren't JSON-serializable are still
+written as pickles, so existing jobs keep working.
+
+Payloads are serialized in the API (job arguments) and in RQ's forked work
+horses (results and meta), so each process counts its payloads locally and
+adds them to a shared Redis hash with ``flush_compression_stats``. The
+totals are reported by the queue metrics endpoint.
+"""
+
+import json
+import pickle
+import threading
+import zlib
+from typing import Any, Dict
+
+from redis import Redis
+
+from app.config.settings import get_settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+MAGIC = b"SRJ1"
+_PLAIN = b"J"
+_COMPRESSED = b"Z"
+
+# Redis hash with the serialization totals of every process
+STATS_KEY = "scriptripper:serializer:stats"
+
+# Payloads serialized by this process since the last flush
+_stats_lock = threading.Lock()
+_stats = {
+    "payloads": 0,
+    "compressed_payloads": 0,
+    "raw_bytes": 0,
+    "stored_bytes": 0,
+}
+
+
+class CompressedJSONSerializer:
+    """RQ serializer: compact JSON, zlib-compressed above a size threshold."""
+
+    @staticmethod
+    def dumps(obj: Any, *args, **kwargs) -> bytes:
+        """Serialize a job payload, result or meta dict."""
+        try:
+            body = json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        except (TypeError, ValueError):
+            # Not JSON-serializable: keep RQ's default format
+            return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+        settings = get_settings()
+        if len(body) < settings.JOB_COMPRESSION_THRESHOLD_BYTES:
+            _record(len(body), len(body), compressed=False)
+            return MAGIC + _PLAIN + body
+
+        packed = zlib.compress(body, settings.JOB_COMPRESSION_LEVEL)
+        _record(len(body), len(packed), compressed=True)
+        logger.debug(
+            f"Compressed job payload {len(body)} -> {len(packed)} bytes "
+            f"({len(body) / max(len(packed), 1):.1f}x)"
+        )
+        return MAGIC + _COMPRESSED + packed
+
+    @staticmethod
+    def loads(data: bytes, *args, **kwargs) -> Any:
+        """Deserialize a payload written by dumps() or by RQ's pickle default."""
+        if not data.startswith(MAGIC):
+            return pickle.loads(data)
+
+        kind = data[len(MAGIC):len(MAGIC) + 1]
+        body = data[len(MAGIC) + 1:]
+        if kind == _COMPRESSED:
+            body = zlib.decompress(body)
+
+        return json.loads(body)
+
+
+def flush_compression_stats(redis_conn: Redis) -> None:
+    """Add this process's serialization counts to the shared totals.
+
+    Counts are only cleared once Redis has them, so a failed flush is
+    retried by the next one.
+
+    Args:
+        redis_conn: Sync Redis connection
+    """
+    with _stats_lock:
+        pending = {name: value for name, value in _stats.items() if value}
+    if not pending:
+        return
+
+    with redis_conn.pipeline(transaction=False) as pipe:
+        for name, value in pending.items():
+            pipe.hincrby(STATS_KEY, name, value)
+        pipe.execute()
+
+    with _stats_lock:
+        for name, value in pending.items():
+            _stats[name] -= value
+
+
+def compression_stats(redis_conn: Redis) -> Dict[str, Any]:
+    """Serialization totals across the API and workers.
+
+    Args:
+        redis_conn: Sync Redis connection
+
+    Returns:
+        Payload counts, raw and stored byte totals and the overall
+        compression ratio (raw / stored)
+    """
+    return stats_from_hash(redis_conn.hgetall(STATS_KEY))
+
+
+def stats_from_hash(values: Dict[Any, Any]) -> Dict[str, Any]:
+    """Build compression_stats() output from the raw STATS_KEY hash."""
+    totals = {
+        (name.decode() if isinstance(name, bytes) else name): int(value)
+        for name, value in values.items()
+    }
+    stats = {name: totals.get(name, 0) for name in _stats}
+    stats["compression_ratio"] = round(stats["raw_bytes"] / stats["stored_bytes"], 2) if stats["stored_bytes"] else 1.0
+    return stats
+
+
+def _record(raw_bytes: int, stored_bytes: int, compressed: bool) -> None:
+    """Add one payload to the pending counts."""
+    with _stats_lock:
+        _stats["payloads"] += 1
+        _stats["compressed_payloads"] += int(compressed)
+        _stats["raw_bytes"] += raw_bytes
+        _stats["stored_bytes"] += stored_bytes
@@ -0,0 +1,381 @@
+"""Incremental parsers turning uploaded files into transcript text.
+
+Uploads are fed to a parser chunk by chunk as they arrive, so no format
+holds more than one copy of the file:
+
+- ``txt``/``md``: decoded as UTF-8 and kept as-is.
+- ``srt``/``vtt``: parsed cue by cue; cue numbers, identifiers, timings,
+  NOTE/STYLE blocks and markup are dropped, one line per cue is kept, and
+  WebVTT voice tags become ``Speaker: text``.
+- ``json``: the raw bytes are kept and parsed once at the end. A bare
+  string, a ``transcript``/``text`` field, or a list of segments with
+  ``speaker`` and ``text`` are understood.
+- ``docx``/``pdf``: spooled to memory, then to a temporary file past
+  ``SPOOL_MAX_MEMORY_BYTES``; the text is extracted once the upload ends.
+  Both formats are compressed, so extraction stops as soon as the text
+  passes the parser's ``max_length``.
+
+Legacy ``.doc`` files are not supported.
+"""
+
+import codecs
+import html
+import re
+import tempfile
+import zipfile
+import zlib
+from typing import Any, List, Optional
+from xml.etree import ElementTree
+
+import orjson
+from pypdf import PdfReader
+from pypdf.errors import PyPdfError
+
+# Binary uploads stay in memory up to this size, then move to a temp file
+SPOOL_MAX_MEMORY_BYTES = 1024 * 1024
+
+# word/document.xml is inflated and parsed in pieces of this size
+DOCX_READ_CHUNK_BYTES = 64 * 1024
+
+# Bytes of word/document.xml read per character of max_length (the rest is markup)
+DOCX_MAX_XML_RATIO = 40
+
+# Extensions understood by the parsers, by MIME type
+CONTENT_TYPE_FORMATS = {
+    "text/plain": "txt",
+    "text/markdown": "md",
+    "application/x-subrip": "srt",
+    "text/srt": "srt",
+    "text/vtt": "vtt",
+    "application/json": "json",
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+    "application/msword": "doc",
+}
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_VOICE_TAG = re.compile(r"<v(?:\.[^\s>]*)?\s+([^>]+)>")
+_MARKUP = re.compile(r"<[^>]*>|\{\\[^}]*\}")
+
+# JSON fields holding text and speaker names, in order of preference
+_TEXT_FIELDS = ("text", "content", "transcript", "utterance", "sentence")
+_SPEAKER_FIELDS = ("speaker", "speaker_name", "speaker_label", "name")
+_SEGMENT_FIELDS = ("segments", "utterances", "results", "items", "transcript")
+
+
+class TranscriptParseError(ValueError):
+    """Uploaded file can't be turned into a transcript."""
+
+
+class UnsupportedFormatError(TranscriptParseError):
+    """No parser for the uploaded file's format."""
+
+
+class TranscriptTooLongError(TranscriptParseError):
+    """Extracted text is longer than the parser's max_length."""
+
+    def __init__(self, max_length: int):
+        super().__init__(f"Transcript text exceeds the maximum of {max_length:,} characters")
+        self.max_length = max_length
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """Work out an upload's format.
+
+    Args:
+        filename: Uploaded file name (its extension wins)
+        content_type: Content-Type header
+
+    Returns:
+        Lowercase extension, or None if unknown
+    """
+    if filename and "." in filename:
+        return filename.rsplit(".", 1)[1].strip().lower()
+    if content_type:
+        return CONTENT_TYPE_FORMATS.get(content_type.split(";")[0].strip().lower())
+    return None
+
+
+def parser_for(file_format: str, max_length: Optional[int] = None) -> "TranscriptParser":
+    """Create the parser for a format.
+
+    Args:
+        file_format: Lowercase extension
+        max_length: Stop extracting text past this many characters
+
+    Returns:
+        Fresh parser
+
+    Raises:
+        UnsupportedFormatError: No parser for this format
+    """
+    parsers = {
+        "txt": TextParser,
+        "md": TextParser,
+        "srt": CaptionParser,
+        "vtt": CaptionParser,
+        "json": JSONParser,
+        "docx": DocxParser,
+        "pdf": PDFParser,
+    }
+    if file_format == "doc":
+        raise UnsupportedFormatError("Legacy .doc files aren't supported; save the file as .docx and upload it again")
+    if file_format not in parsers:
+        raise UnsupportedFormatError(f"Unsupported file format: {file_format}")
+    return parsers[file_format](max_length)
+
+
+class TranscriptParser:
+    """Base parser: fed upload chunks, returns the transcript text."""
+
+    def __init__(self, max_length: Optional[int] = None):
+        self.max_length = max_length
+        self._length = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """Consume the next chunk of the upload."""
+        raise NotImplementedError
+
+    def finish(self) -> str:
+        """Finish parsing.
+
+        Returns:
+            Transcript text
+
+        Raises:
+            TranscriptParseError: The file is malformed
+        """
+        raise NotImplementedError
+
+    def _count(self, characters: int) -> None:
+        """Add extracted characters to the total, enforcing max_length."""
+        self._length += characters
+        if self.max_length is not None and self._length > self.max_length:
+            raise TranscriptTooLongError(self.max_length)
+
+
+class TextParser(TranscriptParser):
+    """Plain text and Markdown."""
+
+    def __init__(self, max_length: Optional[int] = None):
+        super().__init__(max_length)
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        self._parts: List[str] = []
+
+    def feed(self, chunk: bytes) -> None:
+        self._parts.append(self._decoder.decode(chunk))
+
+    def finish(self) -> str:
+        self._parts.append(self._decoder.decode(b"", final=True))
+        return "".join(self._parts).strip()
+
+
+class CaptionParser(TextParser):
+    """SRT and WebVTT captions: keeps the text of each cue."""
+
+    def __init__(self, max_length: Optional[int] = None):
+        super().__init__(max_length)
+        self._pending = ""  # Incomplete last line
+        self._block: List[str] = []  # Lines of the current cue
+
+    def feed(self, chunk: bytes) -> None:
+        lines = (self._pending + self._decoder.decode(chunk)).split("\n")
+        self._pending = lines.pop()
+        for line in lines:
+            self._line(line)
+
+    def finish(self) -> str:
+        for line in (self._pending + self._decoder.decode(b"", final=True)).split("\n"):
+            self._line(line)
+        self._end_block()
+        return "\n".join(self._parts).strip()
+
+    def _line(self, line: str) -> None:
+        line = line.strip()
+        if line:
+            self._block.append(line)
+        else:
+            self._end_block()
+
+    def _end_block(self) -> None:
+        """Keep a cue's text; blocks without a timing line are headers or notes."""
+        block, self._block = self._block, []
+        for index, line in enumerate(block):
+            if "-->" in line:
+                text = " ".join(_clean_cue_line(cue_line) for cue_line in block[index + 1:])
+                if text.strip():
+                    self._parts.append(" ".join(text.split()))
+                return
+
+
+def _clean_cue_line(line: str) -> str:
+    """Turn voice tags into speaker labels and drop other markup."""
+    line = _VOICE_TAG.sub(lambda match: f"{match.group(1).strip()}: ", line)
+    return html.unescape(_MARKUP.sub("", line))
+
+
+class JSONParser(TranscriptParser):
+    """JSON transcripts (parsed once the upload ends)."""
+
+    def __init__(self, max_length: Optional[int] = None):
+        super().__init__(max_length)
+        self._body = bytearray()
+
+    def feed(self, chunk: bytes) -> None:
+        self._body += chunk
+
+    def finish(self) -> str:
+        try:
+            data = orjson.loads(self._body)
+        except orjson.JSONDecodeError as e:
+            raise TranscriptParseError(f"Invalid JSON: {e}") from e
+        finally:
+            self._body = bytearray()
+
+        text = _json_text(data)
+        if text is None:
+            raise TranscriptParseError(
+                "No transcript found in JSON; expected a string, a 'transcript' or 'text' field, or a list of segments"
+            )
+        return text.strip()
+
+
+def _json_text(data: Any) -> Optional[str]:
+    """Extract transcript text from parsed JSON."""
+    if isinstance(data, str):
+        return data
+
+    if isinstance(data, list):
+        lines = [line for line in (_segment_text(item) for item in data) if line]
+        return "\n".join(lines) if lines else None
+
+    if isinstance(data, dict):
+        for field in _SEGMENT_FIELDS:
+            if isinstance(data.get(field), list):
+                return _json_text(data[field])
+        return _segment_text(data)
+
+    return None
+
+
+def _segment_text(segment: Any) -> Optional[str]:
+    """One segment's line, with its speaker label if it has one."""
+    if isinstance(segment, str):
+        return segment.strip() or None
+    if not isinstance(segment, dict):
+        return None
+
+    text = next((segment[f] for f in _TEXT_FIELDS if isinstance(segment.get(f), str)), None)
+    if not text or not text.strip():
+        return None
+
+    speaker = next((segment[f] for f in _SPEAKER_FIELDS if isinstance(segment.get(f), (str, int))), None)
+    return f"{speaker}: {text.strip()}" if speaker is not None else text.strip()
+
+
+class _SpooledParser(TranscriptParser):
+    """Binary formats that need the whole file: spooled, then extracted."""
+
+    def __init__(self, max_length: Optional[int] = None):
+        super().__init__(max_length)
+        self._file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES)
+
+    def feed(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+
+    def finish(self) -> str:
+        try:
+            self._file.seek(0)
+            return self._extract(self._file).strip()
+        finally:
+            self._file.close()
+
+    def _extract(self, file) -> str:
+        raise NotImplementedError
+
+
+class DocxParser(_SpooledParser):
+    """Word documents: paragraph text from word/document.xml."""
+
+    def _extract(self, file) -> str:
+        paragraphs: List[str] = []
+        parser = ElementTree.XMLPullParser(events=("end",))
+        max_xml_bytes = self.max_length * DOCX_MAX_XML_RATIO if self.max_length is not None else None
+        try:
+            with zipfile.ZipFile(file) as archive, archive.open("word/document.xml") as document:
+                read = 0
+                while chunk := document.read(DOCX_READ_CHUNK_BYTES):
+                    # A single huge paragraph is only counted once it ends
+                    read += len(chunk)
+                    if max_xml_bytes is not None and read > max_xml_bytes:
+                        raise TranscriptTooLongError(self.max_length)
+                    parser.feed(chunk)
+                    self._read_paragraphs(parser, paragraphs)
+                parser.close()
+                self._read_paragraphs(parser, paragraphs)
+        except TranscriptParseError:
+            raise
+        except (
+            zipfile.BadZipFile,
+            KeyError,
+            ElementTree.ParseError,
+            zlib.error,
+            EOFError,
+            RuntimeError,
+            NotImplementedError,
+        ) as e:
+            raise TranscriptParseError(f"Invalid .docx file: {e}") from e
+
+        return "\n".join(paragraph for paragraph in paragraphs if paragraph.strip())
+
+    def _read_paragraphs(self, parser: ElementTree.XMLPullParser, paragraphs: List[str]) -> None:
+        """Collect the paragraphs the XML parser has finished."""
+        for _, element in parser.read_events():
+            if element.tag == f"{_WORD_NS}p":
+                text = _paragraph_text(element)
+                self._count(len(text))
+                paragraphs.append(text)
+                element.clear()
+
+
+def _paragraph_text(paragraph: ElementTree.Element) -> str:
+    """Text of a Word paragraph, with tabs and line breaks."""
+    parts = []
+    for element in paragraph.iter():
+        if element.tag == f"{_WORD_NS}t" and element.text:
+            parts.append(element.text)
+        elif element.tag == f"{_WORD_NS}tab":
+            parts.append("\t")
+        elif element.tag in (f"{_WORD_NS}br", f"{_WORD_NS}cr"):
+            parts.append("\n")
+    return "".join(parts)
+
+
+class PDFParser(_SpooledParser):
+    """PDFs with a text layer (scanned PDFs have no text to extract)."""
+
+    def _extract(self, file) -> str:
+        pages = []
+        try:
+            reader = PdfReader(file)
+            for page in reader.pages:
+                text = page.extract_text() or ""
+                self._count(len(text))
+                pages.append(text)
+        except TranscriptParseError:
+            raise
+        except (
+            PyPdfError,
+            ValueError,
+            TypeError,
+            KeyError,
+            IndexError,
+            AttributeError,
+            zlib.error,
+            EOFError,
+            RuntimeError,
+            NotImplementedError,
+        ) as e:
+            raise TranscriptParseError(f"Invalid PDF file: {e}") from e
+
+        return "\n".join(page.strip() for page in pages if page.strip())
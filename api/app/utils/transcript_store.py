@@ -0,0 +1,125 @@
+"""Uploaded transcripts, kept in Redis until they're analyzed.
+
+``POST /transcripts`` parses an upload once and stores the text under a
+transcript ID for ``TRANSCRIPT_UPLOAD_TTL_SECONDS``. ``/analyze`` and
+``/jobs`` accept the ID in place of the transcript text, so clients don't
+have to read the file and post it again as JSON. Entries are written with
+the job serializer, so large transcripts are stored zlib-compressed.
+
+Transcripts uploaded by a signed-in user can only be used by that user;
+anonymous uploads can be used by anyone holding the ID.
+"""
+
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.config.redis import get_redis
+from app.config.settings import get_settings
+from app.models.user import User
+from app.utils.serializer import CompressedJSONSerializer
+
+TRANSCRIPT_KEY = "scriptripper:transcript:{transcript_id}"
+
+
+@dataclass
+class StoredTranscript:
+    """A parsed upload."""
+
+    id: str
+    text: str
+    format: str
+    filename: Optional[str] = None
+    owner_id: Optional[str] = None  # None for anonymous uploads
+
+
+async def save_transcript(
+    text: str,
+    file_format: str,
+    filename: Optional[str],
+    owner: Optional[User],
+) -> StoredTranscript:
+    """Store a parsed upload under a new transcript ID.
+
+    Args:
+        text: Transcript text
+        file_format: Uploaded file's format
+        filename: Uploaded file's name
+        owner: Uploading user, if signed in
+
+    Returns:
+        Stored transcript
+    """
+    transcript = StoredTranscript(
+        id=str(uuid.uuid4()),
+        text=text,
+        format=file_format,
+        filename=filename,
+        owner_id=str(owner.id) if owner else None,
+    )
+
+    await get_redis().set(
+        TRANSCRIPT_KEY.format(transcript_id=transcript.id),
+        CompressedJSONSerializer.dumps(transcript.__dict__),
+        ex=get_settings().TRANSCRIPT_UPLOAD_TTL_SECONDS,
+    )
+    return transcript
+
+
+async def load_transcript(transcript_id: str, user: Optional[User]) -> Optional[StoredTranscript]:
+    """Load an uploaded transcript.
+
+    Args:
+        transcript_id: Transcript ID from the upload
+        user: Requesting user, if signed in
+
+    Returns:
+        Stored transcript, or None if it doesn't exist, has expired, or
+        belongs to another user
+    """
+    data = await get_redis().get(TRANSCRIPT_KEY.format(transcript_id=transcript_id))
+    if data is None:
+        return None
+
+    transcript = StoredTranscript(**CompressedJSONSerializer.loads(data))
+    if transcript.owner_id is not None and (user is None or str(user.id) != transcript.owner_id):
+        return None
+    return transcript
+
+
+async def resolve_transcript(
+    transcript: Optional[str],
+    transcript_id: Optional[str],
+    user: Optional[User],
+) -> str:
+    """Get a request's transcript text, loading it by ID if needed.
+
+    Args:
+        transcript: Transcript text from the request body
+        transcript_id: Uploaded transcript ID from the request body
+        user: Requesting user, if signed in
+
+    Returns:
+        Transcript text
+
+    Raises:
+        HTTPException: 404 if the uploaded transcript isn't available
+    """
+    if transcript is not None:
+        return transcript
+
+    stored = await load_transcript(transcript_id, user)
+    if stored is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": {
+                    "code": "transcript_not_found",
+                    "message": f"Transcript '{transcript_id}' not found or expired; upload it again",
+                    "retryable": False,
+                }
+            },
+        )
+    return stored.text
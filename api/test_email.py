@@ -8,6 +8,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from app.utils.email_purelymail import send_email, send_welcome_email, send_password_reset_email
+from app.utils.mailer import mailer
 
 
 async def test_simple_email():
@@ -60,6 +61,9 @@ async def main():
     # Test password reset email
     reset_ok = await test_password_reset_email()
 
+    # Emails are only queued above; wait for them to go out
+    await mailer.stop()
+
     # Summary
     print("\n" + "=" * 60)
     print("Test Summary:")
@@ -2,6 +2,7 @@
 
 import pytest
 from httpx import AsyncClient
+from unittest.mock import patch
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -394,3 +395,187 @@ async def test_delete_prompt_as_regular_user(
     )
 
     assert response.status_code == 403
+
+
+def _histogram(samples: list[float]) -> dict:
+    """Latency histogram in the shape QueueMetrics reports."""
+    return {
+        "count": len(samples),
+        "sum": sum(samples),
+        "p50": samples[len(samples) // 2] if samples else None,
+        "p95": samples[-1] if samples else None,
+        "max": samples[-1] if samples else None,
+        "buckets": {"60": len(samples), "+Inf": len(samples)},
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_queue_metrics_as_admin(
+    client: AsyncClient,
+    admin_headers: dict,
+    test_admin: User,
+):
+    """Test queue metrics for autoscaling."""
+    band = {
+        "depth": 4,
+        "oldest_job_age_seconds": 12.5,
+        "in_flight": 2,
+        "finished": 9,
+        "failed": 1,
+        "failure_rate": 0.1,
+        "throughput_per_minute": 1.0,
+        "wait_seconds": _histogram([1.0, 2.0]),
+        "run_seconds": _histogram([30.0, 40.0]),
+        "worker_load": 2.5,
+    }
+
+    with patch("app.routes.admin.QueueMetrics") as mock_metrics:
+        mock_metrics.return_value.collect.return_value = {
+            "window_seconds": 300,
+            "queues": {"high": band, "default": band, "low": band},
+            "workers": {"total": 4, "busy": 3, "busy_ratio": 0.75},
+            "recommended_workers": 10,
+            "serialization": {
+                "payloads": 20,
+                "compressed_payloads": 5,
+                "raw_bytes": 400000,
+                "stored_bytes": 100000,
+                "compression_ratio": 4.0,
+            },
+            "generated_at": "2025-11-19T00:00:00+00:00",
+        }
+
+        response = await client.get(
+            "/api/v1/admin/queues/metrics?window_seconds=300",
+            headers=admin_headers,
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data["queues"]) == {"high", "default", "low"}
+    assert data["queues"]["default"]["run_seconds"]["count"] == 2
+    assert data["workers"]["busy_ratio"] == 0.75
+    assert data["recommended_workers"] == 10
+    assert data["serialization"]["compression_ratio"] == 4.0
+    mock_metrics.return_value.collect.assert_called_once_with(300)
+
+
+@pytest.mark.asyncio
+async def test_get_queue_metrics_as_regular_user(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+):
+    """Test queue metrics are admin-only."""
+    response = await client.get(
+        "/api/v1/admin/queues/metrics",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 403
+
+
+def _dead_letter(job_id: str, failure_class: str = "bad_input") -> dict:
+    """DLQ entry in the shape DeadLetterQueue reports."""
+    return {
+        "job_id": job_id,
+        "failure_class": failure_class,
+        "error": "ValueError: Transcript is empty",
+        "origin": "default",
+        "attempts": 1,
+        "failed_at": "2025-11-19T00:00:00+00:00",
+    }
+
+
+@pytest.mark.asyncio
+async def test_list_dead_letters_as_admin(
+    client: AsyncClient,
+    admin_headers: dict,
+    test_admin: User,
+):
+    """Test listing the dead-letter queue filtered by failure class."""
+    with patch("app.routes.admin.DeadLetterQueue") as mock_dlq:
+        mock_dlq.return_value.list.return_value = (3, [_dead_letter("job-1")])
+
+        response = await client.get(
+            "/api/v1/admin/dlq?failure_class=bad_input&limit=1",
+            headers=admin_headers,
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert data["items"][0]["job_id"] == "job-1"
+    mock_dlq.return_value.list.assert_called_once_with("bad_input", 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_get_dead_letter_not_found(
+    client: AsyncClient,
+    admin_headers: dict,
+    test_admin: User,
+):
+    """Test getting a job that isn't in the dead-letter queue."""
+    with patch("app.routes.admin.DeadLetterQueue") as mock_dlq:
+        mock_dlq.return_value.get.return_value = None
+
+        response = await client.get(
+            "/api/v1/admin/dlq/missing-job",
+            headers=admin_headers,
+        )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_requeue_dead_letters_by_class(
+    client: AsyncClient,
+    admin_headers: dict,
+    test_admin: User,
+):
+    """Test requeueing every dead-lettered job of one failure class."""
+    with patch("app.routes.admin.DeadLetterQueue") as mock_dlq:
+        mock_dlq.return_value.job_ids.return_value = ["job-1", "job-2"]
+        mock_dlq.return_value.requeue.return_value = (["job-1"], ["job-2"])
+
+        response = await client.post(
+            "/api/v1/admin/dlq/requeue",
+            headers=admin_headers,
+            json={"failure_class": "quota"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"requeued": ["job-1"], "not_found": ["job-2"]}
+    mock_dlq.return_value.job_ids.assert_called_once_with("quota")
+    mock_dlq.return_value.requeue.assert_called_once_with(["job-1", "job-2"])
+
+
+@pytest.mark.asyncio
+async def test_requeue_dead_letters_requires_selection(
+    client: AsyncClient,
+    admin_headers: dict,
+    test_admin: User,
+):
+    """Test requeueing without job IDs or a failure class."""
+    response = await client.post(
+        "/api/v1/admin/dlq/requeue",
+        headers=admin_headers,
+        json={},
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_dead_letters_as_regular_user(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+):
+    """Test the dead-letter queue is admin-only."""
+    response = await client.get(
+        "/api/v1/admin/dlq",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 403
@@ -1,12 +1,26 @@
 """Tests for analysis endpoints."""
 
+import gzip
+import json
+import uuid
+
+import brotli
 import pytest
+import pytest_asyncio
 from httpx import AsyncClient
 from unittest.mock import AsyncMock, patch, MagicMock
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.settings import get_settings
+from app.models.profile import LLMProvider, Profile, ProfileStatus
 from app.models.user import User
 from app.models.prompt import Prompt
+from app.utils.compression import RequestBodyError, _DecompressingReceiver
+from app.utils.profile_cache import profile_cache
+from app.utils.prompt_catalog import prompt_catalog
+from app.utils.rate_limit import RipReservation
+from app.utils.request_limiter import RateLimitRule, request_limiter
 
 
 @pytest.mark.asyncio
@@ -44,6 +58,66 @@ async def test_get_prompts_with_category_filter(
     assert len(data["meetings"]) == 2
 
 
+@pytest.mark.asyncio
+async def test_get_prompts_not_modified(
+    client: AsyncClient, test_prompts: list[Prompt]
+):
+    """Test the prompt catalog is revalidated with its ETag."""
+    response = await client.get("/api/v1/prompts")
+
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert "max-age" in response.headers["Cache-Control"]
+
+    response = await client.get("/api/v1/prompts", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_get_prompts_unknown_category_not_cached(
+    client: AsyncClient, test_prompts: list[Prompt]
+):
+    """Test unknown category filters are answered without caching a snapshot."""
+    response = await client.get("/api/v1/prompts?category=unknown")
+
+    assert response.status_code == 200
+    assert response.json() == {"meetings": [], "presentations": []}
+    assert "unknown" not in prompt_catalog._snapshots
+
+
+@pytest.mark.asyncio
+async def test_get_prompts_rebuilt_after_admin_change(
+    client: AsyncClient,
+    admin_headers: dict,
+    test_admin: User,
+    test_prompts: list[Prompt],
+):
+    """Test admin prompt changes rebuild the prompt catalog."""
+    response = await client.get("/api/v1/prompts")
+    etag = response.headers["ETag"]
+
+    response = await client.post(
+        "/api/v1/admin/prompts",
+        headers=admin_headers,
+        json={
+            "task_name": "Decisions",
+            "description": "Decisions made in the meeting",
+            "prompt_json": "List the decisions made",
+            "category": "meetings",
+        },
+    )
+    assert response.status_code == 200
+
+    response = await client.get("/api/v1/prompts", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()["meetings"]) == 3
+
+
 @pytest.mark.asyncio
 async def test_custom_analysis_without_auth(
     client: AsyncClient, sample_transcript: str
@@ -134,6 +208,62 @@ async def test_batch_analyze_authenticated(
     assert data["model"] == "gemini-2.5-flash"
 
 
+@pytest.mark.asyncio
+async def test_batch_analyze_quota_exceeded(
+    client: AsyncClient,
+    auth_headers: dict,
+    sample_transcript: str,
+    test_user: User,
+):
+    """Test batch analysis is refused once the daily quota is reserved."""
+    with patch("app.routes.analyze.reserve_rip", AsyncMock(return_value=(None, "Daily quota exceeded"))), \
+            patch("app.routes.analyze.LLMProviderFactory.create") as mock_factory:
+        response = await client.post(
+            "/api/v1/analyze/batch",
+            headers=auth_headers,
+            json={
+                "transcript": sample_transcript,
+                "transcript_type": "meeting",
+                "tasks": [{"task_name": "Summary", "prompt": "Summarize this transcript"}],
+            },
+        )
+
+    assert response.status_code == 429
+    assert response.json()["detail"]["error"]["code"] == "quota_exceeded"
+    mock_factory.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_batch_analyze_refunds_quota_on_failure(
+    client: AsyncClient,
+    auth_headers: dict,
+    sample_transcript: str,
+    test_user: User,
+):
+    """Test a failed batch analysis gives its reserved rip back."""
+    reservation = RipReservation(key="scriptripper:quota:test")
+
+    with patch("app.routes.analyze.reserve_rip", AsyncMock(return_value=(reservation, "Within daily quota"))), \
+            patch("app.routes.analyze.refund_rip", AsyncMock()) as mock_refund, \
+            patch("app.routes.analyze.LLMProviderFactory.create") as mock_factory:
+        mock_provider = AsyncMock()
+        mock_provider.generate.side_effect = Exception("LLM API error")
+        mock_factory.return_value = mock_provider
+
+        response = await client.post(
+            "/api/v1/analyze/batch",
+            headers=auth_headers,
+            json={
+                "transcript": sample_transcript,
+                "transcript_type": "meeting",
+                "tasks": [{"task_name": "Summary", "prompt": "Summarize this transcript"}],
+            },
+        )
+
+    assert response.status_code == 500
+    mock_refund.assert_awaited_once_with(reservation)
+
+
 @pytest.mark.asyncio
 async def test_batch_analyze_without_auth(
     client: AsyncClient, sample_transcript: str
@@ -255,6 +385,96 @@ async def test_batch_analyze_custom_prompt_tracking(
     assert usage.had_custom_prompt is True
 
 
+MEETING = "\n".join([
+    "Sarah Johnson: Let's review the launch plan.",
+    "Mike: The roadmap is almost done.",
+    "Sarah Johnson: Great, when can we see it?",
+    "Mike: By Friday.",
+] * 5)
+
+
+@pytest.mark.asyncio
+async def test_batch_analyze_aliases_speakers(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+):
+    """Test speakers are sent as aliases and named again in the results."""
+    mock_response = MagicMock()
+    mock_response.content = "S2 will share the roadmap with S1 by Friday."
+    mock_response.input_tokens = 100
+    mock_response.output_tokens = 50
+    mock_response.cost = 0.0001
+    mock_response.model = "gemini-2.5-flash"
+
+    with patch("app.routes.analyze.LLMProviderFactory.create") as mock_factory:
+        mock_provider = AsyncMock()
+        mock_provider.generate.return_value = mock_response
+        mock_factory.return_value = mock_provider
+
+        response = await client.post(
+            "/api/v1/analyze/batch",
+            headers=auth_headers,
+            json={
+                "transcript": MEETING,
+                "transcript_type": "meeting",
+                "tasks": [{"task_name": "Action Items", "prompt": "List action items"}],
+                "metadata": {
+                    "participantCount": 2,
+                    "participantType": "group",
+                    "title": "Launch Sync",
+                    "date": "2025-11-18",
+                    "participants": ["Sarah Johnson", "Mike Chen"],
+                },
+            },
+        )
+
+    assert response.status_code == 200
+    prompt = mock_provider.generate.call_args.kwargs["prompt"]
+    assert "SPEAKERS:\nS1 = Sarah Johnson\nS2 = Mike Chen" in prompt
+    assert "S1: Let's review the launch plan.\nS2: The roadmap is almost done." in prompt
+    assert "Sarah Johnson:" not in prompt
+
+    result = response.json()["results"][0]["result"]
+    assert "Participants: Sarah Johnson, Mike Chen" in result
+    assert result.endswith("Mike Chen will share the roadmap with Sarah Johnson by Friday.")
+
+
+@pytest.mark.asyncio
+async def test_batch_analyze_speaker_aliasing_disabled(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+):
+    """Test transcripts keep their speaker labels when aliasing is off."""
+    mock_response = MagicMock()
+    mock_response.content = "Result"
+    mock_response.input_tokens = 100
+    mock_response.output_tokens = 50
+    mock_response.cost = 0.0001
+    mock_response.model = "gemini-2.5-flash"
+
+    with patch("app.routes.analyze.LLMProviderFactory.create") as mock_factory, \
+            patch.object(get_settings(), "SPEAKER_ALIASING_ENABLED", False):
+        mock_provider = AsyncMock()
+        mock_provider.generate.return_value = mock_response
+        mock_factory.return_value = mock_provider
+
+        response = await client.post(
+            "/api/v1/analyze/batch",
+            headers=auth_headers,
+            json={
+                "transcript": MEETING,
+                "transcript_type": "meeting",
+                "tasks": [{"task_name": "Summary", "prompt": "Summarize this transcript"}],
+            },
+        )
+
+    assert response.status_code == 200
+    prompt = mock_provider.generate.call_args.kwargs["prompt"]
+    assert prompt.startswith(f"TRANSCRIPT:\n{MEETING}")
+
+
 @pytest.mark.asyncio
 async def test_custom_analysis_llm_error(
     client: AsyncClient, sample_transcript: str
@@ -280,3 +500,509 @@ async def test_custom_analysis_llm_error(
     data = response.json()
     assert "error" in data["detail"]
     assert data["detail"]["error"]["code"] == "analysis_failed"
+
+
+@pytest.mark.asyncio
+async def test_get_prompts_compressed(
+    client: AsyncClient, test_prompts: list[Prompt]
+):
+    """Test responses are Brotli-compressed when the client accepts it."""
+    with patch.object(get_settings(), "COMPRESSION_MINIMUM_SIZE_BYTES", 0):
+        response = await client.get("/api/v1/prompts", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "br"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.headers["ETag"].startswith("W/")
+    assert len(response.json()["meetings"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_custom_analysis_gzip_request_body(
+    client: AsyncClient, sample_transcript: str
+):
+    """Test gzip-encoded request bodies are decompressed before the route."""
+    mock_response = MagicMock()
+    mock_response.content = "Summary"
+    mock_response.input_tokens = 10
+    mock_response.output_tokens = 5
+    mock_response.cost = 0.0
+    mock_response.model = "gemini-2.5-flash"
+
+    body = json.dumps({
+        "transcript": sample_transcript,
+        "task_name": "Summary",
+        "prompt": "Summarize this transcript",
+    }).encode("utf-8")
+
+    with patch("app.routes.analyze.LLMProviderFactory.create") as mock_factory:
+        mock_provider = AsyncMock()
+        mock_provider.generate.return_value = mock_response
+        mock_factory.return_value = mock_provider
+
+        response = await client.post(
+            "/api/v1/analyze/custom",
+            content=gzip.compress(body),
+            headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["result"] == "Summary"
+    assert sample_transcript.strip() in mock_provider.generate.call_args.kwargs["prompt"]
+
+
+@pytest.mark.asyncio
+async def test_gzip_request_body_too_large(client: AsyncClient):
+    """Test decompressed bodies are capped at the upload limit."""
+    with patch.object(get_settings(), "MAX_UPLOAD_SIZE_MB", 1), \
+            patch("app.routes.analyze.LLMProviderFactory.create") as mock_factory:
+        response = await client.post(
+            "/api/v1/analyze/custom",
+            content=gzip.compress(b" " * (2 * 1024 * 1024)),
+            headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+        )
+
+    assert response.status_code == 413
+    assert response.json()["detail"]["error"]["code"] == "payload_too_large"
+    mock_factory.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_gzip_bomb_inflated_only_to_limit():
+    """Test a gzip bomb is inflated no further than the upload limit."""
+    bomb = gzip.compress(b"\0" * (64 * 1024 * 1024))
+
+    async def receive():
+        return {"type": "http.request", "body": bomb, "more_body": False}
+
+    with patch.object(get_settings(), "MAX_UPLOAD_SIZE_MB", 1):
+        receiver = _DecompressingReceiver(receive, "gzip")
+        with pytest.raises(RequestBodyError) as exc_info:
+            await receiver.receive()
+
+    assert exc_info.value.status_code == 413
+    assert receiver._received == 1024 * 1024 + 1
+
+
+@pytest.mark.asyncio
+async def test_brotli_request_body_refused(client: AsyncClient):
+    """Test Brotli request bodies are refused before any of it is inflated."""
+    bomb = brotli.compress(b"\0" * (64 * 1024 * 1024))
+
+    with patch("app.utils.compression.zlib.decompressobj") as mock_decompressobj, \
+            patch("app.routes.analyze.LLMProviderFactory.create") as mock_factory:
+        response = await client.post(
+            "/api/v1/analyze/custom",
+            content=bomb,
+            headers={"Content-Encoding": "br", "Content-Type": "application/json"},
+        )
+
+    assert response.status_code == 415
+    assert response.json()["detail"]["error"]["code"] == "unsupported_encoding"
+    mock_decompressobj.assert_not_called()
+    mock_factory.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_custom_analyze_rate_limited(client: AsyncClient, sample_transcript: str):
+    """Test anonymous clients are refused once they exceed the route's limit."""
+    rule = RateLimitRule(
+        name=f"test-{uuid.uuid4().hex}", method="POST", path_prefix="/api/v1/analyze/custom", per_minute=2, burst=2
+    )
+
+    with patch.object(request_limiter, "rules", [rule]), \
+            patch("app.routes.analyze.LLMProviderFactory.create") as mock_factory:
+        mock_response = MagicMock()
+        mock_response.content = "Summary"
+        mock_response.input_tokens = 10
+        mock_response.output_tokens = 5
+        mock_response.cost = 0.0
+        mock_response.model = "gemini-2.5-flash"
+        mock_provider = AsyncMock()
+        mock_provider.generate.return_value = mock_response
+        mock_factory.return_value = mock_provider
+
+        payload = {"transcript": sample_transcript, "task_name": "Summary", "prompt": "Summarize this"}
+        responses = [await client.post("/api/v1/analyze/custom", json=payload) for _ in range(3)]
+
+    assert [r.status_code for r in responses] == [200, 200, 429]
+    assert responses[0].headers["RateLimit-Limit"] == "2"
+    assert responses[0].headers["RateLimit-Remaining"] == "1"
+
+    refused = responses[2]
+    assert int(refused.headers["Retry-After"]) >= 1
+    assert refused.json()["detail"]["error"]["code"] == "rate_limited"
+    assert mock_provider.generate.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_keyed_by_user(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+):
+    """Test authenticated users have their own limit, separate from their IP."""
+    rule = RateLimitRule(
+        name=f"test-{uuid.uuid4().hex}", method=None, path_prefix="/api/v1/prompts", per_minute=1, burst=1
+    )
+
+    with patch.object(request_limiter, "rules", [rule]):
+        assert (await client.get("/api/v1/prompts", headers=auth_headers)).status_code == 200
+        assert (await client.get("/api/v1/prompts", headers=auth_headers)).status_code == 429
+        assert (await client.get("/api/v1/prompts")).status_code == 200
+
+
+@pytest_asyncio.fixture
+async def test_profile(db_session: AsyncSession) -> Profile:
+    """Create a published analysis profile."""
+    profile = Profile(
+        key="meetings",
+        name="Meetings",
+        status=ProfileStatus.PUBLISHED,
+        provider=LLMProvider.GEMINI,
+        model="gemini-2.5-flash",
+        prompts={
+            "system": "You are an expert at analyzing transcripts.",
+            "tasks": {"summary": "Summarize", "action_items": "List action items"},
+        },
+    )
+    db_session.add(profile)
+    await db_session.commit()
+    await db_session.refresh(profile)
+    return profile
+
+
+def _analysis_result() -> dict:
+    """Result in the shape AnalysisService returns."""
+    return {
+        "results": {"summary": "Summary", "action_items": "None"},
+        "metadata": {
+            "profile_key": "meetings",
+            "profile_version": 1,
+            "provider": "gemini",
+            "model": "gemini-2.5-flash",
+            "input_tokens": 100,
+            "output_tokens": 50,
+            "total_tokens": 150,
+            "total_cost": 0.0001,
+        },
+    }
+
+
+def _mock_llm_provider() -> AsyncMock:
+    """LLM provider answering every task."""
+    mock_response = MagicMock()
+    mock_response.content = "Summary"
+    mock_response.input_tokens = 100
+    mock_response.output_tokens = 50
+    mock_response.cost = 0.0001
+    mock_response.model = "gemini-2.5-flash"
+
+    mock_provider = AsyncMock()
+    mock_provider.provider_name = "gemini"
+    mock_provider.generate.return_value = mock_response
+    return mock_provider
+
+
+@pytest.mark.asyncio
+async def test_analyze_normalizes_transcript(
+    client: AsyncClient,
+    test_profile: Profile,
+):
+    """Test timestamps, fillers and repeated speakers are stripped before prompting."""
+    transcript = (
+        "[00:00] Alice: Um, welcome to the planning meeting.\n"
+        "[00:04] Alice: Let's, uh, start with the launch date.\n"
+        "[00:09] Bob: I think Q1 works."
+    )
+
+    with patch("app.services.analysis.LLMProviderFactory.create") as mock_factory:
+        mock_factory.return_value = _mock_llm_provider()
+
+        response = await client.post(
+            "/api/v1/analyze",
+            json={"transcript": transcript, "profile_key": "meetings"},
+        )
+
+    assert response.status_code == 200
+    prompt = mock_factory.return_value.generate.call_args.kwargs["prompt"]
+    assert (
+        "Alice: welcome to the planning meeting. Let's, start with the launch date.\n"
+        "Bob: I think Q1 works."
+    ) in prompt
+
+    report = response.json()["metadata"]["normalization"]
+    assert report["original_chars"] == len(transcript)
+    assert report["normalized_chars"] < report["original_chars"]
+    assert report["token_reduction"] > 0
+
+
+@pytest.mark.asyncio
+async def test_analyze_normalization_keeps_meaningful_text(
+    client: AsyncClient,
+    test_profile: Profile,
+):
+    """Test "you know" in a question and a time at the start of a line are kept."""
+    transcript = "Alice: Do you know, Bob, where the file is?\n10:30 works for me."
+
+    with patch("app.services.analysis.LLMProviderFactory.create") as mock_factory:
+        mock_factory.return_value = _mock_llm_provider()
+
+        response = await client.post(
+            "/api/v1/analyze",
+            json={"transcript": transcript, "profile_key": "meetings"},
+        )
+
+    assert response.status_code == 200
+    prompt = mock_factory.return_value.generate.call_args.kwargs["prompt"]
+    assert "Alice: Do you know, Bob, where the file is? 10:30 works for me." in prompt
+
+
+@pytest.mark.asyncio
+async def test_analyze_aliases_speakers(
+    client: AsyncClient,
+    test_profile: Profile,
+):
+    """Test profile analyses alias speakers after normalizing and restore names."""
+    provider = _mock_llm_provider()
+    provider.generate.return_value.content = "S1 asked for the roadmap."
+
+    with patch("app.services.analysis.LLMProviderFactory.create", return_value=provider):
+        response = await client.post(
+            "/api/v1/analyze",
+            json={"transcript": MEETING, "profile_key": "meetings"},
+        )
+
+    assert response.status_code == 200
+    assert "S1: Let's review the launch plan." in provider.generate.call_args.kwargs["prompt"]
+
+    data = response.json()
+    assert data["metadata"]["speaker_aliases"] == {"S1": "Sarah Johnson", "S2": "Mike"}
+    assert set(data["results"].values()) == {"Sarah Johnson asked for the roadmap."}
+
+
+@pytest.mark.asyncio
+async def test_analyze_normalization_disabled_for_profile(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    test_profile: Profile,
+    sample_transcript: str,
+):
+    """Test profiles can send transcripts as-is."""
+    test_profile.normalization = {"enabled": False}
+    await db_session.commit()
+
+    with patch("app.services.analysis.LLMProviderFactory.create") as mock_factory:
+        mock_factory.return_value = _mock_llm_provider()
+
+        response = await client.post(
+            "/api/v1/analyze",
+            json={"transcript": sample_transcript, "profile_key": "meetings"},
+        )
+
+    assert response.status_code == 200
+    assert sample_transcript.strip() in mock_factory.return_value.generate.call_args.kwargs["prompt"]
+    assert response.json()["metadata"]["normalization"] is None
+
+
+@pytest.mark.asyncio
+async def test_analyze_aliases_speakers_without_normalization(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    test_profile: Profile,
+):
+    """Test turning normalization off for a profile keeps speaker aliasing."""
+    test_profile.normalization = {"enabled": False}
+    await db_session.commit()
+
+    with patch("app.services.analysis.LLMProviderFactory.create") as mock_factory:
+        mock_factory.return_value = _mock_llm_provider()
+
+        response = await client.post(
+            "/api/v1/analyze",
+            json={"transcript": MEETING, "profile_key": "meetings"},
+        )
+
+    assert response.status_code == 200
+    assert "S1: Let's review the launch plan." in mock_factory.return_value.generate.call_args.kwargs["prompt"]
+    metadata = response.json()["metadata"]
+    assert metadata["normalization"] is None
+    assert metadata["speaker_aliases"] == {"S1": "Sarah Johnson", "S2": "Mike"}
+
+
+@pytest.mark.asyncio
+async def test_analyze_small_transcript_inline(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_profile: Profile,
+    sample_transcript: str,
+):
+    """Test small analyses are answered inline."""
+    with patch("app.routes.analyze.AnalysisService") as mock_service, \
+            patch("app.routes.analyze.QueueService") as mock_queue:
+        mock_service.return_value.analyze_transcript = AsyncMock(return_value=_analysis_result())
+
+        response = await client.post(
+            "/api/v1/analyze",
+            headers=auth_headers,
+            json={"transcript": sample_transcript, "profile_key": "meetings"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["results"]["summary"] == "Summary"
+    mock_queue.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_analyze_large_transcript_queued(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+    test_profile: Profile,
+    sample_transcript: str,
+):
+    """Test analyses above the work threshold are queued as jobs."""
+    with patch("app.routes.analyze.settings.ANALYZE_ASYNC_THRESHOLD_CHARS", len(sample_transcript)), \
+            patch("app.routes.analyze.AnalysisService") as mock_service, \
+            patch("app.routes.analyze.QueueService") as mock_queue:
+        mock_queue.return_value.enqueue_analysis.side_effect = lambda **kwargs: MagicMock(id=kwargs["job_id"])
+
+        response = await client.post(
+            "/api/v1/analyze",
+            headers=auth_headers,
+            json={"transcript": sample_transcript, "profile_key": "meetings"},
+        )
+
+    assert response.status_code == 202
+    data = response.json()
+    assert data["status"] == "queued"
+    assert response.headers["Location"] == f"/api/v1/jobs/{data['job_id']}"
+    assert "Preference-Applied" not in response.headers
+    mock_service.assert_not_called()
+
+    kwargs = mock_queue.return_value.enqueue_analysis.call_args.kwargs
+    assert kwargs["tasks"] == test_profile.prompts["tasks"]
+    assert kwargs["model"] == "gemini-2.5-flash"
+    assert kwargs["normalization"]["strip_timestamps"] is True
+    assert kwargs["user_id"] == str(test_user.id)
+
+
+@pytest.mark.asyncio
+async def test_analyze_prefer_respond_async(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_profile: Profile,
+    sample_transcript: str,
+):
+    """Test Prefer: respond-async queues even small analyses."""
+    with patch("app.routes.analyze.QueueService") as mock_queue:
+        mock_queue.return_value.enqueue_analysis.side_effect = lambda **kwargs: MagicMock(id=kwargs["job_id"])
+
+        response = await client.post(
+            "/api/v1/analyze",
+            headers={**auth_headers, "Prefer": "respond-async, wait=10"},
+            json={"transcript": sample_transcript, "profile_key": "meetings"},
+        )
+
+    assert response.status_code == 202
+    assert response.headers["Preference-Applied"] == "respond-async"
+
+
+@pytest.mark.asyncio
+async def test_analyze_prefer_respond_sync(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_profile: Profile,
+    sample_transcript: str,
+):
+    """Test Prefer: respond-sync answers inline above the threshold."""
+    with patch("app.routes.analyze.settings.ANALYZE_ASYNC_THRESHOLD_CHARS", 1), \
+            patch("app.routes.analyze.AnalysisService") as mock_service, \
+            patch("app.routes.analyze.QueueService") as mock_queue:
+        mock_service.return_value.analyze_transcript = AsyncMock(return_value=_analysis_result())
+
+        response = await client.post(
+            "/api/v1/analyze",
+            headers={**auth_headers, "Prefer": "respond-sync"},
+            json={"transcript": sample_transcript, "profile_key": "meetings"},
+        )
+
+    assert response.status_code == 200
+    mock_queue.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_analyze_respond_async_without_auth(
+    client: AsyncClient,
+    test_profile: Profile,
+    sample_transcript: str,
+):
+    """Test background analysis requires authentication."""
+    response = await client.post(
+        "/api/v1/analyze",
+        headers={"Prefer": "respond-async"},
+        json={"transcript": sample_transcript, "profile_key": "meetings"},
+    )
+
+    assert response.status_code == 401
+    assert response.json()["detail"]["error"]["code"] == "authentication_required"
+
+
+@pytest.mark.asyncio
+async def test_analyze_invalid_token_served_as_anonymous(
+    client: AsyncClient,
+    test_profile: Profile,
+    sample_transcript: str,
+):
+    """Test a stale token falls back to anonymous inline analysis."""
+    headers = {"Authorization": "Bearer expired-or-invalid"}
+
+    with patch("app.routes.analyze.AnalysisService") as mock_service, \
+            patch("app.routes.analyze.QueueService") as mock_queue:
+        mock_service.return_value.analyze_transcript = AsyncMock(return_value=_analysis_result())
+
+        response = await client.post(
+            "/api/v1/analyze",
+            headers=headers,
+            json={"transcript": sample_transcript, "profile_key": "meetings"},
+        )
+        queued = await client.post(
+            "/api/v1/analyze",
+            headers={**headers, "Prefer": "respond-async"},
+            json={"transcript": sample_transcript, "profile_key": "meetings"},
+        )
+
+    assert response.status_code == 200
+    assert queued.status_code == 401
+    assert queued.json()["detail"]["error"]["code"] == "authentication_required"
+    mock_queue.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_profile_cache_reuses_published_profile(
+    db_session: AsyncSession,
+    test_profile: Profile,
+):
+    """Test published profiles are served from the cache."""
+    cached = await profile_cache.get("meetings", db_session)
+
+    # A write that bypasses the ORM isn't seen until the entry expires
+    await db_session.execute(update(Profile).values(model="gemini-2.5-pro"))
+
+    assert (await profile_cache.get("meetings", db_session)) is cached
+    assert cached.model == "gemini-2.5-flash"
+
+
+@pytest.mark.asyncio
+async def test_profile_cache_invalidated_on_commit(
+    db_session: AsyncSession,
+    test_profile: Profile,
+):
+    """Test committing a profile change invalidates its cache entry."""
+    await profile_cache.get("meetings", db_session)
+
+    test_profile.model = "gemini-2.5-pro"
+    await db_session.commit()
+
+    profile = await profile_cache.get("meetings", db_session)
+    assert profile.model == "gemini-2.5-pro"
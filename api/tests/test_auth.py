@@ -1,11 +1,16 @@
 """Tests for authentication endpoints."""
 
+import threading
+
 import pytest
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from unittest.mock import patch
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, update
 
-from app.models.user import User
+from app.models.user import User, SubscriptionTier
+from app.utils.auth import create_access_token, decode_token, pwd_context, verify_password
+from app.utils.auth_cache import decode_token_cached, load_user, token_cache, user_cache
 
 
 @pytest.mark.asyncio
@@ -132,6 +137,49 @@ async def test_user_login_invalid_password(client: AsyncClient, test_user: User)
     assert "detail" in data
 
 
+@pytest.mark.asyncio
+async def test_login_hashes_off_event_loop(client: AsyncClient, test_user: User):
+    """Test bcrypt runs in the hashing thread pool."""
+    threads = []
+
+    def verify_and_update(secret, hashed):
+        threads.append(threading.current_thread().name)
+        return pwd_context.handler("bcrypt").verify(secret, hashed), None
+
+    with patch.object(pwd_context, "verify_and_update", side_effect=verify_and_update):
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": "test@example.com", "password": "testpass123"},
+        )
+
+    assert response.status_code == 200
+    assert len(threads) == 1
+    assert threads[0].startswith("password-hash")
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_weak_hash(
+    client: AsyncClient, test_user: User, db_session: AsyncSession
+):
+    """Test hashes with fewer rounds than BCRYPT_ROUNDS are replaced at login."""
+    weak_hash = pwd_context.handler("bcrypt").using(rounds=4).hash("testpass123")
+    await db_session.execute(
+        update(User).where(User.id == test_user.id).values(hashed_password=weak_hash)
+    )
+    await db_session.commit()
+
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": "test@example.com", "password": "testpass123"},
+    )
+
+    assert response.status_code == 200
+    await db_session.refresh(test_user)
+    assert test_user.hashed_password != weak_hash
+    assert not pwd_context.needs_update(test_user.hashed_password)
+    assert verify_password("testpass123", test_user.hashed_password)
+
+
 @pytest.mark.asyncio
 async def test_user_login_inactive_account(
     client: AsyncClient, test_user: User, db_session: AsyncSession
@@ -252,3 +300,53 @@ async def test_password_reset_confirm_weak_password(client: AsyncClient, test_us
     data = response.json()
     assert "detail" in data
     assert "8 characters" in data["detail"].lower()
+
+
+@pytest.mark.asyncio
+async def test_auth_user_cache_skips_query(db_engine, test_user: User):
+    """Test a cached user is served without reading the database."""
+    user_cache.invalidate()
+    sessions = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with sessions() as session:
+        await load_user(session, str(test_user.id))
+        # A write that bypasses the ORM isn't seen until the entry expires
+        await session.execute(update(User).values(display_name="Renamed"))
+        await session.commit()
+
+    async with sessions() as session:
+        user = await load_user(session, str(test_user.id))
+
+    assert user.id == test_user.id
+    assert user.display_name != "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_auth_user_cache_invalidated_on_commit(db_engine, test_user: User):
+    """Test committing a change to a user drops its cache entry."""
+    user_cache.invalidate()
+    sessions = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with sessions() as session:
+        user = await load_user(session, str(test_user.id))
+        user.subscription_tier = SubscriptionTier.PRO
+        await session.commit()
+
+    async with sessions() as session:
+        user = await load_user(session, str(test_user.id))
+
+    assert user.subscription_tier == SubscriptionTier.PRO
+
+
+def test_token_verification_cached():
+    """Test a token is only verified once while cached."""
+    token_cache.invalidate()
+    token = create_access_token({"sub": "cached-user"})
+
+    with patch("app.utils.auth_cache.decode_token", wraps=decode_token) as mock_decode:
+        first = decode_token_cached(token)
+        second = decode_token_cached(token)
+
+    assert first == second
+    assert first["sub"] == "cached-user"
+    mock_decode.assert_called_once_with(token)
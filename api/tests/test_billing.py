@@ -1,10 +1,19 @@
 """Tests for billing and subscription endpoints."""
 
+import hashlib
+import hmac
+import json
+import time
+
 import pytest
 from httpx import AsyncClient
 from unittest.mock import MagicMock, patch
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.settings import get_settings
+from app.models.stripe_event import StripeEvent
 from app.models.user import User, SubscriptionTier
+from app.services.billing_events import process_event, record_event
 
 
 @pytest.mark.asyncio
@@ -167,3 +176,100 @@ async def test_cancel_subscription_without_auth(client: AsyncClient):
     response = await client.post("/api/v1/billing/cancel-subscription")
 
     assert response.status_code == 403
+
+
+WEBHOOK_SECRET = "whsec_test"
+
+
+def _checkout_completed(user: User, event_id: str = "evt_test_123") -> dict:
+    """Stripe checkout.session.completed event for a user."""
+    return {
+        "id": event_id,
+        "object": "event",
+        "type": "checkout.session.completed",
+        "data": {
+            "object": {
+                "id": "cs_test_123",
+                "object": "checkout.session",
+                "customer": "cus_test_123",
+                "subscription": "sub_test_123",
+                "metadata": {"user_id": str(user.id)},
+            }
+        },
+    }
+
+
+async def _post_webhook(client: AsyncClient, event: dict):
+    """Post an event to the webhook with a valid Stripe signature."""
+    body = json.dumps(event).encode()
+    timestamp = int(time.time())
+    signature = hmac.new(
+        WEBHOOK_SECRET.encode(), f"{timestamp}.".encode() + body, hashlib.sha256
+    ).hexdigest()
+
+    with patch.object(get_settings(), "STRIPE_WEBHOOK_SECRET", WEBHOOK_SECRET):
+        return await client.post(
+            "/api/v1/billing/webhook",
+            content=body,
+            headers={"stripe-signature": f"t={timestamp},v1={signature}"},
+        )
+
+
+@pytest.mark.asyncio
+async def test_webhook_stores_and_queues_event(
+    client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test verified events are stored and left to the worker."""
+    with patch("app.routes.billing.QueueService") as mock_queue_service:
+        response = await _post_webhook(client, _checkout_completed(test_user))
+
+    assert response.status_code == 200
+    mock_queue_service.return_value.enqueue_stripe_event.assert_called_once_with("evt_test_123")
+
+    stored = await db_session.get(StripeEvent, "evt_test_123")
+    assert stored.type == "checkout.session.completed"
+    assert stored.processed_at is None
+
+    # Applied by the worker, not the webhook
+    await db_session.refresh(test_user)
+    assert test_user.subscription_tier == SubscriptionTier.FREE
+
+
+@pytest.mark.asyncio
+async def test_webhook_redelivery_not_queued_again(
+    client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test a redelivered event that was already processed is only acknowledged."""
+    event = _checkout_completed(test_user)
+    await record_event(db_session, event)
+    await process_event(db_session, event["id"])
+
+    with patch("app.routes.billing.QueueService") as mock_queue_service:
+        response = await _post_webhook(client, event)
+
+    assert response.status_code == 200
+    mock_queue_service.return_value.enqueue_stripe_event.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_process_stripe_event_applies_once(
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test processing upgrades the user, and repeated processing does nothing."""
+    event = _checkout_completed(test_user)
+    assert await record_event(db_session, event) is True
+
+    assert await process_event(db_session, event["id"]) == str(test_user.id)
+    await db_session.refresh(test_user)
+    assert test_user.subscription_tier == SubscriptionTier.PRO
+    assert test_user.stripe_customer_id == "cus_test_123"
+
+    assert await process_event(db_session, event["id"]) is None
+    assert await record_event(db_session, event) is False
+    stored = await db_session.get(StripeEvent, event["id"])
+    assert stored.attempts == 1
@@ -0,0 +1,161 @@
+"""Tests for email delivery."""
+
+import asyncio
+from contextlib import ExitStack
+
+import aiosmtplib
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.config.settings import get_settings
+from app.models.user import User
+from app.utils.mailer import Mailer, build_message
+
+
+class SMTPStandIn:
+    """Minimal local SMTP server recording the sessions and emails it gets."""
+
+    def __init__(self):
+        self.sessions = 0
+        self.messages = []
+        self.data_replies = []  # Replies to the next DATA commands (default "250 OK")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.sessions += 1
+        writer.write(b"220 localhost ESMTP\r\n")
+
+        while line := await reader.readline():
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                writer.write(b"250 localhost\r\n")
+            elif command == "DATA":
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                await writer.drain()
+                data = []
+                while (data_line := await reader.readline()) != b".\r\n":
+                    data.append(data_line)
+                reply = self.data_replies.pop(0) if self.data_replies else "250 OK"
+                if reply.startswith("250"):
+                    self.messages.append(b"".join(data).decode())
+                writer.write(f"{reply}\r\n".encode())
+            elif command == "QUIT":
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+
+        writer.close()
+
+
+@pytest_asyncio.fixture
+async def smtp_server():
+    """Run an SMTP stand-in and point the mailer at it."""
+    stand_in = SMTPStandIn()
+    server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    settings = get_settings()
+    with ExitStack() as stack:
+        for name, value in {
+            "PURELYMAIL_SMTP_HOST": "127.0.0.1",
+            "PURELYMAIL_SMTP_PORT": port,
+            "PURELYMAIL_SMTP_STARTTLS": False,
+            "PURELYMAIL_SMTP_USER": None,
+            "PURELYMAIL_SMTP_PASS": None,
+            "EMAIL_RETRY_BACKOFF_SECONDS": 0.0,
+        }.items():
+            stack.enter_context(patch.object(settings, name, value))
+        yield stand_in
+
+    server.close()
+    await server.wait_closed()
+
+
+def _message(to_email: str):
+    return build_message(to_email, "Hello", "<p>Hello</p>", "Hello")
+
+
+@pytest.mark.asyncio
+async def test_emails_sent_over_one_session(smtp_server: SMTPStandIn):
+    """Test queued emails are batched over one SMTP session."""
+    mailer = Mailer()
+    for i in range(3):
+        assert mailer.enqueue(_message(f"user{i}@example.com"))
+
+    await mailer.join()
+    await mailer.stop()
+
+    assert smtp_server.sessions == 1
+    assert len(smtp_server.messages) == 3
+    assert "To: user2@example.com" in smtp_server.messages[2]
+
+
+@pytest.mark.asyncio
+async def test_temporary_failure_retried(smtp_server: SMTPStandIn):
+    """Test 4xx replies are retried on a new session."""
+    smtp_server.data_replies = ["451 Try again later"]
+
+    mailer = Mailer()
+    mailer.enqueue(_message("user@example.com"))
+    await mailer.join()
+    await mailer.stop()
+
+    assert smtp_server.sessions == 2
+    assert len(smtp_server.messages) == 1
+
+
+@pytest.mark.asyncio
+async def test_permanent_failure_dropped(smtp_server: SMTPStandIn):
+    """Test 5xx replies drop only that email and keep the session."""
+    smtp_server.data_replies = ["550 No such user"]
+
+    mailer = Mailer()
+    mailer.enqueue(_message("missing@example.com"))
+    mailer.enqueue(_message("user@example.com"))
+    await mailer.join()
+    await mailer.stop()
+
+    assert smtp_server.sessions == 1
+    assert len(smtp_server.messages) == 1
+    assert "To: user@example.com" in smtp_server.messages[0]
+
+
+@pytest.mark.asyncio
+async def test_failed_login_closes_connection():
+    """Test a session whose login fails is closed instead of leaked."""
+    smtp = MagicMock(is_connected=True)
+    smtp.connect = AsyncMock()
+    smtp.login = AsyncMock(side_effect=aiosmtplib.SMTPAuthenticationError(535, "Authentication failed"))
+
+    settings = get_settings()
+    mailer = Mailer()
+    with patch("app.utils.mailer.aiosmtplib.SMTP", return_value=smtp), \
+            patch.object(settings, "PURELYMAIL_SMTP_USER", "sender@example.com"), \
+            patch.object(settings, "PURELYMAIL_SMTP_PASS", "wrong"):
+        with pytest.raises(aiosmtplib.SMTPAuthenticationError):
+            await mailer._connection()
+
+    smtp.close.assert_called_once()
+    assert mailer._smtp is None
+
+
+@pytest.mark.asyncio
+async def test_password_reset_request_queues_email(client: AsyncClient, test_user: User):
+    """Test password reset emails are queued instead of sent inline."""
+    mock_mailer = MagicMock()
+    mock_mailer.enqueue.return_value = True
+
+    with patch("app.utils.email_purelymail.mailer", mock_mailer):
+        response = await client.post(
+            "/api/v1/auth/password-reset/request",
+            json={"email": "test@example.com"},
+        )
+
+    assert response.status_code == 200
+    message = mock_mailer.enqueue.call_args.args[0]
+    assert message["To"] == "test@example.com"
+    assert "reset-password?token=" in message.get_body(("plain",)).get_content()
@@ -1,10 +1,18 @@
 """Tests for async job endpoints."""
 
+import uuid
+
 import pytest
+from datetime import datetime, timedelta, timezone
 from httpx import AsyncClient
-from unittest.mock import MagicMock, patch
+from rq.exceptions import NoSuchJobError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from app.models.job import Job, JobStatus
 from app.models.user import User
+from app.repositories.job_repository import JobRepository
 
 
 @pytest.mark.asyncio
@@ -21,6 +29,7 @@ async def test_create_analysis_job(
 
     with patch("app.routes.jobs.QueueService") as mock_queue_service:
         mock_queue_instance = MagicMock()
+        mock_queue_instance.claim_idempotency_key.return_value = None
         mock_queue_instance.enqueue_analysis.return_value = mock_job
         mock_queue_service.return_value = mock_queue_instance
 
@@ -48,6 +57,219 @@ async def test_create_analysis_job(
     assert "message" in data
     assert "queued" in data["message"].lower()
 
+    # Job is routed to the user's fair-scheduled sub-queue
+    enqueue_kwargs = mock_queue_instance.enqueue_analysis.call_args.kwargs
+    assert enqueue_kwargs["user_id"] == str(test_user.id)
+    assert enqueue_kwargs["tier"] == "free"
+
+
+@pytest.mark.asyncio
+async def test_create_analysis_job_replays_claimed_key(
+    client: AsyncClient,
+    auth_headers: dict,
+    sample_transcript: str,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test a duplicate submission returns the job holding the Redis claim."""
+    existing = Job(user_id=test_user.id, status=JobStatus.RUNNING)
+    db_session.add(existing)
+    await db_session.commit()
+
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = MagicMock()
+        mock_queue_instance.claim_idempotency_key.return_value = str(existing.id)
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.post(
+            "/api/v1/jobs/analyze",
+            headers={**auth_headers, "Idempotency-Key": "retry-1"},
+            json={
+                "transcript": sample_transcript,
+                "tasks": {"summary": "Provide a summary"},
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.headers["Idempotent-Replayed"] == "true"
+    data = response.json()
+    assert data["job_id"] == str(existing.id)
+    assert data["status"] == "running"
+    mock_queue_instance.enqueue_analysis.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_analysis_job_stale_claim_taken_over_once(
+    client: AsyncClient,
+    auth_headers: dict,
+    sample_transcript: str,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test a resubmission that loses the race for a stale claim replays the winner."""
+    stale = Job(user_id=test_user.id, status=JobStatus.FAILED)
+    db_session.add(stale)
+    await db_session.commit()
+    winner_id = str(uuid.uuid4())
+
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = MagicMock()
+        mock_queue_instance.claim_idempotency_key.return_value = str(stale.id)
+        mock_queue_instance.swap_idempotency_key.return_value = winner_id
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.post(
+            "/api/v1/jobs/analyze",
+            headers={**auth_headers, "Idempotency-Key": "retry-3"},
+            json={
+                "transcript": sample_transcript,
+                "tasks": {"summary": "Provide a summary"},
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.headers["Idempotent-Replayed"] == "true"
+    data = response.json()
+    assert data["job_id"] == winner_id
+    assert data["status"] == "queued"
+    assert mock_queue_instance.swap_idempotency_key.call_args.args[1] == str(stale.id)
+    mock_queue_instance.enqueue_analysis.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_analysis_job_replays_from_database(
+    client: AsyncClient,
+    auth_headers: dict,
+    sample_transcript: str,
+    test_user: User,
+):
+    """Test the Postgres row catches duplicates once the Redis claim is gone."""
+    payload = {
+        "transcript": sample_transcript,
+        "tasks": {"summary": "Provide a summary"},
+    }
+
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = MagicMock()
+        mock_queue_instance.claim_idempotency_key.return_value = None
+        mock_queue_instance.enqueue_analysis.side_effect = (
+            lambda **kwargs: MagicMock(id=kwargs["job_id"])
+        )
+        mock_queue_service.return_value = mock_queue_instance
+
+        first = await client.post("/api/v1/jobs/analyze", headers=auth_headers, json=payload)
+        second = await client.post("/api/v1/jobs/analyze", headers=auth_headers, json=payload)
+
+    assert first.status_code == 202
+    assert second.status_code == 200
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.json()["job_id"] == first.json()["job_id"]
+    assert mock_queue_instance.enqueue_analysis.call_count == 1
+
+    # Both submissions derived the same key
+    keys = {call.args[0] for call in mock_queue_instance.claim_idempotency_key.call_args_list}
+    assert len(keys) == 1
+
+
+@pytest.mark.asyncio
+async def test_create_analysis_job_resubmits_after_failure(
+    client: AsyncClient,
+    auth_headers: dict,
+    sample_transcript: str,
+    test_user: User,
+):
+    """Test a failed submission releases its key so a retry enqueues again."""
+    payload = {
+        "transcript": sample_transcript,
+        "tasks": {"summary": "Provide a summary"},
+    }
+    headers = {**auth_headers, "Idempotency-Key": "retry-2"}
+
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = MagicMock()
+        mock_queue_instance.claim_idempotency_key.return_value = None
+        mock_queue_instance.enqueue_analysis.side_effect = Exception("Redis unavailable")
+        mock_queue_service.return_value = mock_queue_instance
+
+        failed = await client.post("/api/v1/jobs/analyze", headers=headers, json=payload)
+
+        mock_queue_instance.enqueue_analysis.side_effect = None
+        mock_queue_instance.enqueue_analysis.return_value = MagicMock(id="test-job-456")
+
+        retried = await client.post("/api/v1/jobs/analyze", headers=headers, json=payload)
+
+    assert failed.status_code == 500
+    mock_queue_instance.release_idempotency_key.assert_called_once()
+    assert retried.status_code == 202
+    assert retried.json()["job_id"] == "test-job-456"
+
+
+@pytest.mark.asyncio
+async def test_create_off_peak_analysis_job(
+    client: AsyncClient,
+    auth_headers: dict,
+    sample_transcript: str,
+    test_user: User,
+):
+    """Test an off-peak job is scheduled at low priority."""
+    release_at = datetime.now(timezone.utc) + timedelta(hours=3)
+    mock_job = MagicMock()
+    mock_job.id = "test-job-123"
+
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = MagicMock()
+        mock_queue_instance.claim_idempotency_key.return_value = None
+        mock_queue_instance.off_peak.release_time.return_value = release_at
+        mock_queue_instance.enqueue_analysis.return_value = mock_job
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.post(
+            "/api/v1/jobs/analyze",
+            headers=auth_headers,
+            json={
+                "transcript": sample_transcript,
+                "tasks": {"summary": "Provide a summary"},
+                "priority": "high",
+                "off_peak": True,
+            },
+        )
+
+    assert response.status_code == 202
+    data = response.json()
+    assert data["status"] == "scheduled"
+    assert data["scheduled_for"] == release_at.isoformat()
+
+    enqueue_args = mock_queue_instance.enqueue_analysis.call_args
+    assert enqueue_args.kwargs["priority"] == "low"
+    assert enqueue_args.kwargs["release_at"] == release_at
+    assert enqueue_args.kwargs["off_peak"] is True
+
+
+@pytest.mark.asyncio
+async def test_create_analysis_job_not_before_too_late(
+    client: AsyncClient,
+    auth_headers: dict,
+    sample_transcript: str,
+):
+    """Test jobs can't be deferred beyond the configured limit."""
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = MagicMock()
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.post(
+            "/api/v1/jobs/analyze",
+            headers=auth_headers,
+            json={
+                "transcript": sample_transcript,
+                "tasks": {"summary": "Provide a summary"},
+                "not_before": (datetime.now(timezone.utc) + timedelta(days=365)).isoformat(),
+            },
+        )
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error"]["code"] == "invalid_not_before"
+    mock_queue_instance.enqueue_analysis.assert_not_called()
+
 
 @pytest.mark.asyncio
 async def test_create_analysis_job_without_auth(
@@ -69,6 +291,315 @@ async def test_create_analysis_job_without_auth(
     assert response.status_code == 403
 
 
+def _mock_async_queue_service():
+    """QueueService mock whose Redis reads are coroutines."""
+    mock_queue_instance = MagicMock()
+    for method in ("get_job_status", "get_job_statuses", "get_batch", "cancel_job"):
+        setattr(mock_queue_instance, method, AsyncMock())
+    return mock_queue_instance
+
+
+def _mock_bulk_queue_service(mock_queue_service):
+    """Configure a QueueService mock that accepts every claim."""
+    mock_queue_instance = MagicMock()
+    mock_queue_instance.claim_idempotency_keys.side_effect = (
+        lambda keys, job_ids, ttl: [None] * len(keys)
+    )
+    mock_queue_instance.swap_idempotency_keys.side_effect = (
+        lambda keys, expected, job_ids, ttl: [None] * len(keys)
+    )
+    mock_queue_service.return_value = mock_queue_instance
+    return mock_queue_instance
+
+
+@pytest.mark.asyncio
+async def test_create_bulk_analysis_jobs(
+    client: AsyncClient,
+    auth_headers: dict,
+    sample_transcript: str,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test submitting many transcripts in one request."""
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_bulk_queue_service(mock_queue_service)
+
+        response = await client.post(
+            "/api/v1/jobs/analyze/bulk",
+            headers=auth_headers,
+            json={
+                "tasks": {"summary": "Provide a summary"},
+                "items": [
+                    {"transcript": sample_transcript},
+                    {"transcript": sample_transcript + " More."},
+                    {"transcript": "Short call.", "tasks": {"actions": "List action items"}},
+                ],
+            },
+        )
+
+    assert response.status_code == 202
+    data = response.json()
+    assert data["batch_id"]
+    assert [job["index"] for job in data["jobs"]] == [0, 1, 2]
+    assert all(job["status"] == "queued" and not job["replayed"] for job in data["jobs"])
+
+    # One pipelined enqueue for the whole batch
+    mock_queue_instance.enqueue_analysis_many.assert_called_once()
+    enqueue_args = mock_queue_instance.enqueue_analysis_many.call_args
+    items = enqueue_args.args[0]
+    assert len(items) == 3
+    assert items[2]["tasks"] == {"actions": "List action items"}
+    assert enqueue_args.kwargs["batch_id"] == data["batch_id"]
+    assert enqueue_args.kwargs["batch_job_ids"] == [job["job_id"] for job in data["jobs"]]
+
+    job_count = await db_session.scalar(select(func.count()).select_from(Job))
+    assert job_count == 3
+
+
+@pytest.mark.asyncio
+async def test_create_bulk_analysis_jobs_validates_all_items(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+):
+    """Test every invalid item is reported and nothing is enqueued."""
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        response = await client.post(
+            "/api/v1/jobs/analyze/bulk",
+            headers=auth_headers,
+            json={
+                "items": [
+                    {"transcript": "No tasks anywhere."},
+                    {"transcript": "   ", "tasks": {"summary": "Summarize"}},
+                    {"transcript": "Fine.", "tasks": {"summary": "Summarize"}},
+                ],
+            },
+        )
+
+    assert response.status_code == 400
+    error = response.json()["detail"]["error"]
+    assert error["code"] == "invalid_bulk_request"
+    assert [item["index"] for item in error["items"]] == [0, 1]
+    mock_queue_service.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_bulk_analysis_jobs_replays_duplicates(
+    client: AsyncClient,
+    auth_headers: dict,
+    sample_transcript: str,
+    test_user: User,
+):
+    """Test resubmitting a batch replays the jobs it already created."""
+    payload = {
+        "tasks": {"summary": "Provide a summary"},
+        "items": [{"transcript": sample_transcript}, {"transcript": "Another call."}],
+    }
+
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_bulk_queue_service(mock_queue_service)
+
+        first = await client.post("/api/v1/jobs/analyze/bulk", headers=auth_headers, json=payload)
+        second = await client.post("/api/v1/jobs/analyze/bulk", headers=auth_headers, json=payload)
+
+    assert first.status_code == 202
+    assert second.status_code == 202
+    assert all(job["replayed"] for job in second.json()["jobs"])
+    assert [job["job_id"] for job in second.json()["jobs"]] == [
+        job["job_id"] for job in first.json()["jobs"]
+    ]
+    assert mock_queue_instance.enqueue_analysis_many.call_args.args[0] == []
+
+
+@pytest.mark.asyncio
+async def test_get_batch_status(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test aggregate batch status, falling back to Postgres for expired jobs."""
+    expired_job = Job(user_id=test_user.id, status=JobStatus.COMPLETED)
+    db_session.add(expired_job)
+    await db_session.commit()
+
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_async_queue_service()
+        mock_queue_instance.get_batch.return_value = {
+            "user_id": str(test_user.id),
+            "job_ids": ["job-1", "job-2", str(expired_job.id)],
+            "created_at": "2024-11-06T10:00:00+00:00",
+            "statuses": ["started", "queued", None],
+        }
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.get("/api/v1/jobs/batches/batch-123", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert data["counts"] == {"started": 1, "queued": 1, "finished": 1}
+    assert data["jobs"][2]["status"] == "finished"
+
+
+@pytest.mark.asyncio
+async def test_get_batch_status_other_user(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+):
+    """Test a batch is only visible to the user who submitted it."""
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_async_queue_service()
+        mock_queue_instance.get_batch.return_value = {
+            "user_id": "someone-else",
+            "job_ids": [],
+            "statuses": [],
+        }
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.get("/api/v1/jobs/batches/batch-123", headers=auth_headers)
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["error"]["code"] == "batch_not_found"
+
+
+@pytest.mark.asyncio
+async def test_get_job_statuses(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test bulk status, falling back to Postgres for expired jobs."""
+    expired = Job(user_id=test_user.id, status=JobStatus.COMPLETED, result={"results": {"summary": "Done"}})
+    db_session.add(expired)
+    await db_session.commit()
+
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_async_queue_service()
+        mock_queue_instance.get_job_statuses.return_value = {
+            "job-1": {"job_id": "job-1", "status": "started", "created_at": None, "started_at": None, "ended_at": None},
+        }
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.post(
+            "/api/v1/jobs/status",
+            headers=auth_headers,
+            json={"job_ids": ["job-1", str(expired.id), "missing"]},
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [job["job_id"] for job in data["jobs"]] == ["job-1", str(expired.id)]
+    assert data["jobs"][1]["status"] == "finished"
+    assert data["jobs"][1]["result"] is None  # Results only on request
+    assert data["not_found"] == ["missing"]
+
+    call = mock_queue_instance.get_job_statuses.call_args
+    assert call.args[0] == ["job-1", str(expired.id), "missing"]
+    assert call.kwargs["include_results"] is False
+    assert call.kwargs["user_id"] == str(test_user.id)
+
+
+@pytest.mark.asyncio
+async def test_get_job_statuses_with_results(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test bulk status includes persisted results when asked."""
+    expired = Job(user_id=test_user.id, status=JobStatus.COMPLETED, result={"results": {"summary": "Done"}})
+    db_session.add(expired)
+    await db_session.commit()
+
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_async_queue_service()
+        mock_queue_instance.get_job_statuses.return_value = {}
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.post(
+            "/api/v1/jobs/status",
+            headers=auth_headers,
+            json={"job_ids": [str(expired.id)], "include_results": True},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["jobs"][0]["result"] == {"results": {"summary": "Done"}}
+
+
+@pytest.mark.asyncio
+async def test_get_job_statuses_by_batch(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+):
+    """Test bulk status for every job in a batch."""
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_async_queue_service()
+        mock_queue_instance.get_batch.return_value = {
+            "user_id": str(test_user.id),
+            "job_ids": ["job-1", "job-2"],
+            "created_at": "2025-11-19T00:00:00+00:00",
+        }
+        mock_queue_instance.get_job_statuses.return_value = {
+            job_id: {"job_id": job_id, "status": "queued"} for job_id in ("job-1", "job-2")
+        }
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.post(
+            "/api/v1/jobs/status",
+            headers=auth_headers,
+            json={"batch_id": "batch-123"},
+        )
+
+    assert response.status_code == 200
+    assert [job["job_id"] for job in response.json()["jobs"]] == ["job-1", "job-2"]
+    mock_queue_instance.get_batch.assert_called_once_with("batch-123", include_statuses=False)
+
+
+@pytest.mark.asyncio
+async def test_get_job_statuses_other_users_batch(
+    client: AsyncClient,
+    pro_auth_headers: dict,
+    test_user: User,
+):
+    """Test bulk status doesn't expose another user's batch."""
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_async_queue_service()
+        mock_queue_instance.get_batch.return_value = {
+            "user_id": str(test_user.id),
+            "job_ids": ["job-1"],
+            "created_at": "2025-11-19T00:00:00+00:00",
+        }
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.post(
+            "/api/v1/jobs/status",
+            headers=pro_auth_headers,
+            json={"batch_id": "batch-123"},
+        )
+
+    assert response.status_code == 404
+    mock_queue_instance.get_job_statuses.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_job_statuses_requires_ids(
+    client: AsyncClient,
+    auth_headers: dict,
+):
+    """Test bulk status rejects an empty request."""
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_service.return_value = MagicMock()
+
+        response = await client.post("/api/v1/jobs/status", headers=auth_headers, json={})
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error"]["code"] == "invalid_status_request"
+
+
 @pytest.mark.asyncio
 async def test_get_job_status_queued(
     client: AsyncClient,
@@ -87,7 +618,7 @@ async def test_get_job_status_queued(
     }
 
     with patch("app.routes.jobs.QueueService") as mock_queue_service:
-        mock_queue_instance = MagicMock()
+        mock_queue_instance = _mock_async_queue_service()
         mock_queue_instance.get_job_status.return_value = mock_status
         mock_queue_service.return_value = mock_queue_instance
 
@@ -132,7 +663,7 @@ async def test_get_job_status_finished(
     }
 
     with patch("app.routes.jobs.QueueService") as mock_queue_service:
-        mock_queue_instance = MagicMock()
+        mock_queue_instance = _mock_async_queue_service()
         mock_queue_instance.get_job_status.return_value = mock_status
         mock_queue_service.return_value = mock_queue_instance
 
@@ -168,7 +699,7 @@ async def test_get_job_status_failed(
     }
 
     with patch("app.routes.jobs.QueueService") as mock_queue_service:
-        mock_queue_instance = MagicMock()
+        mock_queue_instance = _mock_async_queue_service()
         mock_queue_instance.get_job_status.return_value = mock_status
         mock_queue_service.return_value = mock_queue_instance
 
@@ -193,7 +724,7 @@ async def test_get_job_status_not_found(
 ):
     """Test getting status of non-existent job."""
     with patch("app.routes.jobs.QueueService") as mock_queue_service:
-        mock_queue_instance = MagicMock()
+        mock_queue_instance = _mock_async_queue_service()
         mock_queue_instance.get_job_status.side_effect = Exception("Job not found")
         mock_queue_service.return_value = mock_queue_instance
 
@@ -208,6 +739,120 @@ async def test_get_job_status_not_found(
     assert data["detail"]["error"]["code"] == "job_not_found"
 
 
+@pytest.mark.asyncio
+async def test_get_job_status_from_database(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test a job that has expired from Redis is served from Postgres."""
+    job = Job(user_id=test_user.id, status=JobStatus.QUEUED)
+    db_session.add(job)
+    await db_session.commit()
+
+    await JobRepository(db_session).mark_completed(
+        job,
+        {
+            "results": {"summary": "Meeting summary"},
+            "metadata": {"total_tokens": 150, "total_cost": 0.0002},
+        },
+        prompts=["Provide a summary"],
+    )
+
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_async_queue_service()
+        mock_queue_instance.get_job_status.side_effect = Exception("No such job")
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.get(f"/api/v1/jobs/{job.id}", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["job_id"] == str(job.id)
+    assert data["status"] == "finished"
+    assert data["ended_at"] is not None
+    assert data["result"]["results"]["summary"] == "Meeting summary"
+
+
+@pytest.mark.asyncio
+async def test_get_job_status_from_compressed_artifact(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test large results are stored as a compressed artifact and read back."""
+    job = Job(user_id=test_user.id, status=JobStatus.RUNNING)
+    db_session.add(job)
+    await db_session.commit()
+
+    long_summary = "Discussion of the roadmap. " * 500
+    await JobRepository(db_session).mark_completed(
+        job,
+        {"results": {"summary": long_summary}, "metadata": {"total_cost": 0.01}},
+        inline_max_bytes=1024,
+    )
+    assert job.result is None
+
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_async_queue_service()
+        mock_queue_instance.get_job_status.side_effect = Exception("No such job")
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.get(f"/api/v1/jobs/{job.id}", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["result"]["results"]["summary"] == long_summary
+
+
+@pytest.mark.asyncio
+async def test_cancelled_partial_result_stored_as_artifact(
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test a large partial result from a cancelled job is compressed like a completed one."""
+    job = Job(user_id=test_user.id, status=JobStatus.RUNNING)
+    db_session.add(job)
+    await db_session.commit()
+
+    repo = JobRepository(db_session)
+    long_summary = "Discussion of the roadmap. " * 500
+    await repo.mark_cancelled(
+        job,
+        {"results": {"summary": long_summary}, "metadata": {"total_cost": 0.01, "cancelled": True}},
+        inline_max_bytes=1024,
+    )
+
+    assert job.status == JobStatus.CANCELLED
+    assert job.result is None
+    assert float(job.cost) == 0.01
+    assert (await repo.get_result(job))["results"]["summary"] == long_summary
+
+
+@pytest.mark.asyncio
+async def test_get_job_status_other_users_job(
+    client: AsyncClient,
+    pro_auth_headers: dict,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test a persisted job is not visible to other users."""
+    job = Job(user_id=test_user.id, status=JobStatus.COMPLETED, result={"results": {}})
+    db_session.add(job)
+    await db_session.commit()
+
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_async_queue_service()
+        mock_queue_instance.get_job_status.side_effect = Exception("No such job")
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.get(f"/api/v1/jobs/{job.id}", headers=pro_auth_headers)
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["error"]["code"] == "job_not_found"
+
+
 @pytest.mark.asyncio
 async def test_get_job_status_without_auth(client: AsyncClient):
     """Test getting job status without authentication."""
@@ -224,7 +869,7 @@ async def test_cancel_job_success(
 ):
     """Test cancelling a queued job."""
     with patch("app.routes.jobs.QueueService") as mock_queue_service:
-        mock_queue_instance = MagicMock()
+        mock_queue_instance = _mock_async_queue_service()
         mock_queue_instance.cancel_job.return_value = True
         mock_queue_service.return_value = mock_queue_instance
 
@@ -247,7 +892,7 @@ async def test_cancel_job_already_running(
 ):
     """Test cancelling a job that's already running."""
     with patch("app.routes.jobs.QueueService") as mock_queue_service:
-        mock_queue_instance = MagicMock()
+        mock_queue_instance = _mock_async_queue_service()
         mock_queue_instance.cancel_job.return_value = False
         mock_queue_service.return_value = mock_queue_instance
 
@@ -262,6 +907,93 @@ async def test_cancel_job_already_running(
     assert data["detail"]["error"]["code"] == "cannot_cancel"
 
 
+@pytest.mark.asyncio
+async def test_cancel_running_job(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+):
+    """Test cancelling a running job requests a cooperative stop."""
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_async_queue_service()
+        mock_queue_instance.cancel_job.return_value = "cancelling"
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.delete(
+            "/api/v1/jobs/test-job-123",
+            headers=auth_headers,
+        )
+
+    assert response.status_code == 200
+    assert "cancellation requested" in response.json()["message"].lower()
+
+
+@pytest.mark.asyncio
+async def test_cancel_queued_job_marks_database_row(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test cancelling a queued job records the cancellation in Postgres."""
+    job = Job(user_id=test_user.id, status=JobStatus.QUEUED, idempotency_key="abc")
+    db_session.add(job)
+    await db_session.commit()
+
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_async_queue_service()
+        mock_queue_instance.cancel_job.return_value = "cancelled"
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.delete(f"/api/v1/jobs/{job.id}", headers=auth_headers)
+
+    assert response.status_code == 200
+    await db_session.refresh(job)
+    assert job.status == JobStatus.CANCELLED
+    assert job.idempotency_key is None
+
+
+@pytest.mark.asyncio
+async def test_cancel_other_users_job(
+    client: AsyncClient,
+    pro_auth_headers: dict,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """Test users can't cancel each other's jobs."""
+    job = Job(user_id=test_user.id, status=JobStatus.RUNNING)
+    db_session.add(job)
+    await db_session.commit()
+
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_async_queue_service()
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.delete(f"/api/v1/jobs/{job.id}", headers=pro_auth_headers)
+
+    assert response.status_code == 404
+    mock_queue_instance.cancel_job.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cancel_job_without_row_checks_owner(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+):
+    """Test jobs without a Postgres row are only cancelled by their submitter."""
+    with patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = _mock_async_queue_service()
+        mock_queue_instance.cancel_job.side_effect = NoSuchJobError("No such job: billing-job")
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.delete("/api/v1/jobs/billing-job", headers=auth_headers)
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["error"]["code"] == "job_not_found"
+    mock_queue_instance.cancel_job.assert_awaited_once_with("billing-job", user_id=str(test_user.id))
+
+
 @pytest.mark.asyncio
 async def test_cancel_job_without_auth(client: AsyncClient):
     """Test cancelling job without authentication."""
@@ -0,0 +1,220 @@
+"""Tests for transcript upload endpoints."""
+
+import io
+import json
+import zipfile
+
+import pytest
+from httpx import AsyncClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.config.settings import get_settings
+from app.models.user import User
+from app.utils.transcript_parser import _paragraph_text
+from app.utils.transcript_store import StoredTranscript
+
+SRT = """1
+00:00:01,000 --> 00:00:04,000
+Alice: Welcome to the planning meeting.
+
+2
+00:00:04,500 --> 00:00:07,000
+Bob: Thanks. Let's start with
+the <i>launch date</i>.
+"""
+
+VTT = """WEBVTT
+
+NOTE recorded on Monday
+
+intro
+00:00:01.000 --> 00:00:04.000
+<v Alice>Welcome to the planning meeting.
+
+00:00:04.500 --> 00:00:07.000
+<v Bob>Let&apos;s start with the launch date.
+"""
+
+
+def _docx(*paragraphs: str, compression: int = zipfile.ZIP_STORED) -> bytes:
+    """Build a minimal .docx file."""
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = "".join(f"<w:p><w:r><w:t>{p}</w:t></w:r></w:p>" for p in paragraphs)
+    document = f'<?xml version="1.0"?><w:document xmlns:w="{ns}"><w:body>{body}</w:body></w:document>'
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as archive:
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+async def _upload(client: AsyncClient, content: bytes, filename: str, headers: dict = None):
+    """Upload a file and return (response, stored text)."""
+    save = AsyncMock(side_effect=lambda text, fmt, name, owner: StoredTranscript(
+        id="transcript-123", text=text, format=fmt, filename=name
+    ))
+    with patch("app.routes.transcripts.save_transcript", save):
+        response = await client.post(
+            "/api/v1/transcripts",
+            params={"filename": filename},
+            content=content,
+            headers=headers or {},
+        )
+    return response, save.call_args.args[0] if save.called else None
+
+
+@pytest.mark.asyncio
+async def test_upload_srt(client: AsyncClient):
+    """Test SRT uploads keep one line of text per cue."""
+    response, text = await _upload(client, SRT.encode(), "meeting.srt")
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["transcript_id"] == "transcript-123"
+    assert data["format"] == "srt"
+    assert text == "Alice: Welcome to the planning meeting.\nBob: Thanks. Let's start with the launch date."
+    assert data["characters"] == len(text)
+
+
+@pytest.mark.asyncio
+async def test_upload_vtt(client: AsyncClient):
+    """Test WebVTT voice tags become speaker labels and notes are dropped."""
+    response, text = await _upload(client, VTT.encode(), "meeting.vtt")
+
+    assert response.status_code == 201
+    assert text == "Alice: Welcome to the planning meeting.\nBob: Let's start with the launch date."
+
+
+@pytest.mark.asyncio
+async def test_upload_json_segments(client: AsyncClient):
+    """Test JSON segment lists are joined with speaker labels."""
+    segments = {"segments": [
+        {"speaker": "Alice", "text": "Welcome to the planning meeting."},
+        {"speaker": "Bob", "text": "Let's start with the launch date."},
+    ]}
+    response, text = await _upload(client, json.dumps(segments).encode(), "meeting.json")
+
+    assert response.status_code == 201
+    assert text == "Alice: Welcome to the planning meeting.\nBob: Let's start with the launch date."
+
+
+@pytest.mark.asyncio
+async def test_upload_docx(client: AsyncClient):
+    """Test .docx uploads keep paragraph text."""
+    content = _docx("Alice: Welcome to the planning meeting.", "Bob: Let's start with the launch date.")
+    response, text = await _upload(client, content, "meeting.docx")
+
+    assert response.status_code == 201
+    assert text == "Alice: Welcome to the planning meeting.\nBob: Let's start with the launch date."
+
+
+@pytest.mark.asyncio
+async def test_upload_docx_text_limit(client: AsyncClient):
+    """Test .docx extraction stops once the text passes the transcript limit."""
+    content = _docx(*["Alice: " + "a" * 93] * 2000, compression=zipfile.ZIP_DEFLATED)
+
+    with patch.object(get_settings(), "MAX_TRANSCRIPT_LENGTH", 5000), \
+            patch("app.utils.transcript_parser._paragraph_text", wraps=_paragraph_text) as paragraph_text:
+        response, text = await _upload(client, content, "meeting.docx")
+
+    assert response.status_code == 413
+    assert response.json()["detail"]["error"]["code"] == "transcript_too_large"
+    assert paragraph_text.call_count == 51  # 100 characters each
+    assert text is None
+
+
+@pytest.mark.asyncio
+async def test_upload_docx_corrupt_deflate_stream(client: AsyncClient):
+    """Test a .docx with a broken deflate stream is refused as invalid."""
+    content = bytearray(_docx("Alice: Welcome to the planning meeting.", compression=zipfile.ZIP_DEFLATED))
+    # First byte of the compressed data, after the 30-byte header and the name
+    content[30 + len("word/document.xml")] = 0xFF  # Reserved deflate block type
+
+    response, text = await _upload(client, bytes(content), "meeting.docx")
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error"]["code"] == "invalid_file"
+    assert text is None
+
+
+@pytest.mark.asyncio
+async def test_upload_too_large(client: AsyncClient):
+    """Test uploads are cut off once they exceed the size limit."""
+    with patch.object(get_settings(), "MAX_UPLOAD_SIZE_MB", 1):
+        response, text = await _upload(client, b"a" * (1024 * 1024 + 1), "meeting.txt")
+
+    assert response.status_code == 413
+    assert response.json()["detail"]["error"]["code"] == "file_too_large"
+    assert text is None
+
+
+@pytest.mark.asyncio
+async def test_upload_unsupported_format(client: AsyncClient):
+    """Test legacy .doc and unknown formats are refused."""
+    response, _ = await _upload(client, b"binary", "meeting.doc")
+    assert response.status_code == 415
+    assert ".docx" in response.json()["detail"]["error"]["message"]
+
+    response, _ = await _upload(client, b"binary", "meeting.exe")
+    assert response.status_code == 415
+    assert response.json()["detail"]["error"]["code"] == "unsupported_format"
+
+
+@pytest.mark.asyncio
+async def test_create_job_from_uploaded_transcript(
+    client: AsyncClient,
+    auth_headers: dict,
+    test_user: User,
+):
+    """Test jobs accept an uploaded transcript ID instead of the text."""
+    stored = StoredTranscript(
+        id="transcript-123",
+        text="Alice: Welcome to the planning meeting.",
+        format="srt",
+        owner_id=str(test_user.id),
+    )
+    mock_job = MagicMock()
+    mock_job.id = "test-job-123"
+
+    with patch("app.utils.transcript_store.load_transcript", AsyncMock(return_value=stored)) as mock_load, \
+            patch("app.routes.jobs.QueueService") as mock_queue_service:
+        mock_queue_instance = MagicMock()
+        mock_queue_instance.claim_idempotency_key.return_value = None
+        mock_queue_instance.enqueue_analysis.return_value = mock_job
+        mock_queue_service.return_value = mock_queue_instance
+
+        response = await client.post(
+            "/api/v1/jobs/analyze",
+            headers=auth_headers,
+            json={"transcript_id": "transcript-123", "tasks": {"summary": "Provide a summary"}},
+        )
+
+    assert response.status_code == 202
+    assert mock_load.await_args.args[0] == "transcript-123"
+    assert mock_queue_instance.enqueue_analysis.call_args.kwargs["transcript"] == stored.text
+
+
+@pytest.mark.asyncio
+async def test_analyze_unknown_transcript_id(client: AsyncClient):
+    """Test a missing or expired upload is a 404."""
+    with patch("app.utils.transcript_store.load_transcript", AsyncMock(return_value=None)):
+        response = await client.post(
+            "/api/v1/analyze",
+            json={"transcript_id": "missing", "profile_key": "meetings"},
+        )
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["error"]["code"] == "transcript_not_found"
+
+
+@pytest.mark.asyncio
+async def test_analyze_requires_one_transcript_source(client: AsyncClient, sample_transcript: str):
+    """Test transcript and transcript_id are mutually exclusive."""
+    response = await client.post(
+        "/api/v1/analyze",
+        json={"transcript": sample_transcript, "transcript_id": "transcript-123", "profile_key": "meetings"},
+    )
+    assert response.status_code == 422
+
+    response = await client.post("/api/v1/analyze", json={"profile_key": "meetings"})
+    assert response.status_code == 422
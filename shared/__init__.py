@@ -1,5 +1,15 @@
 """Shared utilities for ScriptRipper API and Worker."""
 
-from .analysis_engine import TranscriptAnalyzer, AnalysisResult
+from .analysis_engine import TranscriptAnalyzer, AnalysisResult, PreparedTranscript
+from .transcript_normalizer import NormalizationOptions, NormalizationReport, normalize_transcript
+from .speaker_aliases import SpeakerAliases
 
-__all__ = ["TranscriptAnalyzer", "AnalysisResult"]
+__all__ = [
+    "TranscriptAnalyzer",
+    "AnalysisResult",
+    "PreparedTranscript",
+    "NormalizationOptions",
+    "NormalizationReport",
+    "normalize_transcript",
+    "SpeakerAliases",
+]
@@ -1,10 +1,18 @@
 """Shared transcript analysis engine for API and Worker."""
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Optional, List
 from decimal import Decimal
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
 
+try:
+    from .speaker_aliases import SpeakerAliases
+    from .transcript_normalizer import NormalizationOptions, NormalizationReport, normalize_transcript
+except ImportError:
+    # Loaded as a top-level module, with shared/ on sys.path
+    from speaker_aliases import SpeakerAliases
+    from transcript_normalizer import NormalizationOptions, NormalizationReport, normalize_transcript
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,9 +23,68 @@ class AnalysisResult:
     metadata: Dict[str, Any]
 
 
+@dataclass
+class PreparedTranscript:
+    """Transcript as sent to the LLM, with the aliases to restore outputs."""
+    transcript: str
+    report: Optional[NormalizationReport] = None
+    aliases: SpeakerAliases = field(default_factory=SpeakerAliases)
+
+    def metadata(self) -> Dict[str, Any]:
+        """Normalization report and speaker aliases for analysis metadata."""
+        metadata = {}
+        if self.report is not None:
+            metadata["normalization"] = self.report.as_dict()
+        if self.aliases.aliases:
+            metadata["speaker_aliases"] = self.aliases.as_dict()
+        return metadata
+
+
 class TranscriptAnalyzer:
     """Shared analysis engine for processing transcripts with LLM providers."""
 
+    @staticmethod
+    def prepare_transcript(
+        transcript: str,
+        options: Optional[NormalizationOptions] = None,
+        participants: Optional[Iterable[str]] = None,
+    ) -> PreparedTranscript:
+        """
+        Normalize a transcript and alias its speakers before building prompts.
+
+        Aliases are chosen deterministically, so preparing the same
+        transcript again (e.g. on a job retry) gives the same aliases.
+
+        Args:
+            transcript: Raw transcript text
+            options: Normalization and aliasing options (None sends the
+                transcript as-is)
+            participants: Known participant names, aliased first
+
+        Returns:
+            PreparedTranscript with the text to send, the normalization
+            report and the speaker aliases
+        """
+        if options is None:
+            return PreparedTranscript(transcript=transcript)
+
+        # Strip timestamps, fillers and repeated speakers
+        report = None
+        if options.enabled:
+            transcript, report = normalize_transcript(transcript, options)
+            logger.info(
+                f"Normalized transcript: {report.original_chars:,} -> {report.normalized_chars:,} characters "
+                f"({report.token_reduction:.0%} fewer tokens)"
+            )
+
+        # Send speakers as S1, S2, ...; callers restore names in the outputs
+        aliases = SpeakerAliases()
+        if options.alias_speakers:
+            aliases = SpeakerAliases.build(transcript, participants)
+            transcript = aliases.apply(transcript)
+
+        return PreparedTranscript(transcript=transcript, report=report, aliases=aliases)
+
     @staticmethod
     async def analyze(
         llm_provider,
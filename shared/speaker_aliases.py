@@ -0,0 +1,131 @@
+"""Speaker label aliasing for API and Worker.
+
+In long meetings the same full names ("Sarah Johnson:") start thousands of
+turns, and every task pays for them again. Aliasing replaces each speaker
+label with a short ID (S1, S2, ...), adds a legend once at the top of the
+transcript, and restores the real names in the task outputs.
+
+Only labels that save more than their legend entry costs are aliased.
+Known participants (``TranscriptMetadata.participants``) are numbered
+first, in the order given, and the legend shows a participant's full name
+when the transcript only uses part of it. The alias prefix is chosen so it
+doesn't already occur in the transcript, so restoring never touches text
+the speakers wrote themselves.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+# Alias prefixes, tried in order until one doesn't occur in the transcript
+ALIAS_PREFIXES = ("S", "SP", "SPK", "SPEAKER")
+
+_LABEL = re.compile(r"^([^\W\d_][\w .'-]{0,40}?):(?=\s)", re.MULTILINE)
+
+
+@dataclass
+class SpeakerAliases:
+    """Mapping between speaker labels and their short IDs."""
+
+    aliases: Dict[str, str] = field(default_factory=dict)  # label -> alias
+    full_names: Dict[str, str] = field(default_factory=dict)  # label -> participant name, if longer
+
+    @classmethod
+    def build(cls, transcript: str, participants: Optional[Iterable[str]] = None) -> "SpeakerAliases":
+        """Choose aliases for a transcript's speaker labels.
+
+        Args:
+            transcript: Transcript text with "Name: text" turns
+            participants: Known participant names, numbered first
+
+        Returns:
+            Aliases (empty if aliasing wouldn't save anything)
+        """
+        counts = Counter(match.group(1).strip() for match in _LABEL.finditer(transcript))
+        if not counts:
+            return cls()
+
+        participants = [p.strip() for p in participants or [] if p and p.strip()]
+        full_names = {}
+        for label in counts:
+            name = next((p for p in participants if p == label or _is_part_of(label, p)), None)
+            if name is not None and name != label:
+                full_names[label] = name
+
+        # Participants in the order given, then everyone else by number of turns
+        def rank(label: str):
+            name = full_names.get(label, label)
+            position = participants.index(name) if name in participants else len(participants)
+            return (position, -counts[label])
+
+        prefix = next(
+            (p for p in ALIAS_PREFIXES if not re.search(rf"\b{p}\d+\b", transcript)),
+            ALIAS_PREFIXES[-1],
+        )
+
+        aliases = {}
+        for label in sorted(counts, key=rank):
+            alias = f"{prefix}{len(aliases) + 1}"
+            legend_cost = len(_legend_entry(alias, full_names.get(label, label)))
+            if counts[label] * (len(label) - len(alias)) > legend_cost:
+                aliases[label] = alias
+
+        return cls(aliases=aliases, full_names={k: v for k, v in full_names.items() if k in aliases})
+
+    def apply(self, transcript: str) -> str:
+        """Replace speaker labels with aliases and add the legend.
+
+        Args:
+            transcript: Transcript text
+
+        Returns:
+            Aliased transcript, or the transcript unchanged if there are no
+            aliases
+        """
+        if not self.aliases:
+            return transcript
+
+        def replace(match: re.Match) -> str:
+            alias = self.aliases.get(match.group(1).strip())
+            return f"{alias}:" if alias else match.group(0)
+
+        return f"{self.legend()}\n\n{_LABEL.sub(replace, transcript)}"
+
+    def legend(self) -> str:
+        """Legend mapping aliases to speakers, shown once above the transcript."""
+        entries = [_legend_entry(alias, self.full_names.get(label, label)) for label, alias in self.aliases.items()]
+        return "SPEAKERS:\n" + "\n".join(entries)
+
+    def restore(self, text: str) -> str:
+        """Put the real names back into a task output.
+
+        Args:
+            text: LLM output that may refer to speakers by alias
+
+        Returns:
+            Output with every alias replaced by its speaker's name
+        """
+        if not self.aliases or not text:
+            return text
+
+        names = {alias: self.full_names.get(label, label) for label, alias in self.aliases.items()}
+        # Longest first, so S12 isn't read as S1
+        pattern = re.compile(r"\b(" + "|".join(sorted(names, key=len, reverse=True)) + r")\b")
+        return pattern.sub(lambda match: names[match.group(1)], text)
+
+    def as_dict(self) -> Dict[str, str]:
+        """Alias -> speaker name, for response metadata."""
+        return {alias: self.full_names.get(label, label) for label, alias in self.aliases.items()}
+
+
+def _legend_entry(alias: str, name: str) -> str:
+    """One line of the legend."""
+    return f"{alias} = {name}"
+
+
+def _is_part_of(label: str, name: str) -> bool:
+    """Whether a label is some of a participant's name words ("Sarah" in "Sarah Johnson")."""
+    label_words: List[str] = label.lower().split()
+    name_words = name.lower().split()
+    return len(label_words) < len(name_words) and all(word in name_words for word in label_words)
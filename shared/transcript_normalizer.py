@@ -0,0 +1,234 @@
+"""Transcript normalization for API and Worker.
+
+Every task sends the whole transcript to the LLM, so text that carries no
+meaning is paid for once per task. Normalization runs before prompts are
+built and removes it:
+
+- timestamps (``[00:12]``, ``00:01:02,500 -->`` lines) and caption
+  numbering
+- filler words ("um", "uh", "you know", ...)
+- redundant whitespace and blank lines
+- repeated speaker labels, by merging consecutive turns of one speaker
+
+Token counts in the report are estimates (about 4 characters per token),
+so they compare the same way across providers.
+
+``alias_speakers`` isn't a step here: callers alias speaker labels after
+normalizing (see speaker_aliases), because they need the mapping to put
+the names back into the outputs.
+"""
+
+import math
+import re
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+# Removed when remove_fillers is on ("you know" only where it's set off as a filler)
+DEFAULT_FILLERS = ("um", "umm", "uh", "uhh", "uhm", "erm", "hmm", "mm", "mhm")
+
+# Characters per token used for the estimates
+CHARS_PER_TOKEN = 4
+
+_TIMING_LINE = re.compile(r"-->")
+_CAPTION_INDEX = re.compile(r"^\d+$")
+_TIME = r"\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d{1,3})?"
+_SPEAKER_LABEL = r"[A-Z][\w .'-]{0,40}?"
+# Only timestamp-shaped times: bracketed, hh:mm:ss, or followed by a speaker
+# label, so a line like "10:30 works for me" is left alone
+_LEADING_TIMESTAMP = re.compile(
+    rf"^(?:[\[(]{_TIME}[\])]|\d{{1,2}}:\d{{2}}:\d{{2}}(?:[.,]\d{{1,3}})?(?![\w:])"
+    rf"|\d{{1,2}}:\d{{2}}(?=\s*[-–]?\s*{_SPEAKER_LABEL}:\s))\s*[-–]?\s*"
+)
+_BRACKETED_TIMESTAMP = re.compile(rf"\s*[\[(]{_TIME}[\])]")
+# "you know" opening a clause, set off by commas on both sides, or trailing
+_YOU_KNOW = re.compile(
+    r"(?i)(?:^|(?<=[.?!;]\s))you know,\s*"
+    r"|,\s*you know,(?=\s)"
+    r"|,\s*you know(?=\s*[.?!]|\s*$)"
+)
+_SPEAKER = re.compile(rf"^({_SPEAKER_LABEL}):\s+(.*)$")
+_SPACES = re.compile(r"[ \t ]+")
+_ORPHAN_PUNCTUATION = re.compile(r"^[\s,;]+|(?<=[,;])\s*[,;]+|\s+(?=[,.?!;])")
+
+
+@dataclass(frozen=True)
+class NormalizationOptions:
+    """Which normalization steps to run."""
+
+    enabled: bool = True  # False skips every step below except alias_speakers
+    strip_timestamps: bool = True
+    remove_fillers: bool = True
+    collapse_whitespace: bool = True
+    merge_speaker_turns: bool = True
+    alias_speakers: bool = True  # Applied by the caller with SpeakerAliases
+    fillers: Tuple[str, ...] = DEFAULT_FILLERS
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "NormalizationOptions":
+        """Build options from a profile's JSON config, ignoring unknown keys.
+
+        Args:
+            config: e.g. ``{"remove_fillers": false}``; missing keys keep
+                their defaults
+
+        Returns:
+            Options
+        """
+        config = config or {}
+        values = {f.name: config[f.name] for f in fields(cls) if f.name in config}
+        if "fillers" in values:
+            values["fillers"] = tuple(values["fillers"])
+        return cls(**values)
+
+    def to_config(self) -> Dict[str, Any]:
+        """JSON-serializable form (for job arguments)."""
+        config = asdict(self)
+        config["fillers"] = list(self.fillers)
+        return config
+
+
+@dataclass
+class NormalizationReport:
+    """Size of a transcript before and after normalization."""
+
+    original_chars: int
+    normalized_chars: int
+    original_tokens: int  # Estimated
+    normalized_tokens: int  # Estimated
+
+    @property
+    def char_reduction(self) -> float:
+        """Fraction of characters removed."""
+        return 1 - self.normalized_chars / self.original_chars if self.original_chars else 0.0
+
+    @property
+    def token_reduction(self) -> float:
+        """Fraction of (estimated) tokens removed."""
+        return 1 - self.normalized_tokens / self.original_tokens if self.original_tokens else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Report for analysis metadata."""
+        return {
+            "original_chars": self.original_chars,
+            "normalized_chars": self.normalized_chars,
+            "original_tokens": self.original_tokens,
+            "normalized_tokens": self.normalized_tokens,
+            "char_reduction": round(self.char_reduction, 4),
+            "token_reduction": round(self.token_reduction, 4),
+        }
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in some text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def normalize_transcript(
+    transcript: str,
+    options: Optional[NormalizationOptions] = None,
+) -> Tuple[str, NormalizationReport]:
+    """Remove text from a transcript that costs tokens but carries no meaning.
+
+    Args:
+        transcript: Raw transcript text
+        options: Steps to run (all by default)
+
+    Returns:
+        Tuple of (normalized transcript, report)
+
+    Example:
+        >>> text, report = normalize_transcript(
+        ...     "[00:00] Alice: Um, welcome.\\n[00:04] Alice: Let's start."
+        ... )
+        >>> text
+        "Alice: welcome. Let's start."
+    """
+    options = options or NormalizationOptions()
+    lines = transcript.splitlines()
+
+    if options.strip_timestamps:
+        lines = _strip_timestamps(lines)
+    if options.remove_fillers and options.fillers:
+        filler = re.compile(
+            r"(?i)(?<![\w'])(?:" + "|".join(re.escape(word) for word in options.fillers) + r")(?![\w']),?"
+        )
+        lines = [_remove_fillers(line, filler) for line in lines]
+    if options.collapse_whitespace:
+        lines = [_SPACES.sub(" ", line).strip() for line in lines]
+        lines = [line for line in lines if line]
+    if options.merge_speaker_turns:
+        lines = _merge_turns(lines)
+
+    normalized = "\n".join(lines).strip()
+    report = NormalizationReport(
+        original_chars=len(transcript),
+        normalized_chars=len(normalized),
+        original_tokens=estimate_tokens(transcript),
+        normalized_tokens=estimate_tokens(normalized),
+    )
+    return normalized, report
+
+
+def _strip_timestamps(lines: List[str]) -> List[str]:
+    """Drop caption timings and numbering, and timestamps on each line."""
+    captions = any(_TIMING_LINE.search(line) for line in lines)
+
+    kept = []
+    for line in lines:
+        stripped = line.strip()
+        if captions and (
+            _TIMING_LINE.search(stripped)
+            or _CAPTION_INDEX.match(stripped)
+            or stripped.upper().startswith("WEBVTT")
+        ):
+            continue
+        line = _LEADING_TIMESTAMP.sub("", stripped)
+        kept.append(_BRACKETED_TIMESTAMP.sub("", line))
+    return kept
+
+
+def _remove_fillers(line: str, filler: re.Pattern) -> str:
+    """Remove fillers from a line and the punctuation they leave behind.
+
+    Returns an empty line if nothing but fillers was said.
+    """
+    speaker, text = None, line.strip()
+    match = _SPEAKER.match(text)
+    if match:
+        speaker, text = match.groups()
+
+    # Fillers first, so "Um, you know, ..." still opens the clause
+    cleaned = _YOU_KNOW.sub("", filler.sub("", text).strip())
+    if cleaned == text:
+        return line
+
+    # "Alice: , so" -> "Alice: so"
+    text = _ORPHAN_PUNCTUATION.sub("", cleaned).strip()
+    if not re.search(r"\w", text):
+        return ""
+    return f"{speaker}: {text}" if speaker else text
+
+
+def _merge_turns(lines: List[str]) -> List[str]:
+    """Merge consecutive lines of one speaker into a single turn.
+
+    Unlabelled lines continue the current speaker's turn.
+    """
+    merged: List[str] = []
+    speaker = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        match = _SPEAKER.match(stripped)
+        if match and match.group(1) == speaker:
+            merged[-1] = f"{merged[-1]} {match.group(2)}".rstrip()
+        elif match:
+            speaker = match.group(1)
+            merged.append(stripped)
+        elif speaker is not None:
+            merged[-1] = f"{merged[-1]} {stripped}"
+        else:
+            merged.append(stripped)
+    return merged
@@ -0,0 +1,134 @@
+"""RQ worker that dequeues per-user sub-queues in weighted-fair order."""
+
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from rq import Worker
+
+# Add API path for shared imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+
+from app.utils.off_peak import OffPeakScheduler
+from app.utils.scheduler import FairScheduler
+from app.utils.logger import setup_logger
+from app.utils.serializer import flush_compression_stats
+
+logger = setup_logger(__name__)
+
+
+class FairWorker(Worker):
+    """Worker that polls queues in the order chosen by FairScheduler.
+
+    The queues passed to the constructor (high, default, low) are still
+    registered with RQ and handled by its scheduler; per-user sub-queues are
+    discovered from Redis and re-ordered before every dequeue. While the
+    queues are idle, off-peak jobs are released ahead of schedule.
+    """
+
+    def __init__(
+        self,
+        *args,
+        scheduler: FairScheduler,
+        off_peak: Optional[OffPeakScheduler] = None,
+        **kwargs,
+    ):
+        """Initialize the worker.
+
+        Args:
+            *args: Positional arguments for rq.Worker
+            scheduler: Fair scheduler sharing the worker's Redis connection
+            off_peak: Off-peak scheduler for early releases (optional)
+            **kwargs: Keyword arguments for rq.Worker
+        """
+        super().__init__(*args, **kwargs)
+        self.fair_scheduler = scheduler
+        self.off_peak = off_peak
+
+    def release_off_peak_jobs(self) -> None:
+        """Release off-peak jobs early if the queues are nearly empty."""
+        if self.off_peak is None:
+            return
+
+        try:
+            self.off_peak.release_early(job_class=self.job_class, serializer=self.serializer)
+        except Exception as e:
+            logger.warning(f"Off-peak early release failed: {e}")
+
+    def refresh_queues(self) -> None:
+        """Re-order the dequeue list and release due and off-peak jobs."""
+        self.release_off_peak_jobs()
+        self._ordered_queues = self.fair_scheduler.ordered_queues(
+            job_class=self.job_class,
+            serializer=self.serializer,
+        )
+        self.fair_scheduler.enqueue_due_jobs(
+            job_class=self.job_class,
+            serializer=self.serializer,
+        )
+
+    def dequeue_job_and_maintain_ttl(
+        self, timeout: Optional[int], max_idle_time: Optional[int] = None
+    ):
+        """Dequeue the next job, refreshing the fair order while idle.
+
+        The blocking pop is capped at the scheduler's poll interval so that
+        sub-queues which become backlogged while the worker waits are picked
+        up without waiting for the full dequeue timeout.
+        """
+        if not self.fair_scheduler.enabled:
+            self.release_off_peak_jobs()
+            return super().dequeue_job_and_maintain_ttl(timeout, max_idle_time)
+
+        idle_since = time.monotonic()
+        while True:
+            self.refresh_queues()
+
+            # Burst mode: a single non-blocking pass
+            if timeout is None:
+                return super().dequeue_job_and_maintain_ttl(None, max_idle_time)
+
+            poll = self.fair_scheduler.poll_interval
+            result = super().dequeue_job_and_maintain_ttl(min(timeout, poll), poll)
+            if result is not None:
+                return result
+
+            if max_idle_time is not None and time.monotonic() - idle_since >= max_idle_time:
+                return None
+
+    def reorder_queues(self, reference_queue) -> None:
+        """Keep RQ's strategy only when fair scheduling is off.
+
+        With fair scheduling the order is rebuilt before every dequeue.
+        """
+        if not self.fair_scheduler.enabled:
+            super().reorder_queues(reference_queue)
+
+    def execute_job(self, job, queue) -> None:
+        """Charge the user for the job, run it, then free their slot."""
+        if self.fair_scheduler.enabled:
+            self.fair_scheduler.record_dequeue(
+                queue.name,
+                job_timeout=job.timeout or self.queue_class.DEFAULT_TIMEOUT,
+            )
+
+        try:
+            super().execute_job(job, queue)
+        finally:
+            if self.fair_scheduler.enabled:
+                self.fair_scheduler.release(queue.name)
+
+    def perform_job(self, job, queue) -> bool:
+        """Run the job in the work horse, then report its serialization counts.
+
+        The horse exits after the job, so counts for the result and meta it
+        wrote would be lost without a flush here.
+        """
+        try:
+            return super().perform_job(job, queue)
+        finally:
+            try:
+                flush_compression_stats(self.connection)
+            except Exception as e:
+                logger.warning(f"Failed to flush serializer stats: {e}")
@@ -8,14 +8,19 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from redis import Redis
-from rq import Worker, Queue, Connection
+from rq import Queue, Connection
 from dotenv import load_dotenv
 import sentry_sdk
 from sentry_sdk.integrations.rq import RqIntegration
 
 # Add API path for logger import
 sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+from app.utils.failures import move_to_dead_letter_queue
 from app.utils.logger import setup_logger
+from app.utils.off_peak import OffPeakScheduler
+from app.utils.scheduler import FairScheduler
+from app.utils.serializer import CompressedJSONSerializer
+from worker.fair_worker import FairWorker
 
 logger = setup_logger(__name__)
 
@@ -53,18 +58,26 @@ def main():
     # Connect to Redis
     redis_conn = Redis.from_url(redis_url)
 
-    # Listen to multiple queues in priority order
+    # Listen to multiple queues in priority order. Per-user sub-queues are
+    # discovered and ordered by the fair scheduler on every dequeue.
+    serializer = CompressedJSONSerializer
     queues = [
-        Queue('high', connection=redis_conn),    # Priority jobs
-        Queue('default', connection=redis_conn),  # Normal jobs
-        Queue('low', connection=redis_conn),      # Batch/background jobs
+        Queue('high', connection=redis_conn, serializer=serializer),    # Priority jobs
+        Queue('default', connection=redis_conn, serializer=serializer),  # Normal jobs
+        Queue('low', connection=redis_conn, serializer=serializer),      # Batch/background jobs
     ]
 
     logger.info(f"Listening to queues: {[q.name for q in queues]}")
 
     # Start worker
     with Connection(redis_conn):
-        worker = Worker(queues)
+        worker = FairWorker(
+            queues,
+            scheduler=FairScheduler(redis_conn),
+            off_peak=OffPeakScheduler(redis_conn),
+            serializer=serializer,
+            exception_handlers=[move_to_dead_letter_queue],
+        )
         logger.info("Worker started and listening for jobs...")
         worker.work(with_scheduler=True)
 
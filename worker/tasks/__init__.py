@@ -1,8 +1,10 @@
 """Worker tasks for background processing."""
 
 from .analysis import analyze_transcript_task, analyze_batch_task
+from .billing import process_stripe_event_task
 
 __all__ = [
     "analyze_transcript_task",
     "analyze_batch_task",
+    "process_stripe_event_task",
 ]
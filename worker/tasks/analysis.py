@@ -1,20 +1,148 @@
 """Analysis tasks for background transcript processing."""
 
+import json
 import sys
+import uuid
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Awaitable, Callable, Optional
 from decimal import Decimal
 import asyncio
 import sentry_sdk
+from rq import get_current_job
 
 # Add API path for shared imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "shared"))
 
+from app.config.database import standalone_session
+from app.config.settings import get_settings
+from app.repositories.job_repository import JobRepository
 from app.services.llm import LLMProviderFactory
+from app.utils.failures import FailureClass, classify_failure
 from app.utils.logger import setup_logger
+from app.utils.queue import CANCEL_KEY
+from analysis_engine import TranscriptAnalyzer
+from transcript_normalizer import NormalizationOptions
 
 logger = setup_logger(__name__)
 
+CHECKPOINT_KEY = "scriptripper:checkpoint:{job_id}"
+
+
+class TaskCheckpoint:
+    """Completed task results for the current RQ job, kept in Redis.
+
+    Each task's output is saved as soon as it finishes, so a retry after a
+    crash or timeout resumes with the remaining tasks instead of re-running
+    (and re-billing) the completed ones. Outside a worker (no current job)
+    the checkpoint is a no-op.
+    """
+
+    def __init__(self, rq_job=None):
+        """Initialize the checkpoint.
+
+        Args:
+            rq_job: RQ job being executed, if any
+        """
+        self.redis_conn = rq_job.connection if rq_job else None
+        self.key = CHECKPOINT_KEY.format(job_id=rq_job.id) if rq_job else None
+
+    @classmethod
+    def for_current_job(cls) -> "TaskCheckpoint":
+        """Checkpoint of the job this worker is executing."""
+        return cls(get_current_job())
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Get completed task entries keyed by task key."""
+        if not self.key:
+            return {}
+
+        return {
+            (key.decode() if isinstance(key, bytes) else key): json.loads(value)
+            for key, value in self.redis_conn.hgetall(self.key).items()
+        }
+
+    def save(self, task_key: str, entry: Dict[str, Any]) -> None:
+        """Record a completed task."""
+        if not self.key:
+            return
+
+        with self.redis_conn.pipeline() as pipe:
+            pipe.hset(self.key, task_key, json.dumps(entry))
+            pipe.expire(self.key, get_settings().JOB_CHECKPOINT_TTL_SECONDS)
+            pipe.execute()
+
+    def clear(self) -> None:
+        """Drop the checkpoint once the job has succeeded."""
+        if self.key:
+            self.redis_conn.delete(self.key)
+
+
+class JobCancelled(Exception):
+    """Raised inside an analysis when its job has been cancelled."""
+
+
+class JobCancellation:
+    """Cooperative cancellation for the current RQ job.
+
+    DELETE /jobs/{id} sets a Redis flag for running jobs. The flag is checked
+    before each task, and in-flight LLM calls are polled and cancelled as
+    soon as it appears, so the worker is freed without paying for the rest
+    of the call.
+    """
+
+    def __init__(self, rq_job=None):
+        """Initialize the cancellation check.
+
+        Args:
+            rq_job: RQ job being executed, if any
+        """
+        self.redis_conn = rq_job.connection if rq_job else None
+        self.key = CANCEL_KEY.format(job_id=rq_job.id) if rq_job else None
+        self.poll_interval = get_settings().JOB_CANCEL_POLL_SECONDS
+
+    @classmethod
+    def for_current_job(cls) -> "JobCancellation":
+        """Cancellation check for the job this worker is executing."""
+        return cls(get_current_job())
+
+    def requested(self) -> bool:
+        """Whether cancellation has been requested."""
+        return bool(self.key and self.redis_conn.exists(self.key))
+
+    def check(self) -> None:
+        """Raise JobCancelled if cancellation has been requested."""
+        if self.requested():
+            raise JobCancelled()
+
+    async def run(self, coro: Awaitable[Any]) -> Any:
+        """Await a coroutine, aborting it if the job is cancelled meanwhile.
+
+        Raises:
+            JobCancelled: If cancellation was requested before it finished
+        """
+        if not self.key:
+            return await coro
+
+        task = asyncio.ensure_future(coro)
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=self.poll_interval)
+            if done:
+                return task.result()
+
+            if self.requested():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                raise JobCancelled()
+
+    def clear(self) -> None:
+        """Drop the cancel flag once the job has stopped."""
+        if self.key:
+            self.redis_conn.delete(self.key)
+
 
 def analyze_transcript_task(
     transcript: str,
@@ -22,6 +150,7 @@ def analyze_transcript_task(
     model: str,
     system_prompt: str,
     tasks: Dict[str, str],
+    normalization: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """Background task: Analyze a transcript with multiple tasks.
 
@@ -33,6 +162,8 @@ def analyze_transcript_task(
         model: Model identifier
         system_prompt: System/context prompt
         tasks: Dictionary of {task_name: task_prompt}
+        normalization: Transcript normalization options
+            (NormalizationOptions.to_config()); None sends it as-is
 
     Returns:
         Dictionary with results and metadata
@@ -68,12 +199,16 @@ def analyze_transcript_task(
         })
 
         # Run async analysis in sync context
-        return asyncio.run(_analyze_async(
-            transcript=transcript,
-            provider=provider,
-            model=model,
-            system_prompt=system_prompt,
-            tasks=tasks,
+        return asyncio.run(_run_tracked(
+            lambda: _analyze_async(
+                transcript=transcript,
+                provider=provider,
+                model=model,
+                system_prompt=system_prompt,
+                tasks=tasks,
+                normalization=normalization,
+            ),
+            prompts=list(tasks.values()),
         ))
 
 
@@ -83,59 +218,96 @@ async def _analyze_async(
     model: str,
     system_prompt: str,
     tasks: Dict[str, str],
+    normalization: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """Internal async function to perform analysis."""
 
+    # Aliases are rebuilt the same way on retries, so checkpointed outputs restore too
+    options = NormalizationOptions.from_config(normalization) if normalization is not None else None
+    prepared = TranscriptAnalyzer.prepare_transcript(transcript, options)
+    transcript, aliases = prepared.transcript, prepared.aliases
+
     # Create LLM provider
     llm_provider = LLMProviderFactory.create(provider=provider, model=model)
 
+    # Resume from tasks completed by an earlier attempt
+    checkpoint = TaskCheckpoint.for_current_job()
+    completed = checkpoint.load()
+    if completed:
+        logger.info(f"Resuming from checkpoint: {len(completed)}/{len(tasks)} tasks done")
+
+    cancellation = JobCancellation.for_current_job()
+    cancelled = False
+
     # Track metrics
     total_input_tokens = 0
     total_output_tokens = 0
     total_cost = Decimal("0.00")
+    response_model = model
 
     # Execute each task
     results = {}
-    for task_name, task_prompt in tasks.items():
-        logger.debug(f"Processing task: {task_name}")
+    try:
+        for task_name, task_prompt in tasks.items():
+            entry = completed.get(task_name)
+
+            if entry is None:
+                cancellation.check()
+                logger.debug(f"Processing task: {task_name}")
 
-        # Build full prompt with transcript
-        full_prompt = f"""TRANSCRIPT:
+                # Build full prompt with transcript
+                full_prompt = f"""TRANSCRIPT:
 {transcript}
 
 TASK:
 {task_prompt}"""
 
-        # Generate response
-        response = await llm_provider.generate(
-            prompt=full_prompt.strip(),
-            system_prompt=system_prompt,
-            temperature=0.7,
-        )
-
-        # Store result
-        results[task_name] = response.content
-
-        # Accumulate metrics
-        total_input_tokens += response.input_tokens
-        total_output_tokens += response.output_tokens
-        if response.cost:
-            total_cost += Decimal(str(response.cost))
-
-        logger.debug(f"Completed {task_name}: {response.output_tokens} tokens")
-
-    logger.info(f"Analysis complete: ${float(total_cost):.4f}")
+                # Generate response (aborted if the job is cancelled)
+                response = await cancellation.run(llm_provider.generate(
+                    prompt=full_prompt.strip(),
+                    system_prompt=system_prompt,
+                    temperature=0.7,
+                ))
+
+                entry = _checkpoint_entry(response)
+                checkpoint.save(task_name, entry)
+
+                logger.debug(f"Completed {task_name}: {response.output_tokens} tokens")
+
+            # Store result (with real speaker names)
+            results[task_name] = aliases.restore(entry["content"])
+            response_model = entry["model"]
+
+            # Accumulate metrics (checkpointed tasks were billed too)
+            total_input_tokens += entry["input_tokens"]
+            total_output_tokens += entry["output_tokens"]
+            if entry["cost"]:
+                total_cost += Decimal(str(entry["cost"]))
+
+    except JobCancelled:
+        cancelled = True
+        logger.info(f"Analysis cancelled after {len(results)}/{len(tasks)} tasks")
+
+    else:
+        logger.info(f"Analysis complete: ${float(total_cost):.4f}")
+
+    checkpoint.clear()
+    cancellation.clear()
+
+    metadata = {
+        "provider": llm_provider.provider_name,
+        "model": response_model,
+        "input_tokens": total_input_tokens,
+        "output_tokens": total_output_tokens,
+        "total_tokens": total_input_tokens + total_output_tokens,
+        "total_cost": float(total_cost),
+        "cancelled": cancelled,
+    }
+    metadata.update(prepared.metadata())
 
     return {
         "results": results,
-        "metadata": {
-            "provider": llm_provider.provider_name,
-            "model": response.model,
-            "input_tokens": total_input_tokens,
-            "output_tokens": total_output_tokens,
-            "total_tokens": total_input_tokens + total_output_tokens,
-            "total_cost": float(total_cost),
-        },
+        "metadata": metadata,
     }
 
 
@@ -184,13 +356,122 @@ def analyze_batch_task(
         })
 
         # Run async analysis in sync context
-        return asyncio.run(_analyze_batch_async(
-            transcript=transcript,
-            provider=provider,
-            model=model,
-            tasks=tasks,
+        return asyncio.run(_run_tracked(
+            lambda: _analyze_batch_async(
+                transcript=transcript,
+                provider=provider,
+                model=model,
+                tasks=tasks,
+            ),
+            prompts=[task["prompt"] for task in tasks],
+        ))
+
+
+async def _run_tracked(
+    analysis: Callable[[], Awaitable[Dict[str, Any]]],
+    prompts: List[str],
+) -> Dict[str, Any]:
+    """Run an analysis and record its lifecycle on the Postgres job row.
+
+    Jobs without a row (enqueued outside /jobs/analyze) run untracked.
+    Persistence errors are logged and never fail the job; the result is
+    still returned to RQ.
+    """
+    rq_job = get_current_job()
+    job_id = _job_uuid(rq_job.id) if rq_job else None
+
+    if job_id:
+        await _persist(job_id, lambda repo, job: repo.mark_running(job))
+
+    try:
+        result = await analysis()
+    except Exception as e:
+        failure_class = classify_failure(e)
+        if rq_job:
+            # handle_job_failure reads this same object when deciding on a retry
+            if not failure_class.retryable:
+                rq_job.retries_left = 0
+            elif rq_job.retries_left:
+                settings = get_settings()
+                if failure_class is FailureClass.QUOTA:
+                    intervals = settings.get_job_quota_retry_intervals_list()
+                else:
+                    intervals = settings.get_job_retry_intervals_list()
+                rq_job.retry_intervals = intervals or rq_job.retry_intervals
+
+            rq_job.meta["failure_class"] = failure_class.value
+            rq_job.meta["retryable"] = failure_class.retryable
+            rq_job.meta["attempts"] = rq_job.meta.get("attempts", 0) + 1
+            rq_job.save_meta()
+
+        will_retry = bool(rq_job and rq_job.retries_left)
+        if will_retry:
+            logger.warning(
+                f"Job attempt failed ({failure_class.value}), will retry "
+                f"({rq_job.retries_left} left): {e}"
+            )
+
+        if job_id:
+            error = str(e)
+            if will_retry:
+                await _persist(job_id, lambda repo, job: repo.mark_retrying(job, error))
+            else:
+                await _persist(job_id, lambda repo, job: repo.mark_failed(job, error))
+        raise
+
+    if result["metadata"].get("cancelled"):
+        if rq_job:
+            rq_job.meta["cancelled"] = True
+            rq_job.save_meta()
+        if job_id:
+            await _persist(job_id, lambda repo, job: repo.mark_cancelled(
+                job,
+                result,
+                inline_max_bytes=get_settings().JOB_RESULT_INLINE_MAX_BYTES,
+            ))
+        return result
+
+    if job_id:
+        await _persist(job_id, lambda repo, job: repo.mark_completed(
+            job,
+            result,
+            prompts=prompts,
+            inline_max_bytes=get_settings().JOB_RESULT_INLINE_MAX_BYTES,
         ))
 
+    return result
+
+
+async def _persist(job_id: uuid.UUID, update: Callable) -> None:
+    """Apply an update to a job row, if one exists."""
+    try:
+        async with standalone_session() as session:
+            repo = JobRepository(session)
+            job = await repo.get_by_id(job_id)
+            if job is not None:
+                await update(repo, job)
+    except Exception as e:
+        logger.error(f"Failed to persist job {job_id}: {e}", exc_info=True)
+
+
+def _checkpoint_entry(response) -> Dict[str, Any]:
+    """Checkpoint record for a completed task's LLM response."""
+    return {
+        "content": response.content,
+        "model": response.model,
+        "input_tokens": response.input_tokens,
+        "output_tokens": response.output_tokens,
+        "cost": response.cost,
+    }
+
+
+def _job_uuid(job_id: str) -> Optional[uuid.UUID]:
+    """Parse an RQ job ID as a jobs-table UUID."""
+    try:
+        return uuid.UUID(job_id)
+    except ValueError:
+        return None
+
 
 async def _analyze_batch_async(
     transcript: str,
@@ -203,48 +484,75 @@ async def _analyze_batch_async(
     # Create LLM provider
     llm_provider = LLMProviderFactory.create(provider=provider, model=model)
 
+    # Resume from tasks completed by an earlier attempt
+    checkpoint = TaskCheckpoint.for_current_job()
+    completed = checkpoint.load()
+    if completed:
+        logger.info(f"Resuming from checkpoint: {len(completed)}/{len(tasks)} tasks done")
+
+    cancellation = JobCancellation.for_current_job()
+    cancelled = False
+
     results = []
     total_input = 0
     total_output = 0
     total_cost = 0.0
 
     # Process each task
-    for task in tasks:
-        task_name = task["task_name"]
-        task_prompt = task["prompt"]
+    try:
+        for index, task in enumerate(tasks):
+            task_name = task["task_name"]
+            task_prompt = task["prompt"]
 
-        logger.debug(f"Processing: {task_name}")
+            # Task names may repeat within a batch, so key by position too
+            task_key = f"{index}:{task_name}"
+            entry = completed.get(task_key)
 
-        # Build full prompt
-        full_prompt = f"""TRANSCRIPT:
+            if entry is None:
+                cancellation.check()
+                logger.debug(f"Processing: {task_name}")
+
+                # Build full prompt
+                full_prompt = f"""TRANSCRIPT:
 {transcript}
 
 TASK:
 {task_prompt}"""
 
-        # Execute task
-        response = await llm_provider.generate(
-            prompt=full_prompt.strip(),
-            system_prompt="You are an expert at analyzing transcripts.",
-            temperature=0.7,
-        )
-
-        # Accumulate totals
-        total_input += response.input_tokens
-        total_output += response.output_tokens
-        total_cost += response.cost or 0.0
-
-        results.append({
-            "task_name": task_name,
-            "result": response.content,
-            "input_tokens": response.input_tokens,
-            "output_tokens": response.output_tokens,
-            "cost": response.cost or 0.0,
-        })
+                # Execute task (aborted if the job is cancelled)
+                response = await cancellation.run(llm_provider.generate(
+                    prompt=full_prompt.strip(),
+                    system_prompt="You are an expert at analyzing transcripts.",
+                    temperature=0.7,
+                ))
+
+                entry = _checkpoint_entry(response)
+                checkpoint.save(task_key, entry)
+
+                logger.debug(f"Completed {task_name}: {response.output_tokens} tokens")
+
+            # Accumulate totals
+            total_input += entry["input_tokens"]
+            total_output += entry["output_tokens"]
+            total_cost += entry["cost"] or 0.0
+
+            results.append({
+                "task_name": task_name,
+                "result": entry["content"],
+                "input_tokens": entry["input_tokens"],
+                "output_tokens": entry["output_tokens"],
+                "cost": entry["cost"] or 0.0,
+            })
+
+    except JobCancelled:
+        cancelled = True
+        logger.info(f"Batch cancelled after {len(results)}/{len(tasks)} tasks")
 
-        logger.debug(f"Completed {task_name}: {response.output_tokens} tokens")
+    else:
+        logger.info(f"Batch complete: {len(tasks)} tasks, ${total_cost:.4f}")
 
-    logger.info(f"Batch complete: {len(tasks)} tasks, ${total_cost:.4f}")
+    checkpoint.clear()
+    cancellation.clear()
 
     return {
         "results": results,
@@ -254,5 +562,6 @@ TASK:
             "total_cost": total_cost,
             "model": model,
             "provider": provider,
+            "cancelled": cancelled,
         },
     }
@@ -0,0 +1,42 @@
+"""Billing tasks: applying Stripe webhook events in the background."""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Add API path for shared imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from app.config.database import standalone_session
+from app.services.billing_events import process_event
+from app.utils import auth_cache  # noqa: F401 - invalidates cached users on commit
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def process_stripe_event_task(event_id: str) -> Optional[str]:
+    """Background task: Apply a stored Stripe webhook event.
+
+    Safe to run more than once per event (Stripe redeliveries, retries);
+    only the first run changes anything.
+
+    Args:
+        event_id: Stripe event ID (stored by the webhook)
+
+    Returns:
+        ID of the user whose subscription was updated, if any
+    """
+    # Committing the new tier drops the user from every API replica's cache
+    return asyncio.run(_process_async(event_id))
+
+
+async def _process_async(event_id: str) -> Optional[str]:
+    """Internal async function to apply the event."""
+    async with standalone_session() as session:
+        user_id = await process_event(session, event_id)
+
+    if user_id is None:
+        logger.info(f"Stripe event {event_id} already processed or not for a known user")
+    return user_id